@@ -1,3 +1,17 @@
 from django.contrib import admin
+from django.utils import timezone
+from .models import EmailOutbox
 
-# Register your models here.
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['to_email', 'subject']
+    readonly_fields = ['attempts', 'claim_token', 'claimed_at', 'sent_at', 'last_error', 'created_at']
+    actions = ['retry_emails']
+    
+    @admin.action(description='Retry selected emails now')
+    def retry_emails(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='queued', attempts=0, next_attempt_at=timezone.now())
+        self.message_user(request, f'Queued {updated} email(s) for another try.')
@@ -0,0 +1,53 @@
+"""
+Token authentication with the token -> user lookup cached
+
+DRF's TokenAuthentication joins authtoken_token to auth_user on every request,
+including the notification count poll of every open tab. CachedTokenAuthentication
+keeps the (user, token) pair in the Django cache for AUTH_TOKEN_CACHE_TIMEOUT
+seconds, keyed by a hash of the token so raw tokens never become cache keys.
+The cache backend bounds the map (MAX_ENTRIES on the local memory and file
+caches).
+
+Entries are invalidated explicitly on logout, and by the receivers in
+accounts/signals.py whenever a token is deleted or its user is saved
+(deactivation, password change, profile edits) or deleted. With the default per-process cache, other processes keep
+a stale entry until it expires, so the timeout bounds how long a revoked token
+can still be used there; a shared cache backend removes that window.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def _cache_key(key: str) -> str:
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key: str):
+    """Forget the cached user of one token"""
+    cache.delete(_cache_key(key))
+
+
+def invalidate_user_tokens(user):
+    """Forget the cached user of every token the user has"""
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    cache.delete_many([_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the database while the token's user is cached"""
+
+    def authenticate_credentials(self, key):
+        cache_key = _cache_key(key)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Raises AuthenticationFailed for unknown tokens and inactive users, which are never cached
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, (user, token), getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 60))
+        return user, token
@@ -0,0 +1,116 @@
+"""
+Django management command that sends queued emails from the EmailOutbox.
+
+Emails are queued by registration and password reset inside the request
+transaction (see accounts/outbox.py). This worker claims due emails in batches
+with SELECT ... FOR UPDATE SKIP LOCKED and sends them over one mail
+connection that stays open while there is work. Failed emails are retried
+with exponential backoff and marked dead after --max-attempts.
+
+Works with any EMAIL_BACKEND; to watch it locally, use the console or locmem
+backend, or run a debugging SMTP server (e.g. `python -m aiosmtpd -n -l localhost:1025`)
+with EMAIL_BACKEND=smtp, EMAIL_HOST=localhost, EMAIL_PORT=1025, EMAIL_USE_TLS=False.
+
+Usage:
+    python manage.py send_outbox
+    python manage.py send_outbox --batch-size 100
+    python manage.py send_outbox --once  # Drain the outbox and exit
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.outbox import (
+    DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, claim_emails, open_connection, record_failure, send_emails,
+)
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of emails claimed and sent per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait before polling again when the outbox is empty (default: 5)',
+        )
+        parser.add_argument(
+            '--lease-seconds',
+            type=int,
+            default=DEFAULT_LEASE_SECONDS,
+            help='Seconds before an email claimed by a dead worker can be reclaimed; must outlast one send (EMAIL_TIMEOUT)',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help='Attempts before a failing email is marked dead',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no email is due instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        # The lease is renewed before every send, so it only has to outlast one
+        lease_seconds = options['lease_seconds']
+        email_timeout = getattr(settings, 'EMAIL_TIMEOUT', None) or 0
+        if lease_seconds <= email_timeout:
+            lease_seconds = email_timeout * 2
+            self.stdout.write(self.style.WARNING(f'--lease-seconds must outlast EMAIL_TIMEOUT; using {lease_seconds}'))
+        connection = None
+        sent = failed = 0
+
+        try:
+            while True:
+                close_old_connections()
+                emails = claim_emails(
+                    limit=batch_size, lease_seconds=lease_seconds, max_attempts=options['max_attempts']
+                )
+
+                if not emails:
+                    # Do not hold the mail server connection while idle
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                if connection is None:
+                    try:
+                        connection = open_connection()
+                    except Exception as e:
+                        for email in emails:
+                            record_failure(email, str(e), options['max_attempts'])
+                        failed += len(emails)
+                        self.stdout.write(self.style.WARNING(f'Could not connect to the mail server: {e}'))
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                batch_sent = send_emails(emails, connection, max_attempts=options['max_attempts'])
+                sent += batch_sent
+                failed += len(emails) - batch_sent
+                self.stdout.write(f'Sent {batch_sent} of {len(emails)} email(s) in this batch')
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if connection is not None:
+                connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} email(s), {failed} failed attempt(s)'))
@@ -1,3 +1,39 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class EmailOutbox(models.Model):
+    """
+    An email queued inside the request transaction and sent later by
+    `manage.py send_outbox`, so requests never wait on SMTP/Mailgun.
+    Claimed by a worker with SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    STATUSES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),  # Gave up after max attempts
+    ]
+    
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=254, blank=True, default='')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUSES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=64, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        verbose_name_plural = 'email outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='accounts_outbox_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Email #{self.id} to {self.to_email} ({self.status})"
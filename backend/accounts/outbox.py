@@ -0,0 +1,156 @@
+"""
+Transactional email outbox
+
+Serializers call enqueue_email() instead of send_mail(): the email becomes an
+EmailOutbox row in the request's transaction, so it is only sent if the
+request commits and the request never waits on the mail server.
+
+`manage.py send_outbox` drains the table: it claims due emails in batches with
+SELECT ... FOR UPDATE SKIP LOCKED (several workers can run side by side) and
+sends each batch over one reused mail connection. Failures are retried with
+exponential backoff; after max_attempts the email is marked dead and kept
+for inspection in the admin.
+
+A claim is a lease: the worker renews it just before sending each email, so
+the lease only has to outlast one send (EMAIL_TIMEOUT), not a whole batch.
+Every status write is conditional on the worker's claim_token, so a worker
+whose lease expired and was reclaimed cannot overwrite the new owner's result.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 3600
+
+
+def render_email(template_name: str, context: dict, default_subject: str) -> Tuple[str, str]:
+    """Render a text email template whose first line is 'Subject: ...', returning (subject, body)"""
+    email_content = render_to_string(template_name, context)
+    lines = email_content.strip().split('\n')
+    subject = lines[0].replace('Subject: ', '') if lines[0].startswith('Subject: ') else default_subject
+    body = '\n'.join(lines[2:])  # Skip subject line and empty line
+    return subject, body
+
+
+def enqueue_email(to_email: str, subject: str, body: str, from_email: str = '') -> EmailOutbox:
+    """Queue an email; it is sent by send_outbox once the current transaction commits"""
+    return EmailOutbox.objects.create(to_email=to_email, subject=subject, body=body, from_email=from_email)
+
+
+def backoff_seconds(attempts: int) -> int:
+    """Delay before retrying an email that failed `attempts` times: 1, 2, 4, ... minutes, capped at an hour"""
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def claim_emails(limit: int = 50, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, ids: Optional[List[int]] = None) -> List[EmailOutbox]:
+    """
+    Claim up to `limit` due emails for this worker, only among `ids` if given
+
+    Emails left sending by a worker that died are reclaimed once their lease
+    expires, or marked dead if that claim was already their last attempt.
+    """
+    now = timezone.now()
+    expired = Q(status='sending', claimed_at__lt=now - timedelta(seconds=lease_seconds))
+    claimable = Q(status='queued', next_attempt_at__lte=now) | (expired & Q(attempts__lt=max_attempts))
+    if ids is not None:
+        claimable &= Q(id__in=ids)
+    claim_token = uuid.uuid4().hex
+
+    with transaction.atomic():
+        abandoned = EmailOutbox.objects.filter(expired, attempts__gte=max_attempts).update(
+            status='dead', last_error='Worker stopped while sending the final attempt'
+        )
+        if abandoned:
+            logger.error(f"{abandoned} email(s) dead after their worker stopped on the final attempt")
+
+        email_ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not email_ids:
+            return []
+
+        EmailOutbox.objects.filter(claimable, id__in=email_ids).update(
+            status='sending',
+            claim_token=claim_token,
+            claimed_at=now,
+            attempts=F('attempts') + 1
+        )
+
+    return list(EmailOutbox.objects.filter(claim_token=claim_token, status='sending'))
+
+
+def _update_claimed(email: EmailOutbox, **fields) -> bool:
+    """Write fields only while this worker's claim is current; False if another worker reclaimed the email"""
+    updated = EmailOutbox.objects.filter(id=email.id, claim_token=email.claim_token, status='sending').update(**fields)
+    if not updated:
+        logger.warning(f"Email #{email.id} was reclaimed by another worker; leaving it to them")
+    return bool(updated)
+
+
+def record_failure(email: EmailOutbox, error: str, max_attempts: int):
+    """Schedule a retry with backoff, or mark the email dead once it has used max_attempts"""
+    if email.attempts >= max_attempts:
+        if _update_claimed(email, status='dead', last_error=error):
+            logger.error(f"Email #{email.id} to {email.to_email} dead after {email.attempts} attempts: {error}")
+    else:
+        next_attempt_at = timezone.now() + timedelta(seconds=backoff_seconds(email.attempts))
+        _update_claimed(email, status='queued', last_error=error, next_attempt_at=next_attempt_at)
+
+
+def send_emails(emails: List[EmailOutbox], connection, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> int:
+    """
+    Send claimed emails over an open mail connection, recording each outcome
+
+    Returns the number sent.
+    """
+    sent = 0
+    for email in emails:
+        # Renew the lease for this send; skip emails whose claim has already been taken over
+        if not _update_claimed(email, claimed_at=timezone.now()):
+            continue
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=[email.to_email],
+            connection=connection,
+        )
+        try:
+            message.send(fail_silently=False)
+        except Exception as e:
+            record_failure(email, str(e), max_attempts)
+            # The connection may be broken; the backend opens a fresh one for the next message
+            connection.close()
+            continue
+
+        if _update_claimed(email, status='sent', sent_at=timezone.now(), last_error=''):
+            sent += 1
+    return sent
+
+
+def open_connection():
+    """A mail connection for the configured EMAIL_BACKEND, opened once and reused across batches"""
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    return connection
@@ -2,12 +2,13 @@ from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 import uuid
 
+from .outbox import enqueue_email, render_email
+
 User = get_user_model()
 
 
@@ -26,26 +27,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password')
         user = User(**validated_data)
         user.set_password(password)
-        user.save()
         
-        # Send welcome email
-        try:
-            context = {'user': user}
-            email_content = render_to_string('accounts/welcome_email.txt', context)
-            lines = email_content.strip().split('\n')
-            subject = lines[0].replace('Subject: ', '') if lines[0].startswith('Subject: ') else 'Welcome to Genie Job Board!'
-            message = '\n'.join(lines[2:])
-            
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL if not settings.DEBUG else settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=True,  # Don't fail registration if email fails
-            )
-        except Exception as e:
-            import logging
-            logging.warning(f"Failed to send welcome email to {user.email}: {e}")
+        # Queue the welcome email in the same transaction; send_outbox delivers it
+        with transaction.atomic():
+            user.save()
+            subject, message = render_email('accounts/welcome_email.txt', {'user': user}, 'Welcome to Genie Job Board!')
+            enqueue_email(user.email, subject, message)
         
         return user
 
@@ -91,43 +78,15 @@ class PasswordResetRequestSerializer(serializers.Serializer):
             'uid': uid,
         }
         
-        # Render email content from template
-        email_content = render_to_string('accounts/password_reset_email.txt', context)
-        
-        # Extract subject from the first line of the template
-        lines = email_content.strip().split('\n')
-        subject = lines[0].replace('Subject: ', '') if lines[0].startswith('Subject: ') else 'Password Reset Request'
-        message = '\n'.join(lines[2:])  # Skip subject line and empty line
-        
-        # Send email
-        try:
-            # Verify email configuration exists
-            if not settings.EMAIL_HOST_USER:
-                raise Exception("Email configuration is not set up. Please configure email settings in Render environment variables.")
-            
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL or settings.EMAIL_HOST_USER,
-                recipient_list=[email],
-                fail_silently=False,
-            )
-            email_sent = True
-            email_error = None
-        except Exception as e:
-            email_sent = False
-            email_error = str(e)
-            # Log the error for debugging
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to send password reset email: {e}")
+        # Queue the email; send_outbox delivers it outside the request
+        subject, message = render_email('accounts/password_reset_email.txt', context, 'Password Reset Request')
+        enqueue_email(email, subject, message)
         
         # Always return a successful response even if email fails
         # This prevents information leakage about valid email addresses
         return {
             'message': 'If an account exists with this email, you will receive password reset instructions.',
-            'email_sent': email_sent,
-            'email_error': email_error if settings.DEBUG else None,
+            'email_queued': True,
             # Include token details for development/debugging only
             'debug_info': {
                 'token': token,
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_cached_tokens(sender, instance, created, **kwargs):
+    """A saved user may be deactivated or have a new password; drop their cached token lookups"""
+    if not created:
+        invalidate_user_tokens(instance)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def invalidate_deleted_user_tokens(sender, instance, **kwargs):
+    """Drop a deleted user's cached tokens (before the cascade removes the Token rows that name them)"""
+    invalidate_user_tokens(instance)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """A deleted token (logout elsewhere, admin revocation, cascade) must stop authenticating at once"""
+    invalidate_token(instance.key)
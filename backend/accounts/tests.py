@@ -1,3 +1,135 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .authentication import _cache_key
+from .models import EmailOutbox
+from .outbox import backoff_seconds, claim_emails, enqueue_email, record_failure, send_emails
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailOutboxTests(TestCase):
+    """Queued emails are sent once, in batches, with retries and a dead state"""
+
+    def send_outbox(self, *args):
+        call_command('send_outbox', '--once', *args, stdout=StringIO())
+
+    def test_rolled_back_enqueue_is_never_sent(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                enqueue_email('rollback@example.com', 'Welcome', 'Hello')
+                raise RuntimeError('request failed')
+
+        self.send_outbox()
+        self.assertFalse(EmailOutbox.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_one_connection_per_batch(self):
+        for index in range(12):
+            enqueue_email(f'user{index}@example.com', 'Welcome', 'Hello')
+
+        opened = []
+        original_open = EmailBackend.open
+        with mock.patch.object(EmailBackend, 'open', lambda backend: opened.append(backend) or original_open(backend)):
+            self.send_outbox('--batch-size', '5')
+
+        # Three batches, and the connection stays open while there is work
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(len(mail.outbox), 12)
+        self.assertEqual(EmailOutbox.objects.filter(status='sent').count(), 12)
+
+    def test_backoff_schedule(self):
+        self.assertEqual(
+            [backoff_seconds(attempts) for attempts in range(1, 9)],
+            [60, 120, 240, 480, 960, 1920, 3600, 3600],
+        )
+
+        email = enqueue_email('retry@example.com', 'Welcome', 'Hello')
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=OSError('mail server down')):
+            self.send_outbox()
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.last_error), ('queued', 1, 'mail server down'))
+        self.assertAlmostEqual(email.next_attempt_at - email.claimed_at, timedelta(seconds=60), delta=timedelta(seconds=1))
+
+    def test_dead_after_max_attempts(self):
+        email = enqueue_email('dead@example.com', 'Welcome', 'Hello')
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=OSError('mail server down')):
+            self.send_outbox('--max-attempts', '2')
+            EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            self.send_outbox('--max-attempts', '2')
+            EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            self.send_outbox('--max-attempts', '2')
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('dead', 2))
+        self.assertEqual(mail.outbox, [])
+
+    def test_abandoned_final_attempt_is_dead(self):
+        # A worker died while sending the last allowed attempt
+        stale = timezone.now() - timedelta(hours=1)
+        email = enqueue_email('abandoned@example.com', 'Welcome', 'Hello')
+        EmailOutbox.objects.filter(pk=email.pk).update(status='sending', attempts=5, claimed_at=stale)
+
+        self.assertEqual(claim_emails(max_attempts=5), [])
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'dead')
+
+    def test_reclaimed_email_is_left_to_the_new_worker(self):
+        enqueue_email('slow@example.com', 'Welcome', 'Hello')
+        [first_claim] = claim_emails()
+        EmailOutbox.objects.filter(pk=first_claim.pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        [second_claim] = claim_emails()
+
+        # The first worker's late outcome must not overwrite the second claim
+        record_failure(first_claim, 'timed out', max_attempts=5)
+        self.assertEqual(send_emails([first_claim], EmailBackend()), 0)
+        self.assertEqual(mail.outbox, [])
+
+        self.assertEqual(send_emails([second_claim], EmailBackend()), 1)
+        second_claim.refresh_from_db()
+        self.assertEqual((second_claim.status, second_claim.attempts), ('sent', 2))
+
+
+@override_settings(AUTH_TOKEN_CACHE_TIMEOUT=60)
+class CachedTokenAuthenticationTests(TestCase):
+    """Cached token lookups never outlive the token or its user"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('cached', 'cached@example.com', 'password')
+        self.token = Token.objects.create(user=self.user)
+
+    def get_count(self):
+        return self.client.get('/api/notifications/count/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_lookup_is_cached(self):
+        self.assertEqual(self.get_count().status_code, 200)
+        self.assertIsNotNone(cache.get(_cache_key(self.token.key)))
+
+    def test_deleted_token_stops_authenticating(self):
+        self.assertEqual(self.get_count().status_code, 200)
+        Token.objects.filter(pk=self.token.pk).delete()
+        self.assertEqual(self.get_count().status_code, 401)
+
+    def test_deleted_user_stops_authenticating(self):
+        self.assertEqual(self.get_count().status_code, 200)
+        self.user.delete()
+        self.assertIsNone(cache.get(_cache_key(self.token.key)))
+        self.assertEqual(self.get_count().status_code, 401)
+
+    def test_deactivated_user_stops_authenticating(self):
+        self.assertEqual(self.get_count().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_count().status_code, 401)
@@ -32,6 +32,7 @@ def login(request):
 @permission_classes([IsAuthenticated])
 def logout(request):
     try:
+        # Deleting the token also drops its cached lookup (accounts/signals.py)
         request.user.auth_token.delete()
     except Exception:
         pass
@@ -93,6 +93,15 @@ else:
         }
     }
 
+# ✅ Direct (session-mode) PostgreSQL connection for LISTEN in user_notifications/push.py.
+# DATABASE_URL goes through the Supabase transaction pooler (port 6543), which cannot hold a
+# LISTEN session; set DIRECT_DATABASE_URL to the direct or session pooler URL (port 5432).
+# Without it on PostgreSQL the notification stream is disabled and clients poll instead.
+DIRECT_DATABASE_URL = config('DIRECT_DATABASE_URL', default=None)
+if DATABASE_URL and DIRECT_DATABASE_URL:
+    DATABASES['direct'] = dj_database_url.parse(DIRECT_DATABASE_URL, conn_max_age=0)
+    DATABASES['direct']['TEST'] = {'MIRROR': 'default'}
+
 # Alternative: Direct PostgreSQL configuration (if not using DATABASE_URL)
 # Uncomment and fill in your Supabase details:
 """
@@ -148,6 +157,39 @@ MEDIA_ROOT = BASE_DIR / 'media'
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
+# Resume text extraction cache (entries keyed by SHA-256 of the file, LRU evicted)
+RESUME_TEXT_CACHE_MAX_ENTRIES = config('RESUME_TEXT_CACHE_MAX_ENTRIES', default=1000, cast=int)
+
+# Process pool for parallel bulk resume analysis (0 = min(4, CPU count))
+RESUME_ANALYSIS_POOL_WORKERS = config('RESUME_ANALYSIS_POOL_WORKERS', default=0, cast=int)
+RESUME_ANALYSIS_FILE_TIMEOUT = config('RESUME_ANALYSIS_FILE_TIMEOUT', default=30, cast=int)  # Seconds per file
+
+# ✅ Cache (public job listing pages, token lookups). Local memory by default; point CACHE_BACKEND at
+# django.core.cache.backends.filebased.FileBasedCache and CACHE_LOCATION at a directory
+# to share entries between worker processes
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='capstone-default'),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int),
+        },
+    }
+}
+PUBLIC_JOBS_CACHE_TIMEOUT = config('PUBLIC_JOBS_CACHE_TIMEOUT', default=300, cast=int)  # Seconds
+AUTH_TOKEN_CACHE_TIMEOUT = config('AUTH_TOKEN_CACHE_TIMEOUT', default=60, cast=int)  # Seconds a token -> user lookup is cached; 0 disables
+
+# ✅ In-process archive scheduler (jobs/scheduler.py), started in gunicorn workers by gunicorn.conf.py.
+# One process is elected leader; it archives jobs at their exact archive_at time
+ARCHIVE_SCHEDULER_ENABLED = config('ARCHIVE_SCHEDULER_ENABLED', default=False, cast=bool)
+ARCHIVE_SCHEDULER_POLL_SECONDS = config('ARCHIVE_SCHEDULER_POLL_SECONDS', default=5, cast=float)  # Max delay for saves in other processes
+ARCHIVE_SCHEDULER_LEASE_SECONDS = config('ARCHIVE_SCHEDULER_LEASE_SECONDS', default=30, cast=float)  # Leader lease, renewed every poll
+
+# ✅ Notification retention (prune_notifications command). 0 disables a policy
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)  # Read notifications older than this are pruned
+NOTIFICATION_MAX_PER_USER = config('NOTIFICATION_MAX_PER_USER', default=1000, cast=int)  # Newest notifications kept per user
+NOTIFICATION_DIGEST_WINDOW_MINUTES = config('NOTIFICATION_DIGEST_WINDOW_MINUTES', default=60, cast=int)  # At most one digest email per user per window
+
 # ✅ Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -182,7 +224,7 @@ CORS_ALLOW_HEADERS = [
 # ✅ Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
     ],
 }
 
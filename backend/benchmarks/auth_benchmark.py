@@ -0,0 +1,99 @@
+"""
+Benchmark: queries and time per request on the hot polling endpoints with the token lookup cached.
+
+Seeds a throwaway test database with one user holding a token and some
+notifications, then requests the endpoints every open tab keeps calling
+(notification count, stats and the first feed page) through the Django test
+client. Each endpoint runs twice: with AUTH_TOKEN_CACHE_TIMEOUT=0, which looks
+the token up on every request exactly like DRF's TokenAuthentication, and with
+the token cached. Prints queries per request and the median request time.
+
+Usage:
+    cd backend
+    python benchmarks/auth_benchmark.py [--requests 500] [--notifications 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import django
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+from rest_framework.authtoken.models import Token
+
+from user_notifications.models import Notification, NotificationCounters
+
+ENDPOINTS = [
+    '/api/notifications/count/',
+    '/api/notifications/stats/',
+    '/api/notifications/?limit=20',
+]
+
+
+def seed(notifications):
+    user = User.objects.create_user('benchmark', 'benchmark@example.com', 'password')
+    token = Token.objects.create(user=user)
+    Notification.objects.bulk_create([
+        Notification(recipient=user, notification_type='new_application', title=f'Application {index}',
+                     message='Seeded notification', is_read=index % 3 == 0)
+        for index in range(notifications)
+    ])
+    NotificationCounters.refresh(user.pk)
+    return token
+
+
+def measure(client, token, url, requests, cache_timeout):
+    headers = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+    cache.clear()
+    with override_settings(AUTH_TOKEN_CACHE_TIMEOUT=cache_timeout):
+        client.get(url, **headers)  # Warm up (and fill the cache when enabled)
+        with CaptureQueriesContext(connection) as queries:
+            timings = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get(url, **headers)
+                timings.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.status_code
+    return len(queries) / requests, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and mode')
+    parser.add_argument('--notifications', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        token = seed(args.notifications)
+        client = Client()
+
+        print(f'\n{"endpoint":<32} {"queries/request":>22} {"median ms":>20}')
+        print(f'{"":<32} {"uncached":>10} {"cached":>11} {"uncached":>9} {"cached":>10}')
+        print('-' * 76)
+        for url in ENDPOINTS:
+            uncached_queries, uncached_ms = measure(client, token, url, args.requests, cache_timeout=0)
+            cached_queries, cached_ms = measure(client, token, url, args.requests, cache_timeout=60)
+            print(f'{url:<32} {uncached_queries:>10.1f} {cached_queries:>11.1f} {uncached_ms:>9.2f} {cached_ms:>10.2f}')
+        print(f'\n{connection.vendor}, {args.requests} requests per endpoint and mode\n')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark: scalar calculate_structured_match vs the vectorized BatchScorer.
+
+First checks parity: random resume profiles (drawn from the real taxonomy plus
+a few skills outside it) are scored against random jobs, including jobs with
+empty categories and no experience requirement, and every overall_score and
+category score must equal the scalar result. Then times both paths at 10k and
+100k candidates against one job: the vectorized columns alone, full per-candidate
+result dicts, and a top-10 shortlist.
+
+Usage:
+    cd backend
+    python benchmarks/batch_scoring_benchmark.py [--sizes 10000 100000] [--parity-jobs 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from jobs import batch_scoring
+from jobs.resume_analyzer import ResumeAnalyzer
+
+OFF_TAXONOMY_SKILLS = ['cobol', 'fortran', 'underwater basket weaving']
+
+
+def taxonomy_skills(analyzer):
+    return {
+        'technical_skills': list(analyzer.tech_keywords) + OFF_TAXONOMY_SKILLS,
+        'education': list(analyzer.education_keywords),
+        'soft_skills': list(analyzer.soft_skills),
+    }
+
+
+def sample(rng, population, lower, upper):
+    return rng.sample(population, rng.randint(lower, min(upper, len(population))))
+
+
+def random_profile(rng, skills):
+    return {
+        'technical_skills': sample(rng, skills['technical_skills'], 0, 15),
+        'education': sample(rng, skills['education'], 0, 3),
+        'soft_skills': sample(rng, skills['soft_skills'], 0, 6),
+        'experience_years': rng.choice([0, 0, 1, 2, 3, 5, 7, 10, 15]),
+        'raw_text_length': rng.randint(500, 8000),
+    }
+
+
+def random_job(rng, skills):
+    def pick(category, upper):
+        # Roughly one job in five has no requirements in a category
+        return [] if rng.random() < 0.2 else sample(rng, skills[category], 1, upper)
+
+    return {
+        'required_technical_skills': pick('technical_skills', 10) + (['haskell'] if rng.random() < 0.1 else []),
+        'required_education': pick('education', 2),
+        'required_soft_skills': pick('soft_skills', 4),
+        'required_experience_years': rng.choice([0, 1, 2, 3, 5, 8]),
+    }
+
+
+def check_parity(analyzer, scorer, skills, rng, jobs, candidates):
+    profiles = [random_profile(rng, skills) for _ in range(candidates)]
+    encoded = scorer.encode(profiles)
+    mismatches = 0
+
+    for _ in range(jobs):
+        job_json = random_job(rng, skills)
+        batch = scorer.score(encoded, job_json)
+        for profile, result in zip(profiles, batch):
+            expected = analyzer.calculate_structured_match(profile, job_json)
+            if (result['overall_score'] != expected['overall_score']
+                    or result['category_scores'] != expected['category_scores']):
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f'  mismatch: {result} != {expected["overall_score"]}, {expected["category_scores"]}')
+
+        top = scorer.top_matches(encoded, job_json, limit=5)
+        expected_top = sorted(range(len(batch)), key=lambda index: (-batch[index]['overall_score'], index))[:5]
+        if [batch[index]['overall_score'] for index, _ in top] != [batch[index]['overall_score'] for index in expected_top]:
+            mismatches += 1
+            print(f'  top_matches order differs for {job_json}')
+
+    return jobs * candidates, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Candidate pool sizes')
+    parser.add_argument('--parity-jobs', type=int, default=200, help='Random jobs in the parity check')
+    parser.add_argument('--parity-candidates', type=int, default=500, help='Random profiles in the parity check')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    analyzer = ResumeAnalyzer()
+    scorer = analyzer.get_batch_scorer()
+    skills = taxonomy_skills(analyzer)
+    backend = f'NumPy {batch_scoring.np.__version__}' if batch_scoring.np is not None else 'Python int bitsets'
+
+    print(f'\nBatch scorer backend: {backend}')
+    checked, mismatches = check_parity(analyzer, scorer, skills, rng, args.parity_jobs, args.parity_candidates)
+    print(f'Parity: {checked} scores compared, {mismatches} mismatches')
+    if mismatches:
+        sys.exit(1)
+
+    job_json = random_job(rng, skills)
+    print('=' * 78)
+    print(f'{"candidates":>10} {"scalar s":>10} {"encode s":>10} {"columns s":>10} {"dicts s":>10} {"top-10 s":>10} {"speedup":>10}')
+    print('-' * 78)
+
+    for size in args.sizes:
+        profiles = [random_profile(rng, skills) for _ in range(size)]
+
+        start = time.perf_counter()
+        for profile in profiles:
+            analyzer.calculate_structured_match(profile, job_json)
+        scalar_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        encoded = scorer.encode(profiles)
+        encode_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scorer.score_columns(encoded, job_json)
+        columns_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scorer.score(encoded, job_json)
+        dicts_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scorer.top_matches(encoded, job_json, limit=10)
+        top_s = time.perf_counter() - start
+
+        print(
+            f'{size:>10} {scalar_s:>10.3f} {encode_s:>10.3f} {columns_s:>10.4f} '
+            f'{dicts_s:>10.3f} {top_s:>10.4f} {scalar_s / columns_s:>9.0f}x'
+        )
+
+    print('=' * 78)
+    print('Encoding is paid once per candidate pool; each additional job only pays the score column.\n')
+
+
+if __name__ == '__main__':
+    main()
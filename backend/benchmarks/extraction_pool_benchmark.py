@@ -0,0 +1,94 @@
+"""
+Benchmark: serial vs process-pool text extraction for a bulk analysis batch.
+
+Builds a 50-PDF batch by cycling through test_resumes/ and extracts it serially
+and through ExtractionPool with 1, 2, 4 and 8 workers. The text cache is
+bypassed so every file is really parsed; pools are warmed up before timing,
+as they persist between requests in the web process.
+
+Usage:
+    cd backend
+    python benchmarks/extraction_pool_benchmark.py [--files 50]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import django
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from jobs.extraction_pool import ExtractionPool, _extract_in_worker
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'test_resumes')
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def build_batch(count):
+    paths = sorted(glob.glob(os.path.join(CORPUS_DIR, '*.pdf')))
+    corpus = [(os.path.basename(path), open(path, 'rb').read()) for path in paths]
+    return [corpus[i % len(corpus)] for i in range(count)]
+
+
+def as_uploads(batch):
+    return [SimpleUploadedFile(f'{i}_{name}', data) for i, (name, data) in enumerate(batch)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=50, help='Number of PDFs in the batch')
+    args = parser.parse_args()
+
+    batch = build_batch(args.files)
+    if not batch:
+        print(f'No PDFs found in {CORPUS_DIR}')
+        return
+
+    print(f'\nBatch: {len(batch)} PDFs, {os.cpu_count()} CPU(s) available')
+    print('=' * 56)
+    print(f'{"mode":>12} {"seconds":>10} {"files/sec":>12} {"speedup":>10}')
+    print('-' * 56)
+
+    start = time.perf_counter()
+    for name, data in batch:
+        _extract_in_worker(os.path.splitext(name)[1], data)
+    serial_seconds = time.perf_counter() - start
+    print(f'{"serial":>12} {serial_seconds:>10.2f} {len(batch) / serial_seconds:>12.1f} {1.0:>9.1f}x')
+
+    for workers in WORKER_COUNTS:
+        settings.RESUME_ANALYSIS_POOL_WORKERS = workers
+        pool = ExtractionPool()
+
+        # Warm up: spawn the workers and import pdfplumber in each of them
+        list(pool.extract_uploads(as_uploads(batch[:workers]), use_cache=False))
+
+        uploads = as_uploads(batch)
+        start = time.perf_counter()
+        outcomes = list(pool.extract_uploads(uploads, use_cache=False))
+        seconds = time.perf_counter() - start
+        pool.recycle()
+
+        failures = sum(1 for _, _, error in outcomes if error)
+        label = f'{workers} worker' + ('s' if workers > 1 else '')
+        print(
+            f'{label:>12} {seconds:>10.2f} {len(batch) / seconds:>12.1f} '
+            f'{serial_seconds / seconds:>9.1f}x' + (f'  ({failures} failed)' if failures else '')
+        )
+
+    print('=' * 56)
+    print('Speedup is bounded by the number of physical cores.\n')
+
+
+if __name__ == '__main__':
+    main()
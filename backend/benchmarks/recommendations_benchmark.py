@@ -0,0 +1,152 @@
+"""
+Benchmark: job recommendations from the skill index vs scoring every open job.
+
+Seeds a throwaway test database with 50,000 open jobs whose requirement
+profiles are drawn from the analyzer taxonomy, builds the skill index, and
+times recommend_jobs() (in-memory index) for random resume profiles against
+the SQL-aggregate fallback used without NumPy and the naive approach of
+loading every job profile and running calculate_structured_match on each.
+Also checks that the index and the full scan agree on the best score.
+
+Usage:
+    cd backend
+    python benchmarks/recommendations_benchmark.py [--jobs 50000] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import django
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+
+from jobs.models import Job, JobSkillIndex
+from jobs.recommendations import candidate_job_ids_sql, index_entries_for, recommend_jobs, skill_index_cache
+from jobs.resume_analyzer import ResumeAnalyzer, REQUIREMENTS_PROFILE_VERSION
+
+
+def sample(rng, population, lower, upper):
+    return rng.sample(population, rng.randint(lower, min(upper, len(population))))
+
+
+def seed_jobs(analyzer, rng, count):
+    skills = {
+        'technical_skills': list(analyzer.tech_keywords),
+        'education': list(analyzer.education_keywords),
+        'soft_skills': list(analyzer.soft_skills),
+    }
+    poster = User.objects.create_user('benchmark-poster', 'poster@example.com', 'unused')
+
+    for start in range(0, count, 5000):
+        jobs = []
+        for index in range(start, min(start + 5000, count)):
+            profile = {
+                'version': REQUIREMENTS_PROFILE_VERSION,
+                'required_technical_skills': sample(rng, skills['technical_skills'], 0, 10),
+                'required_education': sample(rng, skills['education'], 0, 2),
+                'required_soft_skills': sample(rng, skills['soft_skills'], 0, 4),
+                'required_experience_years': rng.choice([0, 1, 2, 3, 5, 8]),
+            }
+            jobs.append(Job(
+                title=f'Job {index}', company='Benchmark Co', location='Remote',
+                description='Seeded job', posted_by=poster, requirements_profile=profile
+            ))
+        # bulk_create skips Job.save, so the index is built here in bulk
+        created = Job.objects.bulk_create(jobs)
+        entries = []
+        for job in created:
+            entries.extend(index_entries_for(job, job.requirements_profile))
+        JobSkillIndex.objects.bulk_create(entries, batch_size=5000)
+
+    return skills
+
+
+def naive_best_score(analyzer, resume_json):
+    best = 0
+    for profile in Job.objects.filter(is_active=True, is_archived=False).values_list('requirements_profile', flat=True):
+        best = max(best, analyzer.calculate_structured_match(resume_json, profile)['overall_score'])
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=50000, help='Number of open jobs to seed')
+    parser.add_argument('--queries', type=int, default=50, help='Number of random resumes to recommend for')
+    parser.add_argument('--limit', type=int, default=10, help='Recommendations per query')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    analyzer = ResumeAnalyzer()
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        start = time.perf_counter()
+        skills = seed_jobs(analyzer, rng, args.jobs)
+        print(f'\nSeeded {args.jobs} jobs, {JobSkillIndex.objects.count()} index rows '
+              f'in {time.perf_counter() - start:.1f}s ({connection.vendor})')
+
+        resumes = [
+            {
+                'technical_skills': sample(rng, skills['technical_skills'], 3, 15),
+                'education': sample(rng, skills['education'], 0, 2),
+                'soft_skills': sample(rng, skills['soft_skills'], 0, 5),
+                'experience_years': rng.choice([0, 1, 3, 5, 10]),
+                'raw_text_length': 4000,
+            }
+            for _ in range(args.queries)
+        ]
+
+        start = time.perf_counter()
+        skill_index_cache.refresh()
+        print(f'In-memory index loaded in {(time.perf_counter() - start) * 1000:.0f} ms (once per process)')
+
+        timings = []
+        for resume_json in resumes:
+            start = time.perf_counter()
+            recommend_jobs(resume_json, limit=args.limit)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        sql_timings = []
+        for resume_json in resumes:
+            start = time.perf_counter()
+            candidate_job_ids_sql(resume_json, args.limit * 2)
+            sql_timings.append((time.perf_counter() - start) * 1000)
+
+        print('=' * 56)
+        for label, values in (('in-memory top-' + str(args.limit), timings), ('SQL aggregate only', sql_timings)):
+            values.sort()
+            print(f'{label:<22} p50 {statistics.median(values):>8.1f} ms   '
+                  f'p95 {values[max(int(len(values) * 0.95) - 1, 0)]:>8.1f} ms')
+
+        mismatches = 0
+        naive_timings = []
+        for resume_json in resumes[:5]:
+            start = time.perf_counter()
+            best = naive_best_score(analyzer, resume_json)
+            naive_timings.append((time.perf_counter() - start) * 1000)
+            top = recommend_jobs(resume_json, limit=1)
+            if not top or top[0][1]['overall_score'] != best:
+                mismatches += 1
+
+        print(f'{"naive full scan":<22} p50 {statistics.median(naive_timings):>8.1f} ms')
+        print('=' * 56)
+        print(f'Best-score agreement with the full scan: {5 - mismatches}/5\n')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
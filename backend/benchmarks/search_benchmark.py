@@ -0,0 +1,127 @@
+"""
+Benchmark: indexed job search vs substring scanning as the job table grows.
+
+Seeds a throwaway test database in steps up to the largest size and, at each
+step, times the first page of /api/jobs/search/-style queries through
+search_jobs(): a selective query whose matches stay constant (a few dozen
+jobs), the same query with a job_type filter, and a common word matching a
+fixed share of the table. The selective query is also run as the icontains
+scan the frontend filtering amounted to. On PostgreSQL the GIN index is used;
+on SQLite the FTS5 table.
+
+Selective queries should stay flat; a common word grows with its match count
+because every match must be ranked.
+
+Usage:
+    cd backend
+    python benchmarks/search_benchmark.py [--sizes 10000 100000 1000000] [--queries 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import django
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+
+from jobs.models import Job
+from jobs.search import search_jobs
+
+VOCABULARY = [f'word{index}' for index in range(5000)]
+RARE_WORDS = ['kubernetes', 'terraform', 'elixir']
+RARE_JOBS_PER_WORD = 40
+COMMON_WORD = 'engineer'
+COMMON_SHARE = 0.05
+JOB_TYPES = ['full-time', 'part-time', 'contract', 'internship']
+
+
+def seed_jobs(rng, poster, start, stop):
+    for batch_start in range(start, stop, 5000):
+        jobs = []
+        for index in range(batch_start, min(batch_start + 5000, stop)):
+            words = rng.choices(VOCABULARY, k=40)
+            title = ' '.join(rng.choices(VOCABULARY, k=3))
+            if rng.random() < COMMON_SHARE:
+                title += f' {COMMON_WORD}'
+            # The rare words go into the first jobs only, so their match count never grows
+            if index < RARE_JOBS_PER_WORD * len(RARE_WORDS):
+                words.append(RARE_WORDS[index % len(RARE_WORDS)])
+            jobs.append(Job(
+                title=title, company=f'Company {index % 997}', location=rng.choice(['Remote', 'Boston', 'Austin']),
+                job_type=rng.choice(JOB_TYPES), description=' '.join(words), posted_by=poster,
+                required_skills=rng.sample(VOCABULARY[:200], 3),
+            ))
+        Job.objects.bulk_create(jobs)
+
+
+def time_page(queryset, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        list(queryset.order_by('-search_rank', '-id')[:21])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def time_scan(word, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        condition = Q(title__icontains=word) | Q(description__icontains=word) | Q(company__icontains=word)
+        list(Job.objects.filter(condition, is_active=True, is_archived=False).order_by('-created_at', '-id')[:21])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Job table sizes to measure at')
+    parser.add_argument('--queries', type=int, default=20, help='Repetitions per query (median reported)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        poster = User.objects.create_user('benchmark-poster', 'poster@example.com', 'unused')
+        seeded = 0
+        print(f'\nBackend: {connection.vendor}')
+        print('=' * 86)
+        print(f'{"jobs":>9} {"selective":>12} {"+job_type":>12} {"common word":>12} {"matches":>9} {"icontains scan":>16}')
+
+        for size in sorted(args.sizes):
+            seed_jobs(rng, poster, seeded, size)
+            seeded = size
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE jobs_job')
+
+            selective = time_page(search_jobs(RARE_WORDS[0]), args.queries)
+            filtered = time_page(search_jobs(RARE_WORDS[1]).filter(job_type='contract'), args.queries)
+            common = time_page(search_jobs(COMMON_WORD), max(args.queries // 4, 1))
+            matches = search_jobs(COMMON_WORD).count()
+            scan = time_scan(RARE_WORDS[0], max(args.queries // 4, 1))
+
+            print(f'{size:>9} {selective:>9.2f} ms {filtered:>9.2f} ms {common:>9.2f} ms {matches:>9} {scan:>13.2f} ms')
+
+        print('=' * 86 + '\n')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: per-synonym substring scans vs the compiled single-pass SkillMatcher.
+
+Grows the taxonomy from 30 to 3,000 synonyms (the real analyzer keywords padded
+with synthetic ones) and times both approaches over the test_resumes/ corpus.
+
+Usage:
+    cd backend
+    python benchmarks/skill_matcher_benchmark.py [--repeat 20]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import django
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from jobs.resume_analyzer import ResumeAnalyzer
+from jobs.skill_matcher import SkillMatcher
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'test_resumes')
+SIZES = [30, 100, 300, 1000, 3000]
+
+
+def build_taxonomy(analyzer, size):
+    """Return {category: {canonical: [synonyms]}} holding exactly `size` synonyms"""
+    real = {
+        'technical_skills': analyzer.tech_keywords,
+        'education': analyzer.education_keywords,
+        'soft_skills': analyzer.soft_skills,
+    }
+    taxonomy = {category: {} for category in real}
+    remaining = size
+
+    for category, keywords in real.items():
+        for canonical, synonyms in keywords.items():
+            if remaining <= 0:
+                break
+            taken = list(synonyms)[:remaining]
+            taxonomy[category][canonical] = taken
+            remaining -= len(taken)
+
+    index = 0
+    while remaining > 0:
+        canonical = f'synthetic skill {index}'
+        synonyms = [f'synthskill{index}', f'synth-skill {index}', f'sk{index}x'][:remaining]
+        taxonomy['technical_skills'][canonical] = synonyms
+        remaining -= len(synonyms)
+        index += 1
+
+    return taxonomy
+
+
+def legacy_match(taxonomy, text_lower):
+    """The previous approach: one substring scan per synonym"""
+    found = {}
+    for category, keywords in taxonomy.items():
+        found[category] = []
+        for canonical, synonyms in keywords.items():
+            for synonym in synonyms:
+                if synonym in text_lower:
+                    found[category].append(canonical)
+                    break
+    return found
+
+
+def time_call(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='Passes over the corpus per measurement')
+    args = parser.parse_args()
+
+    analyzer = ResumeAnalyzer()
+    paths = sorted(glob.glob(os.path.join(CORPUS_DIR, '*.pdf')))
+    texts = [analyzer.extract_text_from_file(path).lower() for path in paths]
+    texts = [text for text in texts if text.strip()]
+
+    if not texts:
+        print(f'No readable resumes found in {CORPUS_DIR}')
+        return
+
+    print(f'\nCorpus: {len(texts)} resumes, {sum(len(t) for t in texts)} characters total')
+    print('=' * 72)
+    print(f'{"synonyms":>10} {"compile ms":>12} {"substring ms/doc":>18} {"compiled ms/doc":>17} {"speedup":>9}')
+    print('-' * 72)
+
+    for size in SIZES:
+        taxonomy = build_taxonomy(analyzer, size)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        legacy_ms = time_call(lambda text: legacy_match(taxonomy, text), texts, args.repeat)
+        compiled_ms = time_call(matcher.match, texts, args.repeat)
+
+        print(
+            f'{matcher.synonym_count:>10} {compile_ms:>12.2f} {legacy_ms:>18.4f} '
+            f'{compiled_ms:>17.4f} {legacy_ms / compiled_ms:>8.1f}x'
+        )
+
+    print('=' * 72)
+    print('Substring scans grow with the synonym count; the compiled matcher stays near-flat.\n')
+
+
+if __name__ == '__main__':
+    main()
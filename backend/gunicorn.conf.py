@@ -0,0 +1,14 @@
+"""
+Gunicorn configuration, loaded from backend/ (see render.yaml)
+
+Background threads that belong to the web server are started here, in each
+worker after it has loaded the app, rather than when backend.wsgi or
+backend.asgi is imported, so management commands and tests never start them.
+"""
+
+
+def post_worker_init(worker):
+    # Archive jobs at their scheduled time in-process (no-op unless ARCHIVE_SCHEDULER_ENABLED)
+    from jobs.scheduler import start_archive_scheduler
+
+    start_archive_scheduler()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Job, JobApplication
+from .models import Job, JobApplication, ExtractedTextCache, AnalysisBatch, ResumeProfile
 
 
 @admin.register(Job)
@@ -37,4 +37,27 @@ class JobApplicationAdmin(admin.ModelAdmin):
         ('Content', {
             'fields': ('message', 'resume', 'resume_name')
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(ExtractedTextCache)
+class ExtractedTextCacheAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'byte_size', 'hit_count', 'created_at', 'last_accessed_at']
+    search_fields = ['sha256']
+    readonly_fields = ['sha256', 'text', 'byte_size', 'hit_count', 'created_at', 'last_accessed_at']
+
+
+@admin.register(AnalysisBatch)
+class AnalysisBatchAdmin(admin.ModelAdmin):
+    list_display = ['id', 'job', 'requested_by', 'total_tasks', 'completed_tasks', 'failed_tasks', 'created_at', 'finished_at']
+    list_filter = ['created_at']
+    search_fields = ['job__title', 'requested_by__username']
+    readonly_fields = ['created_at', 'finished_at']
+
+
+@admin.register(ResumeProfile)
+class ResumeProfileAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'experience_years', 'parser_version', 'created_at', 'updated_at']
+    list_filter = ['parser_version']
+    search_fields = ['sha256']
+    readonly_fields = ['created_at', 'updated_at']
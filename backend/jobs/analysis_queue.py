@@ -0,0 +1,185 @@
+"""
+Database-backed queue for resume analysis
+
+analyze_job_resumes enqueues one AnalysisTask per application and returns a
+batch id immediately. `manage.py run_analysis_workers` claims tasks with
+SELECT ... FOR UPDATE SKIP LOCKED (a no-op on SQLite, where the conditional
+claim UPDATE alone keeps two workers from taking the same task) and runs them.
+No external broker is needed.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+from typing import List, Optional
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import AnalysisBatch, AnalysisTask, Job, JobApplication
+from .resume_analyzer import resume_analyzer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def enqueue_job_analysis(job, requested_by) -> Optional[AnalysisBatch]:
+    """
+    Queue analysis of every application with a resume for a job
+
+    Returns the still-unfinished batch for the job if one exists, a new batch
+    otherwise, or None when there is nothing to analyze.
+    """
+    with transaction.atomic():
+        # Lock the job row so two concurrent requests cannot both see no pending batch and create one each
+        Job.objects.select_for_update().only('id').get(pk=job.pk)
+
+        pending_batch = AnalysisBatch.objects.filter(job=job, finished_at__isnull=True).first()
+        if pending_batch:
+            return pending_batch
+
+        application_ids = list(
+            JobApplication.objects.filter(job=job, resume__isnull=False)
+            .exclude(resume='')
+            .values_list('id', flat=True)
+        )
+        if not application_ids:
+            return None
+
+        batch = AnalysisBatch.objects.create(
+            job=job,
+            requested_by=requested_by,
+            total_tasks=len(application_ids)
+        )
+        AnalysisTask.objects.bulk_create([
+            AnalysisTask(batch=batch, application_id=application_id)
+            for application_id in application_ids
+        ])
+    return batch
+
+
+def claim_tasks(limit: int = 1, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> List[AnalysisTask]:
+    """
+    Claim up to `limit` queued tasks for this worker
+
+    Tasks left running by a worker that died are reclaimed once their lease
+    expires, or failed if that claim was already their last attempt (e.g. a
+    resume that crashes the worker every time).
+    """
+    now = timezone.now()
+    expired = Q(status='running', claimed_at__lt=now - timedelta(seconds=lease_seconds))
+    claimable = Q(status='queued') | (expired & Q(attempts__lt=max_attempts))
+    claim_token = uuid.uuid4().hex
+
+    with transaction.atomic():
+        abandoned = AnalysisTask.objects.select_for_update(skip_locked=True).filter(expired, attempts__gte=max_attempts)
+        for task in abandoned:
+            logger.error(f"Analysis task #{task.id} failed: its worker stopped during attempt {task.attempts}")
+            _finish_task(task, succeeded=False, error='Analysis did not finish after the maximum number of attempts')
+
+        task_ids = list(
+            AnalysisTask.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .order_by('id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not task_ids:
+            return []
+
+        AnalysisTask.objects.filter(claimable, id__in=task_ids).update(
+            status='running',
+            claim_token=claim_token,
+            claimed_at=now,
+            attempts=F('attempts') + 1
+        )
+
+    return list(
+        AnalysisTask.objects.filter(claim_token=claim_token, status='running')
+        .select_related('application__job', 'application__applicant')
+    )
+
+
+def _finish_task(task: AnalysisTask, succeeded: bool, error: str = ''):
+    now = timezone.now()
+    final_status = 'done' if succeeded else 'failed'
+    # Only the current claim may finish a task, so a reclaimed task is never counted twice
+    finished = AnalysisTask.objects.filter(id=task.id, claim_token=task.claim_token, status='running').update(
+        status=final_status, error=error, finished_at=now
+    )
+    if not finished:
+        logger.warning(f"Analysis task #{task.id} was reclaimed by another worker; discarding this result")
+        return
+    task.status, task.error, task.finished_at = final_status, error, now
+
+    counter = 'completed_tasks' if succeeded else 'failed_tasks'
+    AnalysisBatch.objects.filter(id=task.batch_id).update(**{counter: F(counter) + 1})
+    AnalysisBatch.objects.filter(
+        id=task.batch_id,
+        finished_at__isnull=True,
+        total_tasks__lte=F('completed_tasks') + F('failed_tasks')
+    ).update(finished_at=now)
+
+
+def process_task(task: AnalysisTask, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> bool:
+    """
+    Analyze the task's application and store the results on it
+
+    Returns True when the analysis succeeded. Unexpected errors are retried
+    until max_attempts is reached; analyzer errors (e.g. unreadable PDFs) fail immediately.
+    """
+    application = task.application
+
+    try:
+        analysis_result = resume_analyzer.analyze_application(application)
+    except Exception as e:
+        logger.exception(f"Analysis task #{task.id} crashed")
+        if task.attempts < max_attempts:
+            # Like _finish_task, only requeue the task if this worker still holds its claim
+            requeued = AnalysisTask.objects.filter(id=task.id, claim_token=task.claim_token, status='running').update(
+                status='queued', error=str(e)
+            )
+            if requeued:
+                task.status, task.error = 'queued', str(e)
+            else:
+                logger.warning(f"Analysis task #{task.id} was reclaimed by another worker; not requeueing it")
+            return False
+        _finish_task(task, succeeded=False, error=str(e))
+        return False
+
+    if analysis_result['error']:
+        _finish_task(task, succeeded=False, error=analysis_result['error'])
+        return False
+
+    # Save analysis results
+    application.resume_analysis_score = analysis_result['score']
+    application.resume_analysis_data = analysis_result['analysis']
+    application.analysis_completed = True
+    application.analysis_date = timezone.now()
+    application.save()
+
+    _finish_task(task, succeeded=True)
+    return True
+
+
+def batch_progress(batch: AnalysisBatch) -> dict:
+    """Return a JSON-serializable progress report for a batch"""
+    return {
+        'batch_id': batch.id,
+        'job_id': batch.job_id,
+        'status': batch.status,
+        'total_tasks': batch.total_tasks,
+        'completed_tasks': batch.completed_tasks,
+        'failed_tasks': batch.failed_tasks,
+        'pending_tasks': max(batch.total_tasks - batch.processed_tasks, 0),
+        'progress': round(batch.processed_tasks / batch.total_tasks * 100, 2) if batch.total_tasks else 100.0,
+        'created_at': batch.created_at,
+        'finished_at': batch.finished_at,
+        'errors': list(
+            batch.tasks.filter(status='failed').values('application_id', 'error')
+        ),
+    }
@@ -0,0 +1,70 @@
+"""
+Set-based archiving of jobs whose scheduled archive time has passed
+
+Each batch is one UPDATE ... RETURNING over at most batch_size due jobs, so a
+backlog costs a few statements instead of a query per job. The side effects
+Job.save would have per row run once per batch: the jobs leave the
+recommendation skill index and the listing cache generation is bumped.
+
+On PostgreSQL due rows are claimed with FOR UPDATE SKIP LOCKED, so
+overlapping runs never archive (or block on) the same job.
+"""
+
+from typing import Iterator, List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import CacheGeneration, Job
+
+
+def due_jobs(now=None):
+    """Active, unarchived jobs whose archive time has passed (served by jobs_job_archive_due_idx)"""
+    return Job.objects.filter(
+        is_active=True,
+        is_archived=False,
+        archive_at__isnull=False,
+        archive_at__lte=now or timezone.now(),
+    )
+
+
+def archive_batch(now, batch_size: int) -> List[Tuple[int, str, str]]:
+    """Archive up to batch_size due jobs, returning (id, title, company) of each"""
+    from .recommendations import remove_jobs_from_index
+
+    with transaction.atomic():
+        claimed = due_jobs(now).order_by('archive_at', 'id').values('id')[:batch_size]
+        if connection.features.has_select_for_update_skip_locked:
+            claimed = claimed.select_for_update(skip_locked=True)
+        claimed_sql, params = claimed.query.sql_with_params()
+
+        table = connection.ops.quote_name(Job._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET is_archived = %s WHERE id IN ({claimed_sql}) RETURNING id, title, company',
+                (True, *params),
+            )
+            archived = sorted(cursor.fetchall())
+
+        if archived:
+            remove_jobs_from_index([job_id for job_id, _, _ in archived])
+            CacheGeneration.bump(CacheGeneration.JOBS)
+
+    return archived
+
+
+def archive_due_jobs(now=None, batch_size: int = 500) -> Iterator[List[Tuple[int, str, str]]]:
+    """
+    Archive every job due at `now`, one committed batch at a time
+
+    Yields:
+        List[Tuple[int, str, str]]: (id, title, company) of the jobs archived by each batch
+    """
+    now = now or timezone.now()
+    while True:
+        archived = archive_batch(now, batch_size)
+        if not archived:
+            return
+        yield archived
+        if len(archived) < batch_size:
+            return
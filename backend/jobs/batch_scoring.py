@@ -0,0 +1,256 @@
+"""
+Vectorized scoring of many resume profiles against one job
+
+calculate_structured_match builds Python sets and computes four ratios per
+resume, one call at a time. BatchScorer gives every canonical skill of the
+taxonomy a bit position, packs each resume profile into one bitset per
+category and scores a whole candidate pool with a few AND + popcount
+operations. Scores are identical to the scalar path.
+
+NumPy is optional: without it the bitsets are plain Python integers, which
+is slower but still avoids building sets per resume.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to Python int bitsets
+    np = None
+
+from .resume_analyzer import SCORE_WEIGHTS
+
+
+# (category in a resume profile, matching key in a job requirements dict)
+SKILL_CATEGORIES = (
+    ('technical_skills', 'required_technical_skills'),
+    ('education', 'required_education'),
+    ('soft_skills', 'required_soft_skills'),
+)
+
+if np is not None:
+    # Set bits per byte value, for NumPy versions without np.bitwise_count
+    _POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(bitsets):
+    """Number of set bits in each row of a packed uint8 bitset matrix"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bitsets).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT_TABLE[bitsets].sum(axis=1, dtype=np.int64)
+
+
+class EncodedProfiles:
+    """A pool of resume profiles packed into one bitset matrix per category"""
+
+    def __init__(self, bit_positions: Dict, bitsets: Dict, experience_years):
+        self.bit_positions = bit_positions
+        self.bitsets = bitsets
+        self.experience_years = experience_years
+
+    def __len__(self):
+        return len(self.experience_years)
+
+
+class BatchScorer:
+    """
+    Scores many resume profiles against a job in one pass
+
+    Encode a candidate pool once with encode(), then score it against any
+    number of jobs with score().
+    """
+
+    def __init__(self, taxonomies: Dict[str, Dict[str, List[str]]]):
+        # Canonical skills in taxonomy order get the first bit positions of each category
+        self.bit_positions = {
+            category: {canonical: position for position, canonical in enumerate(taxonomies.get(category, {}))}
+            for category, _ in SKILL_CATEGORIES
+        }
+
+    def _positions_for(self, profiles: Sequence[Dict]) -> Dict[str, Dict[str, int]]:
+        """Taxonomy bit positions plus positions for any skills outside the taxonomy"""
+        bit_positions = {category: dict(positions) for category, positions in self.bit_positions.items()}
+        for profile in profiles:
+            for category, positions in bit_positions.items():
+                for skill in profile.get(category, ()):
+                    if skill not in positions:
+                        positions[skill] = len(positions)
+        return bit_positions
+
+    def encode(self, profiles: Sequence[Dict]) -> EncodedProfiles:
+        """
+        Pack resume profiles into bitsets
+
+        Args:
+            profiles: Structured resume dicts as returned by parse_resume_to_json
+                or ResumeProfile.as_resume_json
+
+        Returns:
+            EncodedProfiles: Bitsets and experience years in the same order as profiles
+        """
+        bit_positions = self._positions_for(profiles)
+        bitsets = {}
+
+        for category, positions in bit_positions.items():
+            if np is None:
+                bitsets[category] = [
+                    sum(1 << positions[skill] for skill in set(profile.get(category, ())))
+                    for profile in profiles
+                ]
+                continue
+
+            rows, columns = [], []
+            for row, profile in enumerate(profiles):
+                for skill in profile.get(category, ()):
+                    rows.append(row)
+                    columns.append(positions[skill])
+
+            matrix = np.zeros((len(profiles), max(len(positions), 1)), dtype=bool)
+            matrix[rows, columns] = True
+            bitsets[category] = np.packbits(matrix, axis=1)
+
+        experience_years = [profile.get('experience_years', 0) for profile in profiles]
+        if np is not None:
+            experience_years = np.array(experience_years, dtype=np.float64)
+
+        return EncodedProfiles(bit_positions, bitsets, experience_years)
+
+    def _job_mask(self, positions: Dict[str, int], required_skills):
+        """Bitset of a job's required skills; skills no candidate has get no bit"""
+        known = [positions[skill] for skill in set(required_skills) if skill in positions]
+
+        if np is None:
+            return sum(1 << position for position in known)
+
+        mask = np.zeros(max(len(positions), 1), dtype=bool)
+        mask[known] = True
+        return np.packbits(mask)
+
+    def _category_scores(self, encoded: EncodedProfiles, job_json: Dict) -> Dict:
+        """Per-category percentage scores for every candidate, before rounding"""
+        scores = {}
+
+        for category, job_key in SKILL_CATEGORIES:
+            required_count = len(set(job_json[job_key]))
+            if not required_count:
+                scores[category] = 100  # No requirements = automatic pass
+                continue
+
+            mask = self._job_mask(encoded.bit_positions[category], job_json[job_key])
+            if np is None:
+                scores[category] = [
+                    (bin(bitset & mask).count('1') / required_count) * 100
+                    for bitset in encoded.bitsets[category]
+                ]
+            else:
+                matched_counts = _popcount_rows(encoded.bitsets[category] & mask)
+                scores[category] = (matched_counts / required_count) * 100
+
+        required_years = job_json['required_experience_years']
+        if required_years <= 0:
+            scores['experience'] = 100
+        elif np is None:
+            scores['experience'] = [
+                100 if years >= required_years else (years / required_years) * 100
+                for years in encoded.experience_years
+            ]
+        else:
+            years = encoded.experience_years
+            scores['experience'] = np.where(years >= required_years, 100.0, (years / required_years) * 100)
+
+        return scores
+
+    def score_columns(self, encoded: EncodedProfiles, job_json: Dict) -> Dict:
+        """
+        Unrounded scores for every encoded profile, one column per category
+
+        Returns:
+            Dict: 'overall_score' and each category mapped to a NumPy array
+                (or a list without NumPy) aligned with the encoded profiles
+        """
+        count = len(encoded)
+        scores = self._category_scores(encoded, job_json)
+
+        # Broadcast the constant categories so every column has one value per candidate
+        columns = {
+            category: [value] * count if isinstance(value, int) else value
+            for category, value in scores.items()
+        }
+
+        if np is not None:
+            columns = {category: np.asarray(column, dtype=np.float64) for category, column in columns.items()}
+            columns['overall_score'] = (
+                columns['technical_skills'] * SCORE_WEIGHTS['technical_skills'] +
+                columns['education'] * SCORE_WEIGHTS['education'] +
+                columns['soft_skills'] * SCORE_WEIGHTS['soft_skills'] +
+                columns['experience'] * SCORE_WEIGHTS['experience']
+            )
+        else:
+            columns['overall_score'] = [
+                tech * SCORE_WEIGHTS['technical_skills'] +
+                edu * SCORE_WEIGHTS['education'] +
+                soft * SCORE_WEIGHTS['soft_skills'] +
+                exp * SCORE_WEIGHTS['experience']
+                for tech, edu, soft, exp in zip(
+                    columns['technical_skills'], columns['education'],
+                    columns['soft_skills'], columns['experience']
+                )
+            ]
+
+        return columns
+
+    def _results(self, columns: Dict, indices) -> List[Dict]:
+        """Per-candidate result dicts for the given row indices"""
+        if np is not None:
+            columns = {category: column.tolist() for category, column in columns.items()}
+
+        # Python's round() on Python floats, so results match the scalar path exactly
+        return [
+            {
+                'overall_score': round(columns['overall_score'][index], 2),
+                'category_scores': {
+                    category: round(columns[category][index], 2)
+                    for category in ('technical_skills', 'education', 'soft_skills', 'experience')
+                },
+            }
+            for index in indices
+        ]
+
+    def score(self, encoded: EncodedProfiles, job_json: Dict) -> List[Dict]:
+        """
+        Score every encoded profile against a job
+
+        Args:
+            encoded: Profiles packed by encode()
+            job_json: Structured job requirements
+
+        Returns:
+            List[Dict]: overall_score and category_scores per profile, matching
+                ResumeAnalyzer.calculate_structured_match
+        """
+        return self._results(self.score_columns(encoded, job_json), range(len(encoded)))
+
+    def top_matches(self, encoded: EncodedProfiles, job_json: Dict, limit: int = 10) -> List[Tuple[int, Dict]]:
+        """
+        Best-scoring candidates for a job, without building results for the rest
+
+        Returns:
+            List[Tuple[int, Dict]]: (profile index, result) pairs, highest overall_score first
+        """
+        columns = self.score_columns(encoded, job_json)
+        totals = columns['overall_score']
+        limit = min(limit, len(encoded))
+        if limit <= 0:
+            return []
+
+        if np is not None:
+            candidates = np.argpartition(-totals, limit - 1)[:limit]
+            ranked = candidates[np.lexsort((candidates, -totals[candidates]))].tolist()
+        else:
+            ranked = sorted(range(len(totals)), key=lambda index: (-totals[index], index))[:limit]
+
+        return list(zip(ranked, self._results(columns, ranked)))
+
+    def score_profiles(self, profiles: Sequence[Dict], job_json: Dict) -> List[Dict]:
+        """Encode and score a pool of profiles against one job"""
+        return self.score(self.encode(profiles), job_json)
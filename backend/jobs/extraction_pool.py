@@ -0,0 +1,193 @@
+"""
+Process pool for parallel resume text extraction
+
+pdfplumber is CPU-bound pure Python, so bulk analysis only scales across
+processes. A persistent ProcessPoolExecutor (spawned, so no database
+connections or threads are inherited) extracts text for cache misses while
+scoring stays in the request process. Results come back in submission order
+and every file succeeds or fails on its own. Uploads are read as they are
+submitted, two per worker at a time, so a batch never sits in memory at once.
+
+A timed-out or crashed extraction gets the pool recycled: new work goes to a
+fresh pool at once, while the old one finishes the files other requests
+already queued on it and only then has its remaining (stuck) workers killed.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from typing import Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from .text_cache import resume_text_cache, sha256_of_chunks
+
+
+logger = logging.getLogger(__name__)
+
+_worker_analyzer = None
+
+
+def _extract_in_worker(suffix: str, data: bytes) -> str:
+    """Runs in a pool process: spool the bytes to disk and extract text without the cache"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from .resume_analyzer import ResumeAnalyzer
+        _worker_analyzer = ResumeAnalyzer()
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(data)
+        tmp_path = tmp_file.name
+
+    try:
+        return _worker_analyzer._extract_text_uncached(tmp_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+class ExtractionPool:
+    """Lazily started, persistent process pool shared by bulk analysis requests"""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return getattr(settings, 'RESUME_ANALYSIS_POOL_WORKERS', None) or min(4, os.cpu_count() or 1)
+
+    @property
+    def file_timeout(self) -> float:
+        return getattr(settings, 'RESUME_ANALYSIS_FILE_TIMEOUT', 30)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def recycle(self, executor: Optional[ProcessPoolExecutor] = None):
+        """
+        Swap in a fresh pool for new work and drain the old one in the background
+
+        Pass the executor that misbehaved so a pool another request already
+        recycled is not replaced twice.
+        """
+        with self._lock:
+            if executor is not None and executor is not self._executor:
+                return
+            executor, self._executor = self._executor, None
+
+        if executor is None:
+            return
+        threading.Thread(target=self._drain, args=(executor,), name='extraction-pool-drain', daemon=True).start()
+
+    def _drain(self, executor: ProcessPoolExecutor):
+        """Let queued extractions finish, then kill the workers still running (the stuck ones)"""
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        queued = len(getattr(executor, '_pending_work_items', None) or {})
+        # Workers exit once the queue is empty; give every queued file its own timeout
+        deadline = time.monotonic() + self.file_timeout * (1 + queued // max(len(processes), 1))
+        executor.shutdown(wait=False)
+
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _submit(self, executor: ProcessPoolExecutor, uploaded_file, ahead: int, use_cache: bool) -> tuple:
+        """Read one upload and submit it unless its text is cached; returns its window entry"""
+        try:
+            uploaded_file.seek(0)
+            data = b''.join(uploaded_file.chunks())
+            file_hash = sha256_of_chunks([data])
+
+            cached_text = resume_text_cache.get(file_hash) if use_cache else None
+            if cached_text is not None:
+                return uploaded_file, file_hash, None, None, None, cached_text
+
+            suffix = os.path.splitext(uploaded_file.name)[1]
+            future = executor.submit(_extract_in_worker, suffix, data)
+            # The file may wait for the files submitted ahead of it, one timeout per round of workers
+            deadline = time.monotonic() + self.file_timeout * (1 + ahead // self.max_workers)
+            return uploaded_file, file_hash, executor, future, deadline, None
+        except Exception as e:
+            return uploaded_file, None, None, None, None, e
+
+    def extract_uploads(self, uploaded_files: List, use_cache: bool = True) -> Iterator[Tuple[object, str, Optional[str]]]:
+        """
+        Extract text from uploaded files in parallel
+
+        Args:
+            uploaded_files: Django UploadedFile objects
+            use_cache: Whether to consult and fill the extracted text cache
+
+        Yields:
+            (uploaded_file, text, error) in submission order; text is '' when error is set
+        """
+        executor = self._get_executor()
+        window_size = 2 * self.max_workers
+        window = deque()
+        remaining = iter(uploaded_files)
+        recycled = set()
+
+        while True:
+            while len(window) < window_size:
+                uploaded_file = next(remaining, None)
+                if uploaded_file is None:
+                    break
+                ahead = sum(1 for entry in window if entry[3] is not None and not entry[3].done())
+                window.append(self._submit(executor, uploaded_file, ahead, use_cache))
+            if not window:
+                return
+
+            uploaded_file, file_hash, file_executor, future, deadline, outcome = window.popleft()
+
+            if isinstance(outcome, Exception):
+                yield uploaded_file, '', str(outcome)
+                continue
+
+            if future is None:
+                yield uploaded_file, outcome, None
+                continue
+
+            # Time out against the submission time, so stuck files do not add up their timeouts
+            try:
+                text = future.result(timeout=max(deadline - time.monotonic(), 0))
+            except (FutureTimeoutError, BrokenProcessPool) as e:
+                timed_out = isinstance(e, FutureTimeoutError)
+                if timed_out:
+                    future.cancel()
+                if file_executor not in recycled:
+                    # Later files go to a fresh pool; files already queued on this one still finish there
+                    logger.warning("Recycling resume extraction pool after a timeout or crashed worker")
+                    recycled.add(file_executor)
+                    self.recycle(file_executor)
+                    executor = self._get_executor()
+                if timed_out:
+                    yield uploaded_file, '', f'Text extraction timed out after {self.file_timeout} seconds'
+                else:
+                    yield uploaded_file, '', 'Text extraction worker crashed'
+                continue
+            except Exception as e:
+                yield uploaded_file, '', str(e)
+                continue
+
+            if use_cache and text.strip():
+                resume_text_cache.set(file_hash, text, byte_size=uploaded_file.size or 0)
+            yield uploaded_file, text, None
+
+
+# Global instance
+extraction_pool = ExtractionPool()
@@ -0,0 +1,62 @@
+"""
+Response cache for the public job listing
+
+public_jobs is unauthenticated and its pages change only when a job or an
+application does. Serialized pages are stored in Django's cache keyed by the
+jobs CacheGeneration, which Job and JobApplication writes bump after commit,
+so stale pages are never served and nothing has to be deleted explicitly.
+
+The same generation yields a weak ETag and a Last-Modified date, letting
+browsers and CDNs revalidate with a 304 instead of downloading the page.
+posted_at_display is relative to the current time, so keys and validators
+also roll over every PUBLIC_JOBS_CACHE_TIMEOUT seconds.
+"""
+
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import CacheGeneration
+
+
+def _cache_timeout() -> int:
+    return max(getattr(settings, 'PUBLIC_JOBS_CACHE_TIMEOUT', 300), 1)
+
+
+def _version(request) -> str:
+    """Generation, time bucket and query string that identify one cached page"""
+    cached = getattr(request, '_public_jobs_version', None)
+    if cached is not None:
+        return cached
+
+    generation = CacheGeneration.current(CacheGeneration.JOBS)
+    bucket = int(time.time()) // _cache_timeout()
+    query = hashlib.sha256(request.GET.urlencode().encode('utf-8')).hexdigest()[:16]
+
+    request._public_jobs_generation = generation
+    request._public_jobs_bucket = bucket
+    request._public_jobs_version = f'{generation.value}.{int(generation.updated_at.timestamp())}.{bucket}.{query}'
+    return request._public_jobs_version
+
+
+def public_jobs_etag(request, *args, **kwargs) -> str:
+    return f'W/"jobs-{_version(request)}"'
+
+
+def public_jobs_last_modified(request, *args, **kwargs) -> datetime:
+    _version(request)
+    bucket_start = datetime.fromtimestamp(request._public_jobs_bucket * _cache_timeout(), tz=dt_timezone.utc)
+    return max(request._public_jobs_generation.updated_at, bucket_start)
+
+
+def cached_public_jobs_page(request, build):
+    """Return the serialized page for this request, calling build() only on a cache miss"""
+    key = f'public_jobs:{_version(request)}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, _cache_timeout())
+    return data
@@ -3,8 +3,13 @@ Django management command to automatically archive jobs that have reached their
 
 This command should be run periodically (e.g., every 15-30 minutes) via a cron job or task scheduler.
 
+Due jobs are archived with set-based UPDATE ... RETURNING statements of at most
+--batch-size rows each (see jobs/archiving.py), with progress after every batch.
+
 Usage:
     python manage.py archive_expired_jobs
+    python manage.py archive_expired_jobs --batch-size 1000
+    python manage.py archive_expired_jobs --dry-run
 
 Example cron job (runs every 15 minutes):
     */15 * * * * cd /path/to/project && python manage.py archive_expired_jobs
@@ -12,7 +17,7 @@ Example cron job (runs every 15 minutes):
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from jobs.models import Job
+from jobs.archiving import archive_due_jobs, due_jobs
 
 
 class Command(BaseCommand):
@@ -24,48 +29,45 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be archived without actually archiving',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Maximum number of jobs archived per UPDATE (default: 500)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
+        batch_size = max(options['batch_size'], 1)
+        verbose = options['verbosity'] > 1
         now = timezone.now()
 
-        # Find all active, non-archived jobs that have passed their archive time
-        jobs_to_archive = Job.objects.filter(
-            is_active=True,
-            is_archived=False,
-            archive_at__isnull=False,
-            archive_at__lte=now
-        )
-
-        count = jobs_to_archive.count()
-
-        if count == 0:
-            self.stdout.write(self.style.SUCCESS('No jobs to archive at this time.'))
-            return
-
         if dry_run:
+            jobs_to_archive = due_jobs(now).order_by('archive_at', 'id')
+            count = jobs_to_archive.count()
+            if count == 0:
+                self.stdout.write(self.style.SUCCESS('No jobs to archive at this time.'))
+                return
+
             self.stdout.write(
                 self.style.WARNING(f'DRY RUN: Would archive {count} job(s):')
             )
-            for job in jobs_to_archive:
+            for job in jobs_to_archive.only('id', 'title', 'company', 'archive_at').iterator(chunk_size=batch_size):
                 self.stdout.write(
                     f'  - Job #{job.id}: {job.title} at {job.company} '
                     f'(scheduled for {job.archive_at})'
                 )
-        else:
-            # Archive the jobs
-            archived_jobs = []
-            for job in jobs_to_archive:
-                job.is_archived = True
-                job.save(update_fields=['is_archived'])
-                archived_jobs.append(
-                    f'Job #{job.id}: {job.title} at {job.company}'
-                )
+            return
 
-            self.stdout.write(
-                self.style.SUCCESS(f'Successfully archived {count} job(s):')
-            )
-            for job_info in archived_jobs:
-                self.stdout.write(f'  - {job_info}')
+        total = 0
+        for batch in archive_due_jobs(now, batch_size=batch_size):
+            total += len(batch)
+            self.stdout.write(f'Archived {len(batch)} job(s) in this batch ({total} so far)')
+            if verbose:
+                for job_id, title, company in batch:
+                    self.stdout.write(f'  - Job #{job_id}: {title} at {company}')
 
-        return
+        if total == 0:
+            self.stdout.write(self.style.SUCCESS('No jobs to archive at this time.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Successfully archived {total} job(s)'))
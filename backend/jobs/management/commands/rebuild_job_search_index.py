@@ -0,0 +1,29 @@
+"""
+Django management command that recreates the full-text search index for jobs.
+
+On PostgreSQL the search column is generated by the database and needs no
+maintenance. On SQLite the FTS5 table is kept in sync by triggers, which are
+dropped whenever a migration rebuilds jobs_job; run this after such a
+migration or if search results look stale.
+
+Usage:
+    python manage.py rebuild_job_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from jobs.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recreates the full-text search index for jobs'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.stdout.write(self.style.WARNING(f'No search index for the {connection.vendor} backend'))
+            return
+
+        with connection.schema_editor() as schema_editor:
+            install_search_index(schema_editor)
+        self.stdout.write(self.style.SUCCESS(f'Search index ready ({connection.vendor})'))
@@ -0,0 +1,33 @@
+"""
+Django management command that rebuilds the skill -> open jobs index used for job recommendations.
+
+The index is maintained on every Job save; run this after deploying a change to
+the keyword taxonomies or to populate it for jobs created before it existed.
+
+Usage:
+    python manage.py rebuild_job_skill_index
+"""
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobSkillIndex
+from jobs.recommendations import rebuild_job_skill_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the skill index used for job recommendations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of index rows written per query (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_job_skill_index(batch_size=options['batch_size'])
+        entries = JobSkillIndex.objects.count()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {indexed} open job(s) ({entries} skill entries)')
+        )
@@ -0,0 +1,66 @@
+"""
+Django management command that repairs Job.application_count.
+
+The counter is kept in step by JobApplication.save/delete, but bulk or cascading
+deletes (e.g. deleting a user) bypass those. This recounts applications per job
+and fixes any counter that drifted.
+
+Usage:
+    python manage.py reconcile_application_counts
+    python manage.py reconcile_application_counts --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from jobs.models import CacheGeneration, Job, JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Recounts applications per job and fixes drifted application_count values'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show which counters are wrong without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        actual_counts = dict(
+            JobApplication.objects.order_by().values('job').annotate(total=Count('id')).values_list('job', 'total')
+        )
+
+        drifted = [
+            (job_id, stored, actual_counts.get(job_id, 0))
+            for job_id, stored in Job.objects.values_list('id', 'application_count').iterator()
+            if stored != actual_counts.get(job_id, 0)
+        ]
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All application counts are correct.'))
+            return
+
+        for job_id, stored, actual in drifted:
+            self.stdout.write(f'  - Job #{job_id}: stored {stored}, actual {actual}')
+
+        if not dry_run:
+            # Recount inside the UPDATE so applications created meanwhile are not lost
+            counts = (
+                JobApplication.objects.filter(job=OuterRef('pk'))
+                .order_by()
+                .values('job')
+                .annotate(total=Count('id'))
+                .values('total')
+            )
+            Job.objects.filter(pk__in=[job_id for job_id, _, _ in drifted]).update(
+                application_count=Coalesce(Subquery(counts), Value(0))
+            )
+            CacheGeneration.bump(CacheGeneration.JOBS)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'DRY RUN: {len(drifted)} job(s) have a wrong application count'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Fixed application count for {len(drifted)} job(s)'))
@@ -0,0 +1,115 @@
+"""
+Django management command that processes queued resume analysis tasks.
+
+Tasks are created by POST /api/jobs/{job_id}/analyze-resumes/ and claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, so several workers (or several copies of this
+command) can run side by side against PostgreSQL or SQLite without a broker.
+
+Usage:
+    python manage.py run_analysis_workers
+    python manage.py run_analysis_workers --workers 4
+    python manage.py run_analysis_workers --once  # Drain the queue and exit
+"""
+
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from jobs.analysis_queue import claim_tasks, process_task, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS
+
+
+class Command(BaseCommand):
+    help = 'Processes queued resume analysis tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes to run (default: 1)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5,
+            help='Number of tasks each worker claims at a time (default: 5)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait before polling again when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--lease-seconds',
+            type=int,
+            default=DEFAULT_LEASE_SECONDS,
+            help='Seconds before a running task from a dead worker can be reclaimed',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help='Attempts before a crashing task is marked as failed',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+
+        if workers == 1:
+            self.run_worker(options)
+            return
+
+        # Child processes must open their own database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=self.run_worker, args=(options,), daemon=True)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        self.stdout.write(self.style.SUCCESS(f'Started {workers} analysis workers'))
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+
+    def run_worker(self, options):
+        worker_name = multiprocessing.current_process().name
+        processed = 0
+
+        try:
+            while True:
+                close_old_connections()
+                tasks = claim_tasks(
+                    limit=options['batch_size'], lease_seconds=options['lease_seconds'],
+                    max_attempts=options['max_attempts']
+                )
+
+                if not tasks:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                for task in tasks:
+                    succeeded = process_task(task, max_attempts=options['max_attempts'])
+                    processed += 1
+                    outcome = self.style.SUCCESS('done') if succeeded else self.style.WARNING(task.status)
+                    self.stdout.write(
+                        f'[{worker_name}] Task #{task.id} (application #{task.application_id}): {outcome}'
+                    )
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'[{worker_name}] Processed {processed} task(s)'))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_archive_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractedTextCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('byte_size', models.PositiveIntegerField(default=0, help_text='Size of the source file in bytes')),
+                ('hit_count', models.PositiveIntegerField(default=0, help_text='Number of times this entry was reused')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-last_accessed_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_analysisbatch_analysistask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='requirements_profile',
+            field=models.JSONField(blank=True, default=dict, help_text='Precomputed, versioned requirements profile used by the resume analyzer'),
+        ),
+    ]
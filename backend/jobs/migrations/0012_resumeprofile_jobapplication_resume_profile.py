@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_requirements_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('technical_skills', models.JSONField(blank=True, default=list)),
+                ('education', models.JSONField(blank=True, default=list)),
+                ('soft_skills', models.JSONField(blank=True, default=list)),
+                ('experience_years', models.IntegerField(default=0)),
+                ('raw_text_length', models.PositiveIntegerField(default=0)),
+                ('parser_version', models.PositiveIntegerField(default=0, help_text='Resume parser version that produced this profile')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_profile',
+            field=models.ForeignKey(blank=True, help_text='Parsed profile of the uploaded resume, used for rescoring', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='jobs.resumeprofile'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_resumeprofile_jobapplication_resume_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkillIndexChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSkillIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('technical_skills', 'Technical Skills'), ('education', 'Education'), ('soft_skills', 'Soft Skills')], max_length=20)),
+                ('skill', models.CharField(max_length=100)),
+                ('weight', models.FloatField(help_text="Points this skill adds to the job's overall match score")),
+                ('base_score', models.FloatField(default=0, help_text='Points awarded for categories with no requirements')),
+                ('required_experience_years', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index_entries', to='jobs.job')),
+            ],
+            options={
+                'unique_together': {('category', 'skill', 'job')},
+            },
+        ),
+    ]
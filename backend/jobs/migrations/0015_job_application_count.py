@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_application_counts(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    counts = (
+        JobApplication.objects.filter(job=OuterRef('pk'))
+        .order_by()
+        .values('job')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Job.objects.update(application_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_job_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of applications, maintained atomically by JobApplication.save/delete'),
+        ),
+        migrations.RunPython(backfill_application_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:10
+
+from django.db import migrations
+
+from jobs.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
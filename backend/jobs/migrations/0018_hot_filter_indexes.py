@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_job_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_archived', False)), fields=['-created_at', '-id'], name='jobs_job_open_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', 'is_active', 'is_archived', '-created_at'], name='jobs_job_poster_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('archive_at__isnull', False), ('is_active', True), ('is_archived', False)), fields=['archive_at'], name='jobs_job_archive_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', 'resume'], name='jobs_app_job_resume_idx'),
+        ),
+    ]
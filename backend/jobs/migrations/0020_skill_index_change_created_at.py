@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_scheduler_lease'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobskillindexchange',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -1,5 +1,10 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Q
+from django.db.models.functions import Now
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Job(models.Model):
@@ -18,6 +23,10 @@ class Job(models.Model):
     description = models.TextField()
     requirements = models.TextField(blank=True, null=True)
     max_applicants = models.PositiveIntegerField(blank=True, null=True, help_text="Maximum number of applicants allowed")
+    application_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of applications, maintained atomically by JobApplication.save/delete"
+    )
     
     # Dynamic resume analysis fields
     required_skills = models.JSONField(
@@ -47,16 +56,132 @@ class Job(models.Model):
     is_archived = models.BooleanField(default=False, help_text="Whether the job is archived")
     archive_at = models.DateTimeField(null=True, blank=True, help_text="Scheduled date and time to automatically archive this job")
     
+    # Normalized requirements used for resume matching, rebuilt when any REQUIREMENTS_FIELDS value changes
+    requirements_profile = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Precomputed, versioned requirements profile used by the resume analyzer"
+    )
+    
+    # Fields the requirements profile is derived from
+    REQUIREMENTS_FIELDS = (
+        'description', 'requirements', 'required_skills',
+        'required_education', 'required_soft_skills', 'min_experience_years',
+    )
+    
+    # Counters only ever changed with F() updates; full saves must not overwrite them
+    COUNTER_FIELDS = ('application_count',)
+    
+    # Fields that decide whether and when the archive scheduler archives a job
+    ARCHIVE_SCHEDULE_FIELDS = ('archive_at', 'is_active', 'is_archived')
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of job listings
+            models.Index(fields=['-created_at', '-id'], name='jobs_job_created_id_idx'),
+            # Open job listings, newest first; partial so closed jobs are not scanned past
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='jobs_job_open_created_idx',
+                condition=Q(is_active=True, is_archived=False),
+            ),
+            # A poster's own jobs (my-jobs, archived)
+            models.Index(fields=['posted_by', 'is_active', 'is_archived', '-created_at'], name='jobs_job_poster_open_idx'),
+            # Jobs waiting to be archived; archived and unscheduled jobs stay out of the index
+            models.Index(
+                fields=['archive_at'],
+                name='jobs_job_archive_due_idx',
+                condition=Q(is_active=True, is_archived=False, archive_at__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.company}"
     
-    @property
-    def application_count(self):
-        """Return the number of applications for this job"""
-        return self.applications.count()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._requirements_snapshot = instance._requirements_inputs()
+        instance._listed_snapshot = instance._listing_state()
+        return instance
+    
+    def _listing_state(self):
+        """Whether the job is open (active and not archived), or None if either field is deferred"""
+        if 'is_active' not in self.__dict__ or 'is_archived' not in self.__dict__:
+            return None
+        return self.is_active and not self.is_archived
+    
+    def _requirements_inputs(self):
+        """Copy the loaded (non-deferred) requirement fields for change detection"""
+        import copy
+        return {
+            name: copy.deepcopy(self.__dict__[name])
+            for name in self.REQUIREMENTS_FIELDS
+            if name in self.__dict__
+        }
+    
+    def _requirements_changed(self, update_fields=None):
+        """Whether the requirements profile is missing, outdated or derived from stale values"""
+        from .resume_analyzer import REQUIREMENTS_PROFILE_VERSION
+        
+        if (self.requirements_profile or {}).get('version') != REQUIREMENTS_PROFILE_VERSION:
+            return True
+        if update_fields is not None and not set(update_fields) & set(self.REQUIREMENTS_FIELDS):
+            return False
+        
+        snapshot = getattr(self, '_requirements_snapshot', None)
+        if snapshot is None:
+            return True
+        return any(
+            snapshot.get(name) != value
+            for name, value in self._requirements_inputs().items()
+        )
+    
+    def refresh_requirements_profile(self, persist=False):
+        """Rebuild the requirements profile; persist=True writes it without touching updated_at"""
+        from .resume_analyzer import resume_analyzer
+        
+        self.requirements_profile = resume_analyzer.build_requirements_profile(self)
+        if persist and self.pk:
+            Job.objects.filter(pk=self.pk).update(requirements_profile=self.requirements_profile)
+        return self.requirements_profile
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        
+        profile_rebuilt = self._requirements_changed(update_fields)
+        if profile_rebuilt:
+            self.refresh_requirements_profile()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'requirements_profile'}
+        
+        # A full save of a job loaded from the database leaves the counters out, so a
+        # stale instance cannot undo concurrent increments. Inserts (including copies
+        # saved with pk=None) and explicit update_fields keep Django's normal behavior.
+        if (update_fields is None and not self._state.adding and self.pk is not None
+                and not kwargs.get('force_insert')):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        
+        super().save(*args, **kwargs)
+        self._requirements_snapshot = self._requirements_inputs()
+        CacheGeneration.bump(CacheGeneration.JOBS)
+        if update_fields is None or set(update_fields) & set(self.ARCHIVE_SCHEDULE_FIELDS):
+            from .scheduler import archive_scheduler
+            CacheGeneration.bump(CacheGeneration.ARCHIVE_SCHEDULE)
+            transaction.on_commit(archive_scheduler.wake)
+        
+        # Keep the skill -> open jobs index in step with the profile and the listing state
+        listed = self._listing_state()
+        if profile_rebuilt or listed != getattr(self, '_listed_snapshot', None):
+            from .recommendations import sync_job_skill_index
+            sync_job_skill_index(self)
+        self._listed_snapshot = listed
     
     @property
     def is_accepting_applications(self):
@@ -99,6 +224,10 @@ class Job(models.Model):
             return f"{months} months ago" if months > 1 else "1 month ago"
 
 
+class ApplicationLimitReached(Exception):
+    """Raised when saving an application for a job that already has max_applicants applications"""
+
+
 def resume_upload_path(instance, filename):
     """
     Generate upload path for resume files
@@ -109,6 +238,35 @@ def resume_upload_path(instance, filename):
     return f'resumes/{instance.applicant.id}/{instance.job.id}_{name}{ext}'
 
 
+class ResumeProfile(models.Model):
+    """
+    Structured data parsed from a resume file, keyed by the SHA-256 of the file bytes.
+    Lets applications be rescored against changed job requirements without re-parsing the file.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    technical_skills = models.JSONField(default=list, blank=True)
+    education = models.JSONField(default=list, blank=True)
+    soft_skills = models.JSONField(default=list, blank=True)
+    experience_years = models.IntegerField(default=0)
+    raw_text_length = models.PositiveIntegerField(default=0)
+    parser_version = models.PositiveIntegerField(default=0, help_text="Resume parser version that produced this profile")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Resume profile {self.sha256[:12]}"
+    
+    def as_resume_json(self):
+        """Return the profile in the shape produced by ResumeAnalyzer.parse_resume_to_json"""
+        return {
+            'technical_skills': list(self.technical_skills),
+            'education': list(self.education),
+            'soft_skills': list(self.soft_skills),
+            'experience_years': self.experience_years,
+            'raw_text_length': self.raw_text_length
+        }
+
+
 class JobApplication(models.Model):
     STATUSES = [
         ('pending', 'Pending'),
@@ -147,18 +305,242 @@ class JobApplication(models.Model):
         blank=True,
         help_text="When the resume analysis was last performed"
     )
+    resume_profile = models.ForeignKey(
+        ResumeProfile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='applications',
+        help_text="Parsed profile of the uploaded resume, used for rescoring"
+    )
     
     class Meta:
         unique_together = ['job', 'applicant']  # Prevent duplicate applications
         ordering = ['-applied_at']
+        indexes = [
+            # Applications of a job that have a resume (bulk analysis, rescoring)
+            models.Index(fields=['job', 'resume'], name='jobs_app_job_resume_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.username} applied to {self.job.title}"
     
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        
+        # Count the application in the same transaction as the insert; the conditional
+        # UPDATE locks the job row, so max_applicants holds under concurrent applies
+        with transaction.atomic():
+            reserved = Job.objects.filter(
+                Q(max_applicants__isnull=True) | Q(application_count__lt=F('max_applicants')),
+                pk=self.job_id
+            ).update(application_count=F('application_count') + 1)
+            if not reserved:
+                raise ApplicationLimitReached(self.job_id)
+            super().save(*args, **kwargs)
+            CacheGeneration.bump(CacheGeneration.JOBS)
+    
+    def delete(self, *args, **kwargs):
+        # Bulk and cascading deletes skip this; reconcile_application_counts repairs those
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Job.objects.filter(pk=self.job_id, application_count__gt=0).update(
+                application_count=F('application_count') - 1
+            )
+            CacheGeneration.bump(CacheGeneration.JOBS)
+        return result
+    
     @property
     def resume_name(self):
         """Return just the filename of the resume"""
         if self.resume:
             import os
             return os.path.basename(self.resume.name)
-        return None
\ No newline at end of file
+        return None
+
+
+class ExtractedTextCache(models.Model):
+    """
+    Text extracted from a resume file, keyed by the SHA-256 of the file bytes
+    so identical files are only ever parsed once
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+    byte_size = models.PositiveIntegerField(default=0, help_text="Size of the source file in bytes")
+    hit_count = models.PositiveIntegerField(default=0, help_text="Number of times this entry was reused")
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['-last_accessed_at']
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({len(self.text)} chars)"
+
+
+class AnalysisBatch(models.Model):
+    """A request to analyze every resume submitted to a job, processed by run_analysis_workers"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='analysis_batches')
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='analysis_batches')
+    total_tasks = models.PositiveIntegerField(default=0)
+    completed_tasks = models.PositiveIntegerField(default=0)
+    failed_tasks = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Analysis batch #{self.id} for {self.job.title}"
+    
+    @property
+    def processed_tasks(self):
+        return self.completed_tasks + self.failed_tasks
+    
+    @property
+    def status(self):
+        """Return 'completed', 'running' or 'queued' based on task progress"""
+        if self.processed_tasks >= self.total_tasks:
+            return 'completed'
+        if self.processed_tasks > 0 or self.tasks.filter(status='running').exists():
+            return 'running'
+        return 'queued'
+
+
+class AnalysisTask(models.Model):
+    """A single queued resume analysis, claimed by a worker with SELECT ... FOR UPDATE SKIP LOCKED"""
+    STATUSES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    batch = models.ForeignKey(AnalysisBatch, on_delete=models.CASCADE, related_name='tasks')
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='analysis_tasks')
+    status = models.CharField(max_length=20, choices=STATUSES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    claim_token = models.CharField(max_length=64, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='jobs_task_status_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Task #{self.id} ({self.status}) for application #{self.application_id}"
+
+
+class JobSkillIndex(models.Model):
+    """
+    Inverted index from canonical skill to the open jobs that require it, used to
+    recommend jobs for a resume. Rows exist only for active, non-archived jobs and
+    are rebuilt whenever a job's requirements profile or listing state changes.
+    """
+    CATEGORIES = [
+        ('technical_skills', 'Technical Skills'),
+        ('education', 'Education'),
+        ('soft_skills', 'Soft Skills'),
+    ]
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_index_entries')
+    category = models.CharField(max_length=20, choices=CATEGORIES)
+    skill = models.CharField(max_length=100)
+    weight = models.FloatField(help_text="Points this skill adds to the job's overall match score")
+    
+    # Denormalized per job so a single aggregate over the index yields the full score
+    base_score = models.FloatField(default=0, help_text="Points awarded for categories with no requirements")
+    required_experience_years = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['category', 'skill', 'job']
+    
+    def __str__(self):
+        return f"{self.category}:{self.skill} -> job #{self.job_id}"
+
+
+class JobSkillIndexChange(models.Model):
+    """
+    Append-only log of jobs whose JobSkillIndex rows changed, so each process can
+    refresh its in-memory copy of the index incrementally. A null job_id means
+    the whole index was rebuilt.
+    """
+    job_id = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"Index change #{self.id} (job #{self.job_id})" if self.job_id else f"Index change #{self.id} (rebuild)"
+
+
+class CacheGeneration(models.Model):
+    """
+    Monotonic version counter for a cached data set. Writers bump it after their
+    transaction commits and cache entries are keyed by it, so one bump invalidates
+    the entries of every process at once.
+    """
+    JOBS = 'jobs'
+    ARCHIVE_SCHEDULE = 'archive_schedule'
+    
+    key = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.key} generation {self.value}"
+    
+    @classmethod
+    def current(cls, key):
+        """Return the generation row for a key, creating it on first use"""
+        generation, _ = cls.objects.get_or_create(key=key)
+        return generation
+    
+    @classmethod
+    def bump(cls, key):
+        """Advance the generation once the surrounding transaction (if any) commits"""
+        def advance():
+            updated = cls.objects.filter(key=key).update(value=F('value') + 1, updated_at=timezone.now())
+            if not updated:
+                cls.objects.get_or_create(key=key)
+        
+        transaction.on_commit(advance)
+
+
+class SchedulerLease(models.Model):
+    """
+    Time-limited leadership of a background task shared by several processes.
+    Expiry is compared against the database clock, and a conditional UPDATE hands
+    the lease over, so it works through a transaction pooler where session locks
+    cannot be held.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    holder = models.CharField(max_length=100, blank=True)
+    expires_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.name} held by {self.holder or 'nobody'} until {self.expires_at}"
+    
+    @classmethod
+    def acquire(cls, name, holder, seconds):
+        """Take or renew the lease for `seconds`; False if another holder's lease is still valid"""
+        cls.objects.get_or_create(name=name)
+        expires_at = ExpressionWrapper(Now() + timedelta(seconds=seconds), output_field=models.DateTimeField())
+        return bool(
+            cls.objects.filter(name=name)
+            .filter(Q(expires_at__lt=Now()) | Q(holder=holder))
+            .update(holder=holder, expires_at=expires_at)
+        )
+    
+    @classmethod
+    def release(cls, name, holder):
+        """Let the next process take over without waiting for the lease to expire"""
+        cls.objects.filter(name=name, holder=holder).update(holder='', expires_at=Now())
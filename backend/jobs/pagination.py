@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination for job listings
+
+Pages are ordered newest first on (created_at, id) and each page continues
+strictly after the last row of the previous one, so jobs posted while a user
+scrolls never shift or duplicate rows the way OFFSET pagination would, and
+deep pages cost the same as the first one. Search results use the same
+scheme on (search_rank, id).
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class JobCursorPagination(BasePagination):
+    """Keyset pagination over (-created_at, -id) with a bounded page size"""
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(requested, 1), self.max_page_size)
+
+    def position_for(self, job):
+        """Text form of a row's sort key, stored in the cursor"""
+        return f'{job.created_at.isoformat()}|{job.pk}'
+
+    def parse_position(self, position):
+        created_at, pk = position.split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+
+    def filter_after(self, queryset, position):
+        """Rows strictly after the given position in the page ordering"""
+        created_at, pk = position
+        return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    def encode_cursor(self, job):
+        return base64.urlsafe_b64encode(self.position_for(job).encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        """Return the sort key position from the request, or None for the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            return self.parse_position(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = self.filter_after(queryset, position)
+
+        # Fetch one extra row to learn whether another page exists
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.next_cursor = self.encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'next_cursor': self.next_cursor,
+            'next': self.get_next_link(),
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'results': schema,
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+            },
+        }
+
+
+class SearchCursorPagination(JobCursorPagination):
+    """Keyset pagination over search results, best match first on (-search_rank, -id)"""
+
+    ordering = ('-search_rank', '-id')
+
+    def position_for(self, job):
+        # repr() round-trips the float exactly, so the next page resumes at the same rank
+        return f'{job.search_rank!r}|{job.pk}'
+
+    def parse_position(self, position):
+        rank, pk = position.split('|')
+        return float(rank), int(pk)
+
+    def filter_after(self, queryset, position):
+        rank, pk = position
+        return queryset.filter(Q(search_rank__lt=rank) | Q(search_rank=rank, id__lt=pk))
@@ -0,0 +1,379 @@
+"""
+Job recommendations for a resume
+
+The analyzer scores one job against many resumes. To go the other way without
+parsing every job per request, JobSkillIndex maps each canonical skill to the
+open jobs requiring it. Each row carries the points the skill is worth in that
+job's overall score, so summing the rows that match a resume's skills (plus the
+job's fixed points) ranks every candidate job. The best few are then re-scored
+exactly with calculate_structured_match.
+
+Each process keeps the index in memory as a dense job x skill weight matrix
+and refreshes it incrementally from JobSkillIndexChange, so a recommendation
+is a handful of NumPy column sums. Change ids are allocated when a transaction
+inserts them but become visible when it commits, so a smaller id can appear
+after a larger one; every refresh therefore re-reads the last few minutes of
+the log and applies any change it has not seen yet. Without NumPy the same sum runs as a SQL
+aggregate over JobSkillIndex.
+
+Jobs sharing no skill with the resume are never recommended.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to aggregating the index in SQL
+    np = None
+
+from django.db.models import Case, F, FloatField, Max, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Job, JobSkillIndex, JobSkillIndexChange
+from .resume_analyzer import resume_analyzer, REQUIREMENTS_PROFILE_VERSION, SCORE_WEIGHTS
+
+
+logger = logging.getLogger(__name__)
+
+# Resume profile category -> requirements profile key
+INDEXED_CATEGORIES = (
+    ('technical_skills', 'required_technical_skills'),
+    ('education', 'required_education'),
+    ('soft_skills', 'required_soft_skills'),
+)
+
+# Candidates re-scored exactly per requested recommendation, to absorb float rounding
+CANDIDATE_MULTIPLIER = 2
+
+# Change log entries are kept this long for processes catching up; a process idle
+# for longer reloads the whole index
+CHANGE_LOG_RETENTION = timedelta(hours=24)
+
+# How long after its created_at a change may still become visible (transaction
+# duration plus clock skew between hosts); refreshes re-read this window
+LATE_COMMIT_WINDOW = timedelta(minutes=5)
+
+# Each process prunes the change log at most this often
+PRUNE_INTERVAL = timedelta(minutes=10)
+
+_last_pruned_at = None
+
+
+def _prune_change_log():
+    """Delete change log entries older than CHANGE_LOG_RETENTION, at most once per PRUNE_INTERVAL"""
+    global _last_pruned_at
+    now = timezone.now()
+    if _last_pruned_at is not None and now - _last_pruned_at < PRUNE_INTERVAL:
+        return
+    _last_pruned_at = now
+    JobSkillIndexChange.objects.filter(created_at__lt=now - CHANGE_LOG_RETENTION).delete()
+
+
+def _log_index_change(job_ids):
+    """Record changed jobs (None = full rebuild) and prune the old end of the log"""
+    JobSkillIndexChange.objects.bulk_create([JobSkillIndexChange(job_id=job_id) for job_id in job_ids])
+    _prune_change_log()
+
+
+def index_entries_for(job: Job, job_json: Dict) -> List[JobSkillIndex]:
+    """Build (unsaved) index rows for a job's requirements"""
+    base_score = sum(
+        SCORE_WEIGHTS[category] * 100
+        for category, key in INDEXED_CATEGORIES
+        if not job_json[key]
+    )
+    entries = []
+
+    for category, key in INDEXED_CATEGORIES:
+        required = list(dict.fromkeys(job_json[key]))
+        for skill in required:
+            entries.append(JobSkillIndex(
+                job=job,
+                category=category,
+                skill=skill[:100],
+                weight=SCORE_WEIGHTS[category] * 100 / len(required),
+                base_score=base_score,
+                required_experience_years=job_json['required_experience_years'],
+            ))
+
+    return entries
+
+
+def sync_job_skill_index(job: Job):
+    """Replace a job's index rows; closed (inactive or archived) jobs are removed from the index"""
+    JobSkillIndex.objects.filter(job_id=job.pk).delete()
+
+    if job.is_active and not job.is_archived:
+        if (job.requirements_profile or {}).get('version') == REQUIREMENTS_PROFILE_VERSION:
+            job_json = job.requirements_profile
+        else:
+            job_json = resume_analyzer.get_job_requirements(job)
+        JobSkillIndex.objects.bulk_create(index_entries_for(job, job_json), ignore_conflicts=True)
+
+    _log_index_change([job.pk])
+
+
+def remove_jobs_from_index(job_ids: Iterable[int]) -> int:
+    """Drop index rows for jobs closed in bulk (e.g. by queryset.update)"""
+    job_ids = list(job_ids)
+    deleted, _ = JobSkillIndex.objects.filter(job_id__in=job_ids).delete()
+    _log_index_change(job_ids)
+    return deleted
+
+
+def rebuild_job_skill_index(batch_size: int = 500) -> int:
+    """Rebuild the whole index from open jobs, returning the number of jobs indexed"""
+    JobSkillIndex.objects.all().delete()
+    indexed = 0
+    pending = []
+
+    for job in Job.objects.filter(is_active=True, is_archived=False).iterator(chunk_size=batch_size):
+        pending.extend(index_entries_for(job, resume_analyzer.get_job_requirements(job)))
+        indexed += 1
+        if len(pending) >= batch_size:
+            JobSkillIndex.objects.bulk_create(pending, batch_size=batch_size, ignore_conflicts=True)
+            pending = []
+
+    JobSkillIndex.objects.bulk_create(pending, batch_size=batch_size, ignore_conflicts=True)
+    _log_index_change([None])
+    return indexed
+
+
+def _resume_skill_filter(resume_json: Dict) -> Q:
+    matches = Q()
+    for category, _ in INDEXED_CATEGORIES:
+        skills = list(resume_json.get(category) or [])
+        if skills:
+            matches |= Q(category=category, skill__in=skills)
+    return matches
+
+
+def candidate_job_ids_sql(resume_json: Dict, limit: int, exclude_job_ids: Iterable[int] = ()) -> List[int]:
+    """Ids of the open jobs with the highest indexed score, aggregated in the database"""
+    matches = _resume_skill_filter(resume_json)
+    if not matches:
+        return []
+
+    years = resume_json.get('experience_years') or 0
+    experience_points = SCORE_WEIGHTS['experience'] * 100
+
+    queryset = JobSkillIndex.objects.filter(matches)
+    exclude_job_ids = list(exclude_job_ids)
+    if exclude_job_ids:
+        queryset = queryset.exclude(job_id__in=exclude_job_ids)
+
+    rows = (
+        queryset.values('job_id')
+        .annotate(
+            skill_points=Sum('weight'),
+            base_points=Max('base_score'),
+            required_years=Max('required_experience_years'),
+        )
+        .annotate(
+            indexed_score=F('skill_points') + F('base_points') + Case(
+                When(required_years__lte=years, then=Value(experience_points)),
+                default=Value(years * experience_points) / F('required_years'),
+                output_field=FloatField(),
+            )
+        )
+        .order_by('-indexed_score', 'job_id')
+        .values_list('job_id', flat=True)[:limit]
+    )
+    return list(rows)
+
+
+class SkillIndexCache:
+    """
+    In-memory copy of JobSkillIndex: one row of skill weights per open job
+
+    Only skills of the analyzer taxonomy get a column, since resume profiles
+    never contain anything else; other job skills still count through the
+    weights of the skills that can match.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = None
+        self._last_change_id = None
+        self._recent_change_ids = set()
+        self._refreshed_at = None
+        self._slots = {}
+        self._size = 0
+
+    def _allocate(self, capacity: int):
+        self.weights = np.zeros((capacity, len(self._columns)), dtype=np.float64)
+        self.base_scores = np.zeros(capacity, dtype=np.float64)
+        self.required_years = np.zeros(capacity, dtype=np.float64)
+        self.job_ids = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, needed: int):
+        capacity = len(self.alive)
+        if self._size + needed <= capacity:
+            return
+        old = (self.weights, self.base_scores, self.required_years, self.job_ids, self.alive)
+        self._allocate(max(capacity * 2, self._size + needed, 1024))
+        for target, source in zip((self.weights, self.base_scores, self.required_years, self.job_ids, self.alive), old):
+            target[:self._size] = source[:self._size]
+
+    def _load_jobs(self, job_ids=None):
+        """Add rows for jobs currently in the index (all of them when job_ids is None)"""
+        queryset = JobSkillIndex.objects.all()
+        if job_ids is not None:
+            queryset = queryset.filter(job_id__in=job_ids)
+
+        rows = {}
+        for job_id, category, skill, weight, base_score, years in queryset.values_list(
+            'job_id', 'category', 'skill', 'weight', 'base_score', 'required_experience_years'
+        ).iterator(chunk_size=5000):
+            entry = rows.setdefault(job_id, [base_score, years, []])
+            column = self._columns.get((category, skill))
+            if column is not None:
+                entry[2].append((column, weight))
+
+        self._grow(len(rows))
+        for job_id, (base_score, years, weights) in rows.items():
+            slot = self._size
+            self._size += 1
+            self._slots[job_id] = slot
+            self.job_ids[slot] = job_id
+            self.base_scores[slot] = base_score
+            self.required_years[slot] = years
+            self.alive[slot] = True
+            for column, weight in weights:
+                self.weights[slot, column] = weight
+
+    def _full_load(self, now):
+        # Read the log position before the index, so changes made during the load are applied next time
+        self._last_change_id = JobSkillIndexChange.objects.aggregate(latest=Max('id'))['latest'] or 0
+        self._recent_change_ids = set(
+            JobSkillIndexChange.objects.filter(created_at__gte=now - LATE_COMMIT_WINDOW).values_list('id', flat=True)
+        )
+        self._refreshed_at = now
+
+        taxonomies = {
+            'technical_skills': resume_analyzer.tech_keywords,
+            'education': resume_analyzer.education_keywords,
+            'soft_skills': resume_analyzer.soft_skills,
+        }
+        self._columns = {
+            (category, canonical): column
+            for column, (category, canonical) in enumerate(
+                (category, canonical) for category, _ in INDEXED_CATEGORIES for canonical in taxonomies[category]
+            )
+        }
+        self._slots = {}
+        self._size = 0
+        self._allocate(1024)
+        self._load_jobs()
+        logger.info(f"Loaded skill index for {len(self._slots)} open jobs")
+
+    def refresh(self):
+        """Apply index changes made by any process since the last refresh"""
+        with self._lock:
+            now = timezone.now()
+            if self._refreshed_at is None or now - self._refreshed_at > CHANGE_LOG_RETENTION - LATE_COMMIT_WINDOW:
+                # First use, or changes this process never read may have been pruned
+                self._full_load(now)
+                return
+
+            # New ids, plus recent ones whose transactions may have committed after a larger id was read
+            cutoff = now - LATE_COMMIT_WINDOW
+            recent = list(
+                JobSkillIndexChange.objects.filter(Q(id__gt=self._last_change_id) | Q(created_at__gte=cutoff))
+                .values_list('id', 'job_id', 'created_at')
+            )
+            changes = [(change_id, job_id) for change_id, job_id, _ in recent if change_id not in self._recent_change_ids]
+            self._recent_change_ids = {change_id for change_id, _, created_at in recent if created_at >= cutoff}
+            self._last_change_id = max([self._last_change_id] + [change_id for change_id, _ in changes])
+            self._refreshed_at = now
+            if not changes:
+                return
+
+            dead_slots = self._size - len(self._slots)
+            if dead_slots > len(self._slots) or any(job_id is None for _, job_id in changes):
+                self._full_load(now)
+                return
+
+            changed_job_ids = {job_id for _, job_id in changes}
+            for job_id in changed_job_ids:
+                slot = self._slots.pop(job_id, None)
+                if slot is not None:
+                    self.alive[slot] = False
+            self._load_jobs(changed_job_ids)
+
+    def candidate_job_ids(self, resume_json: Dict, limit: int, exclude_job_ids: Iterable[int] = ()) -> List[int]:
+        """Ids of the open jobs with the highest indexed score for a resume profile"""
+        self.refresh()
+
+        columns = [
+            self._columns[(category, skill)]
+            for category, _ in INDEXED_CATEGORIES
+            for skill in set(resume_json.get(category) or ())
+            if (category, skill) in self._columns
+        ]
+        if not columns or not self._size:
+            return []
+
+        size = self._size
+        matched = self.weights[:size, columns]
+        scores = matched.sum(axis=1) + self.base_scores[:size]
+
+        years = resume_json.get('experience_years') or 0
+        required_years = self.required_years[:size]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores += np.where(
+                required_years <= years,
+                SCORE_WEIGHTS['experience'] * 100,
+                years * SCORE_WEIGHTS['experience'] * 100 / required_years
+            )
+
+        eligible = self.alive[:size] & (matched > 0).any(axis=1)
+        exclude_job_ids = list(exclude_job_ids)
+        if exclude_job_ids:
+            eligible &= ~np.isin(self.job_ids[:size], exclude_job_ids)
+
+        slots = np.flatnonzero(eligible)
+        if len(slots) > limit:
+            slots = slots[np.argpartition(-scores[slots], limit - 1)[:limit]]
+        slots = slots[np.lexsort((self.job_ids[slots], -scores[slots]))]
+        return self.job_ids[slots].tolist()
+
+
+def candidate_job_ids(resume_json: Dict, limit: int, exclude_job_ids: Iterable[int] = ()) -> List[int]:
+    """Ids of the open jobs with the highest indexed score for a resume profile"""
+    if np is None:
+        return candidate_job_ids_sql(resume_json, limit, exclude_job_ids)
+    return skill_index_cache.candidate_job_ids(resume_json, limit, exclude_job_ids)
+
+
+def recommend_jobs(resume_json: Dict, limit: int = 10, exclude_job_ids: Iterable[int] = ()) -> List[Tuple[Job, Dict]]:
+    """
+    Rank open jobs for a structured resume profile
+
+    Args:
+        resume_json (Dict): Resume profile as returned by ResumeProfile.as_resume_json
+        limit (int): Number of jobs to return
+        exclude_job_ids: Jobs to leave out (e.g. ones already applied to)
+
+    Returns:
+        List[Tuple[Job, Dict]]: (job, calculate_structured_match result), best match first
+    """
+    job_ids = candidate_job_ids(resume_json, limit * CANDIDATE_MULTIPLIER, exclude_job_ids)
+    if not job_ids:
+        return []
+
+    jobs = Job.objects.filter(id__in=job_ids, is_active=True, is_archived=False).select_related('posted_by')
+    scored = [
+        (job, resume_analyzer.calculate_structured_match(resume_json, resume_analyzer.get_job_requirements(job)))
+        for job in jobs
+    ]
+    scored.sort(key=lambda pair: (-pair[1]['overall_score'], pair[0].id))
+    return scored[:limit]
+
+
+# Global instance
+skill_index_cache = SkillIndexCache()
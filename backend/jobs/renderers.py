@@ -0,0 +1,46 @@
+"""
+Renderers for streamed endpoints
+
+Streaming views write their own body, so these renderers exist for content
+negotiation (?format=ndjson / ?format=sse or the Accept header) and to render
+error responses returned before streaming starts in the negotiated format.
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+def ndjson_line(record) -> str:
+    """Encode one record as a newline-delimited JSON line"""
+    return json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def sse_event(event: str, record) -> str:
+    """Encode one record as a Server-Sent Events message"""
+    data = json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f'event: {event}\ndata: {data}\n\n'
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return ndjson_line(data).encode(self.charset)
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        event = 'error' if isinstance(data, dict) and 'error' in data else 'message'
+        return sse_event(event, data).encode(self.charset)
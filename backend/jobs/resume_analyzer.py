@@ -12,6 +12,31 @@ import logging
 from typing import Dict, List, Tuple, Set
 from django.conf import settings
 
+from .skill_matcher import SkillMatcher
+from .text_cache import resume_text_cache, sha256_of_file, sha256_of_upload
+
+# Bump when parsing or the keyword taxonomies change so stored job profiles are rebuilt
+REQUIREMENTS_PROFILE_VERSION = 1
+
+# Bump when parse_resume_to_json changes so stored resume profiles are re-parsed
+RESUME_PROFILE_VERSION = 1
+
+# Weight of each category in the overall match score
+SCORE_WEIGHTS = {
+    'technical_skills': 0.50,
+    'education': 0.20,
+    'soft_skills': 0.15,
+    'experience': 0.15,
+}
+
+# Keys of a structured job requirements dict
+JOB_REQUIREMENT_KEYS = (
+    'required_technical_skills',
+    'required_education',
+    'required_soft_skills',
+    'required_experience_years',
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -82,6 +107,31 @@ class ResumeAnalyzer:
             'teamwork': ['teamwork', 'team', 'collaborate', 'collaboration'],
             'adaptability': ['adaptable', 'adaptability', 'flexible'],
         }
+        
+        # Compiled single-pass matcher over all taxonomies (built on first use)
+        self._taxonomy_matcher = None
+        self._batch_scorer = None
+    
+    def get_taxonomy_matcher(self) -> SkillMatcher:
+        """Return the compiled matcher for the keyword taxonomies, building it once"""
+        if self._taxonomy_matcher is None:
+            self._taxonomy_matcher = SkillMatcher({
+                'technical_skills': self.tech_keywords,
+                'education': self.education_keywords,
+                'soft_skills': self.soft_skills,
+            })
+        return self._taxonomy_matcher
+    
+    def get_batch_scorer(self):
+        """Return the vectorized scorer for many resume profiles against one job, building it once"""
+        if self._batch_scorer is None:
+            from .batch_scoring import BatchScorer
+            self._batch_scorer = BatchScorer({
+                'technical_skills': self.tech_keywords,
+                'education': self.education_keywords,
+                'soft_skills': self.soft_skills,
+            })
+        return self._batch_scorer
     
     def parse_resume_to_json(self, resume_text: str) -> Dict:
         """
@@ -95,29 +145,8 @@ class ResumeAnalyzer:
         """
         resume_lower = resume_text.lower()
         
-        # Extract technical skills
-        found_tech_skills = {}
-        for skill_name, variations in self.tech_keywords.items():
-            for variation in variations:
-                if variation in resume_lower:
-                    found_tech_skills[skill_name] = True
-                    break
-        
-        # Extract education
-        found_education = {}
-        for edu_name, variations in self.education_keywords.items():
-            for variation in variations:
-                if variation in resume_lower:
-                    found_education[edu_name] = True
-                    break
-        
-        # Extract soft skills
-        found_soft_skills = {}
-        for skill_name, variations in self.soft_skills.items():
-            for variation in variations:
-                if variation in resume_lower:
-                    found_soft_skills[skill_name] = True
-                    break
+        # Extract technical skills, education and soft skills in one pass
+        found = self.get_taxonomy_matcher().match(resume_lower)
         
         # Extract years of experience (simple pattern matching)
         experience_years = 0
@@ -135,9 +164,9 @@ class ResumeAnalyzer:
                     pass
         
         return {
-            'technical_skills': list(found_tech_skills.keys()),
-            'education': list(found_education.keys()),
-            'soft_skills': list(found_soft_skills.keys()),
+            'technical_skills': found['technical_skills'],
+            'education': found['education'],
+            'soft_skills': found['soft_skills'],
             'experience_years': experience_years,
             'raw_text_length': len(resume_text)
         }
@@ -189,29 +218,8 @@ class ResumeAnalyzer:
         # Fallback to text extraction (for backwards compatibility or when fields not set)
         full_text = f"{job_description} {job_requirements}".lower()
         
-        # Extract required technical skills
-        required_tech_skills = {}
-        for skill_name, variations in self.tech_keywords.items():
-            for variation in variations:
-                if variation in full_text:
-                    required_tech_skills[skill_name] = True
-                    break
-        
-        # Extract required education
-        required_education = {}
-        for edu_name, variations in self.education_keywords.items():
-            for variation in variations:
-                if variation in full_text:
-                    required_education[edu_name] = True
-                    break
-        
-        # Extract required soft skills
-        required_soft_skills = {}
-        for skill_name, variations in self.soft_skills.items():
-            for variation in variations:
-                if variation in full_text:
-                    required_soft_skills[skill_name] = True
-                    break
+        # Extract required technical skills, education and soft skills in one pass
+        required = self.get_taxonomy_matcher().match(full_text)
         
         # Extract required years of experience
         required_years = 0
@@ -229,12 +237,48 @@ class ResumeAnalyzer:
                     pass
         
         return {
-            'required_technical_skills': list(required_tech_skills.keys()),
-            'required_education': list(required_education.keys()),
-            'required_soft_skills': list(required_soft_skills.keys()),
+            'required_technical_skills': required['technical_skills'],
+            'required_education': required['education'],
+            'required_soft_skills': required['soft_skills'],
             'required_experience_years': required_years
         }
     
+    def build_requirements_profile(self, job) -> Dict:
+        """
+        Build the persisted requirements profile for a Job: normalized, de-duplicated
+        requirement lists plus the experience threshold, tagged with the profile version
+        
+        Args:
+            job (Job): Job model instance
+            
+        Returns:
+            Dict: Requirements profile as stored in Job.requirements_profile
+        """
+        job_json = self.parse_job_to_json(job.description, job.requirements or "", job_model=job)
+        
+        profile = {'version': REQUIREMENTS_PROFILE_VERSION}
+        for key in JOB_REQUIREMENT_KEYS[:3]:
+            normalized = (item.strip().lower() for item in job_json[key] if item and item.strip())
+            profile[key] = list(dict.fromkeys(normalized))
+        profile['required_experience_years'] = job_json['required_experience_years'] or 0
+        return profile
+    
+    def get_job_requirements(self, job) -> Dict:
+        """
+        Return structured job requirements from the Job's stored profile,
+        rebuilding and persisting it only if it is missing or outdated
+        
+        Args:
+            job (Job): Job model instance
+            
+        Returns:
+            Dict: Structured job requirements (same shape as parse_job_to_json)
+        """
+        profile = job.requirements_profile or {}
+        if profile.get('version') != REQUIREMENTS_PROFILE_VERSION:
+            profile = job.refresh_requirements_profile(persist=True)
+        return {key: profile[key] for key in JOB_REQUIREMENT_KEYS}
+    
     def calculate_structured_match(self, resume_json: Dict, job_json: Dict) -> Dict:
         """
         Calculate match score using structured JSON data with weighted categories
@@ -296,10 +340,10 @@ class ResumeAnalyzer:
         
         # Calculate weighted total score
         total_score = (
-            tech_score * 0.50 +
-            edu_score * 0.20 +
-            soft_score * 0.15 +
-            exp_score * 0.15
+            tech_score * SCORE_WEIGHTS['technical_skills'] +
+            edu_score * SCORE_WEIGHTS['education'] +
+            soft_score * SCORE_WEIGHTS['soft_skills'] +
+            exp_score * SCORE_WEIGHTS['experience']
         )
         
         return {
@@ -329,7 +373,8 @@ class ResumeAnalyzer:
     
     def extract_text_from_file(self, file_path: str) -> str:
         """
-        Extract text from various file formats (PDF, DOC, DOCX, TXT)
+        Extract text from various file formats (PDF, DOC, DOCX, TXT),
+        reusing previously extracted text for identical file contents
         
         Args:
             file_path (str): Path to the resume file
@@ -337,6 +382,62 @@ class ResumeAnalyzer:
         Returns:
             str: Extracted text content
         """
+        try:
+            file_hash = sha256_of_file(file_path)
+        except OSError as e:
+            print(f"Error reading {file_path}: {str(e)}")
+            return ""
+        
+        return self._extract_text_for_hash(file_path, file_hash)
+    
+    def _extract_text_for_hash(self, file_path: str, file_hash: str) -> str:
+        """Extract text for a file whose digest is already known, consulting the text cache"""
+        cached_text = resume_text_cache.get(file_hash)
+        if cached_text is not None:
+            return cached_text
+        
+        text = self._extract_text_uncached(file_path)
+        if text.strip():
+            resume_text_cache.set(file_hash, text, byte_size=os.path.getsize(file_path))
+        return text
+    
+    def extract_text_from_upload(self, resume_file) -> str:
+        """
+        Extract text from an uploaded file, only spooling it to disk on a cache miss
+        
+        Args:
+            resume_file: UploadedFile object from Django
+            
+        Returns:
+            str: Extracted text content
+        """
+        file_hash = sha256_of_upload(resume_file)
+        
+        cached_text = resume_text_cache.get(file_hash)
+        if cached_text is not None:
+            return cached_text
+        
+        import tempfile
+        
+        # Create a temporary file to save the uploaded file
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume_file.name)[1]) as tmp_file:
+            for chunk in resume_file.chunks():
+                tmp_file.write(chunk)
+            tmp_path = tmp_file.name
+        
+        try:
+            text = self._extract_text_uncached(tmp_path)
+        finally:
+            # Clean up temporary file
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        
+        if text.strip():
+            resume_text_cache.set(file_hash, text, byte_size=resume_file.size or 0)
+        return text
+    
+    def _extract_text_uncached(self, file_path: str) -> str:
+        """Extract text from a file by format, without consulting the text cache"""
         try:
             file_extension = os.path.splitext(file_path)[1].lower()
             
@@ -753,11 +854,10 @@ class ResumeAnalyzer:
             
             self.logger.info(f"=== Starting JSON-based analysis for: {resume_path} ===")
             
-            # Extract text from resume
-            resume_text = self.extract_text_from_file(resume_path)
-            self.logger.info(f"Extracted text length: {len(resume_text)} characters")
+            # Load or build the parsed resume profile (extracts text only for unseen files)
+            resume_profile = self.get_resume_profile(resume_path)
             
-            if not resume_text.strip():
+            if resume_profile is None:
                 self.logger.error("Resume text is empty after extraction")
                 return {
                     'error': 'Could not extract text from resume',
@@ -765,17 +865,13 @@ class ResumeAnalyzer:
                     'analysis': None
                 }
             
-            # Parse resume into structured JSON
-            resume_json = self.parse_resume_to_json(resume_text)
+            # Link the profile so the application can be rescored later; callers save the application
+            job_application.resume_profile = resume_profile
+            resume_json = resume_profile.as_resume_json()
             self.logger.info(f"Resume JSON: {json.dumps(resume_json, indent=2)}")
             
-            # Parse job requirements into structured JSON
-            # Pass job_model to use custom requirements if available
-            job_json = self.parse_job_to_json(
-                job_application.job.description,
-                job_application.job.requirements or "",
-                job_model=job_application.job
-            )
+            # Read the job's precomputed requirements profile
+            job_json = self.get_job_requirements(job_application.job)
             self.logger.info(f"Job JSON: {json.dumps(job_json, indent=2)}")
             
             # Calculate structured match score
@@ -783,22 +879,10 @@ class ResumeAnalyzer:
             self.logger.info(f"Overall Match Score: {match_results['overall_score']}%")
             self.logger.info(f"Category Scores: {json.dumps(match_results['category_scores'], indent=2)}")
             
-            # Generate summary
-            summary = self.generate_structured_summary(match_results)
-            
             return {
                 'error': None,
                 'score': match_results['overall_score'],
-                'analysis': {
-                    'resume_structure': resume_json,
-                    'job_requirements': job_json,
-                    'overall_score': match_results['overall_score'],
-                    'category_scores': match_results['category_scores'],
-                    'matched': match_results['matched'],
-                    'missing': match_results['missing'],
-                    'experience': match_results['experience'],
-                    'summary': summary
-                }
+                'analysis': self._build_application_analysis(resume_json, job_json, match_results)
             }
             
         except Exception as e:
@@ -809,6 +893,95 @@ class ResumeAnalyzer:
                 'analysis': None
             }
     
+    def get_resume_profile(self, file_path: str):
+        """
+        Return the stored ResumeProfile for a resume file, parsing the file only when
+        no profile exists for its contents or the profile predates the current parser
+        
+        Args:
+            file_path (str): Path to the resume file
+            
+        Returns:
+            ResumeProfile or None if no text could be extracted
+        """
+        from .models import ResumeProfile
+        
+        file_hash = sha256_of_file(file_path)
+        
+        profile = ResumeProfile.objects.filter(sha256=file_hash).first()
+        if profile and profile.parser_version == RESUME_PROFILE_VERSION:
+            return profile
+        
+        resume_text = self._extract_text_for_hash(file_path, file_hash)
+        self.logger.info(f"Extracted text length: {len(resume_text)} characters")
+        if not resume_text.strip():
+            return None
+        
+        resume_json = self.parse_resume_to_json(resume_text)
+        profile, _ = ResumeProfile.objects.update_or_create(
+            sha256=file_hash,
+            defaults={
+                'technical_skills': resume_json['technical_skills'],
+                'education': resume_json['education'],
+                'soft_skills': resume_json['soft_skills'],
+                'experience_years': resume_json['experience_years'],
+                'raw_text_length': resume_json['raw_text_length'],
+                'parser_version': RESUME_PROFILE_VERSION,
+            }
+        )
+        return profile
+    
+    def _build_application_analysis(self, resume_json: Dict, job_json: Dict, match_results: Dict) -> Dict:
+        """Assemble the analysis payload stored in JobApplication.resume_analysis_data"""
+        return {
+            'resume_structure': resume_json,
+            'job_requirements': job_json,
+            'overall_score': match_results['overall_score'],
+            'category_scores': match_results['category_scores'],
+            'matched': match_results['matched'],
+            'missing': match_results['missing'],
+            'experience': match_results['experience'],
+            'summary': self.generate_structured_summary(match_results)
+        }
+    
+    def rescore_job_applications(self, job) -> Dict:
+        """
+        Recompute match scores for every application of a job from stored resume
+        profiles alone, without touching the resume files
+        
+        Args:
+            job (Job): Job model instance
+            
+        Returns:
+            Dict: Number of applications rescored and skipped (no stored profile yet)
+        """
+        from django.utils import timezone
+        from .models import JobApplication
+        
+        job_json = self.get_job_requirements(job)
+        applications = list(
+            JobApplication.objects.filter(job=job, resume_profile__isnull=False).select_related('resume_profile')
+        )
+        now = timezone.now()
+        
+        for application in applications:
+            resume_json = application.resume_profile.as_resume_json()
+            match_results = self.calculate_structured_match(resume_json, job_json)
+            application.resume_analysis_score = match_results['overall_score']
+            application.resume_analysis_data = self._build_application_analysis(resume_json, job_json, match_results)
+            application.analysis_completed = True
+            application.analysis_date = now
+        
+        JobApplication.objects.bulk_update(
+            applications,
+            ['resume_analysis_score', 'resume_analysis_data', 'analysis_completed', 'analysis_date'],
+            batch_size=500
+        )
+        
+        skipped = JobApplication.objects.filter(job=job, resume_profile__isnull=True).exclude(resume='').count()
+        self.logger.info(f"Rescored {len(applications)} applications for job #{job.id} ({skipped} without a stored profile)")
+        return {'rescored': len(applications), 'skipped': skipped}
+    
     def generate_structured_summary(self, match_results: Dict) -> str:
         """
         Generate a friendly, conversational summary from structured match results
@@ -984,72 +1157,76 @@ class ResumeAnalyzer:
             Dict: Complete analysis results with category breakdowns
         """
         try:
-            import tempfile
-            import os
+            self.logger.info(f"=== Starting bulk analysis for: {resume_file.name} ===")
             
-            # Create a temporary file to save the uploaded file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume_file.name)[1]) as tmp_file:
-                for chunk in resume_file.chunks():
-                    tmp_file.write(chunk)
-                tmp_path = tmp_file.name
+            # Extract text from resume, skipping the parse entirely for previously seen files
+            resume_text = self.extract_text_from_upload(resume_file)
             
-            try:
-                self.logger.info(f"=== Starting bulk analysis for: {resume_file.name} ===")
-                
-                # Extract text from resume
-                resume_text = self.extract_text_from_file(tmp_path)
-                self.logger.info(f"Extracted text length: {len(resume_text)} characters")
-                
-                if not resume_text.strip():
-                    self.logger.error("Resume text is empty after extraction")
-                    return {
-                        'error': 'Could not extract text from resume',
-                        'score': 0,
-                        'analysis': None
-                    }
-                
-                # Parse resume into structured JSON
-                resume_json = self.parse_resume_to_json(resume_text)
-                self.logger.info(f"Resume JSON: {json.dumps(resume_json, indent=2)}")
-                
-                # Parse job requirements into structured JSON
-                # Pass job_model to use custom requirements if available
-                job_json = self.parse_job_to_json(
-                    job.description,
-                    job.requirements or "",
-                    job_model=job
-                )
-                self.logger.info(f"Job JSON: {json.dumps(job_json, indent=2)}")
-                
-                # Calculate structured match score
-                match_results = self.calculate_structured_match(resume_json, job_json)
-                self.logger.info(f"Overall Match Score: {match_results['overall_score']}%")
-                
-                # Generate summary
-                summary = self.generate_structured_summary(match_results)
-                
+            return self.analyze_extracted_text(resume_text, job)
+            
+        except Exception as e:
+            self.logger.exception(f"Error analyzing resume file {resume_file.name}")
+            return {
+                'error': str(e),
+                'score': 0,
+                'analysis': None
+            }
+    
+    def analyze_extracted_text(self, resume_text: str, job) -> Dict:
+        """
+        Score already-extracted resume text against a job posting.
+        Shared by serial and process-pool bulk analysis.
+        
+        Args:
+            resume_text (str): Text extracted from the resume
+            job: Job model instance
+            
+        Returns:
+            Dict: Complete analysis results with category breakdowns
+        """
+        try:
+            self.logger.info(f"Extracted text length: {len(resume_text)} characters")
+            
+            if not resume_text.strip():
+                self.logger.error("Resume text is empty after extraction")
                 return {
-                    'error': None,
-                    'score': match_results['overall_score'],
-                    'analysis': {
-                        'resume_structure': resume_json,
-                        'job_requirements': job_json,
-                        'overall_score': match_results['overall_score'],
-                        'category_scores': match_results['category_scores'],
-                        'matched_keywords': match_results['matched'],
-                        'missing_keywords': match_results['missing'],
-                        'experience': match_results['experience'],
-                        'summary': summary
-                    }
+                    'error': 'Could not extract text from resume',
+                    'score': 0,
+                    'analysis': None
                 }
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                    
+            
+            # Parse resume into structured JSON
+            resume_json = self.parse_resume_to_json(resume_text)
+            self.logger.info(f"Resume JSON: {json.dumps(resume_json, indent=2)}")
+            
+            # Read the job's precomputed requirements profile
+            job_json = self.get_job_requirements(job)
+            self.logger.info(f"Job JSON: {json.dumps(job_json, indent=2)}")
+            
+            # Calculate structured match score
+            match_results = self.calculate_structured_match(resume_json, job_json)
+            self.logger.info(f"Overall Match Score: {match_results['overall_score']}%")
+            
+            # Generate summary
+            summary = self.generate_structured_summary(match_results)
+            
+            return {
+                'error': None,
+                'score': match_results['overall_score'],
+                'analysis': {
+                    'resume_structure': resume_json,
+                    'job_requirements': job_json,
+                    'overall_score': match_results['overall_score'],
+                    'category_scores': match_results['category_scores'],
+                    'matched_keywords': match_results['matched'],
+                    'missing_keywords': match_results['missing'],
+                    'experience': match_results['experience'],
+                    'summary': summary
+                }
+            }
+            
         except Exception as e:
-            self.logger.exception(f"Error analyzing resume file {resume_file.name}")
+            self.logger.exception("Error analyzing extracted resume text")
             return {
                 'error': str(e),
                 'score': 0,
@@ -0,0 +1,194 @@
+"""
+In-process scheduler that archives jobs at their exact archive_at time
+
+Replaces the 15-minute archive cron: a daemon thread in the web process keeps
+a min-heap of the next upcoming (archive_at, job id) deadlines, sleeps until
+the earliest one and archives everything due at that moment through
+jobs.archiving.
+
+Only one process runs it. Every process that starts the scheduler competes
+for a SchedulerLease row: the leader renews it on every loop iteration and the
+others retry periodically, taking over once the lease has expired. A lease row
+rather than a session advisory lock, because DATABASE_URL goes through the
+transaction pooler, which does not keep a session for the thread. Archiving is
+idempotent, so a brief overlap while a lease changes hands (or with the
+archive_expired_jobs cron) is harmless.
+
+The heap is reloaded whenever the archive_schedule CacheGeneration changes,
+which Job.save bumps when archive_at, is_active or is_archived is written.
+Saves in the leader's own process wake it immediately; saves elsewhere are
+picked up within ARCHIVE_SCHEDULER_POLL_SECONDS.
+
+Enable with ARCHIVE_SCHEDULER_ENABLED=True; gunicorn.conf.py starts it in each
+worker once the app is loaded. Importing wsgi.py/asgi.py does not, so
+management commands and tests never run it.
+"""
+
+import heapq
+import logging
+import os
+import socket
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .archiving import archive_due_jobs
+from .models import CacheGeneration, Job, SchedulerLease
+
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'jobs.archive_scheduler'
+
+# Upcoming deadlines held in memory; later ones are loaded as the heap drains
+HEAP_SIZE = 1000
+
+
+class ArchiveScheduler:
+    """Leader-elected background thread archiving jobs at their deadlines"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._heap = []
+        self._generation = None
+        self.holder = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.is_leader = False
+
+    @property
+    def poll_seconds(self) -> float:
+        return getattr(settings, 'ARCHIVE_SCHEDULER_POLL_SECONDS', 5)
+
+    @property
+    def leader_retry_seconds(self) -> float:
+        return getattr(settings, 'ARCHIVE_SCHEDULER_LEADER_RETRY_SECONDS', 60)
+
+    @property
+    def lease_seconds(self) -> float:
+        # Renewed every poll, so it must comfortably outlast one
+        return max(getattr(settings, 'ARCHIVE_SCHEDULER_LEASE_SECONDS', 30), self.poll_seconds * 3)
+
+    def start(self):
+        """Start the scheduler thread once per process"""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='archive-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self):
+        """Re-check the schedule now (called after a Job save commits in this process)"""
+        if not self.is_leader:
+            return
+        with self._condition:
+            self._generation = None
+            self._condition.notify_all()
+
+    # Leader election
+
+    def _hold_lease(self) -> bool:
+        """Take the lease, or renew it if this scheduler already leads"""
+        return SchedulerLease.acquire(LEASE_NAME, self.holder, self.lease_seconds)
+
+    def _resign(self):
+        """Give up leadership and hand the lease to the next process"""
+        was_leader = self.is_leader
+        self.is_leader = False
+        self._heap = []
+        self._generation = None
+        if was_leader:
+            try:
+                SchedulerLease.release(LEASE_NAME, self.holder)
+            except Exception:
+                # The lease simply expires instead
+                logger.warning('Archive scheduler could not release its lease', exc_info=True)
+        connection.close()
+
+    # Scheduling
+
+    def _reload(self):
+        """Load the earliest upcoming deadlines if the archive schedule changed"""
+        generation = CacheGeneration.current(CacheGeneration.ARCHIVE_SCHEDULE).value
+        if generation == self._generation:
+            return
+        upcoming = Job.objects.filter(
+            is_active=True, is_archived=False, archive_at__isnull=False
+        ).order_by('archive_at', 'id').values_list('archive_at', 'id')[:HEAP_SIZE]
+        self._heap = list(upcoming)
+        heapq.heapify(self._heap)
+        self._generation = generation
+
+    def _archive_due(self):
+        now = timezone.now()
+        if not self._heap or self._heap[0][0] > now:
+            return
+
+        archived = sum(len(batch) for batch in archive_due_jobs(now))
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+        if archived:
+            logger.info('Archive scheduler archived %d job(s)', archived)
+        if not self._heap:
+            # The heap drained; load the next deadlines beyond it
+            self._generation = None
+
+    def _seconds_until_next(self) -> float:
+        if not self.is_leader:
+            return self.leader_retry_seconds
+        if not self._heap:
+            return self.poll_seconds
+        remaining = (self._heap[0][0] - timezone.now()).total_seconds()
+        return max(min(remaining, self.poll_seconds), 0)
+
+    def _run(self):
+        logger.info('Archive scheduler started')
+        while True:
+            with self._condition:
+                if self._stopping:
+                    break
+
+            try:
+                was_leader = self.is_leader
+                self.is_leader = self._hold_lease()
+                if self.is_leader and not was_leader:
+                    logger.info('Archive scheduler is the leader in process %d', os.getpid())
+                elif was_leader and not self.is_leader:
+                    logger.warning('Archive scheduler lost its lease to another process')
+                    self._resign()
+                if self.is_leader:
+                    self._reload()
+                    self._archive_due()
+            except Exception:
+                # Keep the thread alive whatever went wrong; another process can lead meanwhile
+                logger.exception('Archive scheduler failed; resigning')
+                self._resign()
+
+            with self._condition:
+                if not self._stopping:
+                    self._condition.wait(self._seconds_until_next())
+
+        if self.is_leader:
+            self._resign()
+        logger.info('Archive scheduler stopped')
+
+
+def start_archive_scheduler():
+    """Start the scheduler in this process if ARCHIVE_SCHEDULER_ENABLED is set"""
+    if getattr(settings, 'ARCHIVE_SCHEDULER_ENABLED', False):
+        archive_scheduler.start()
+
+
+# Global instance
+archive_scheduler = ArchiveScheduler()
@@ -0,0 +1,193 @@
+"""
+Full-text search over open jobs
+
+Jobs are searched by title, company, location, description and required
+skills through a real index, so a query touches only matching rows instead of
+scanning the table:
+
+- PostgreSQL: a stored, weighted tsvector column (jobs_job.search_vector)
+  with a GIN index, queried with websearch_to_tsquery and ranked by ts_rank.
+- SQLite: an FTS5 table (jobs_job_fts) over the same columns, kept in sync
+  with jobs_job by triggers and ranked by bm25.
+
+The column and table live outside the Job model; migration 0017 installs
+them through install_search_index(). SQLite drops a table's triggers when
+Django rebuilds it during a migration, so run
+``python manage.py rebuild_job_search_index`` if results ever go stale.
+"""
+
+import re
+from typing import Iterable
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Job, JobSkillIndex
+
+
+# Indexed fields, most important first
+SEARCH_FIELDS = ('title', 'company', 'location', 'description', 'required_skills')
+
+SQLITE_FTS_TABLE = 'jobs_job_fts'
+
+# bm25 weight per FTS5 column, in SEARCH_FIELDS order
+SQLITE_COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 1.0, 6.0)
+
+POSTGRES_SEARCH_CONFIG = 'english'
+
+_SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, company, location, description, required_skills,
+        content='jobs_job', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_insert AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, company, location, description, required_skills)
+        VALUES (new.id, new.title, new.company, new.location, new.description, new.required_skills);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_delete AFTER DELETE ON jobs_job BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, company, location, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description, old.required_skills);
+    END
+    """,
+    # Only the indexed columns; counter and status updates leave the index alone
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_update
+    AFTER UPDATE OF title, company, location, description, required_skills ON jobs_job BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, company, location, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description, old.required_skills);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, company, location, description, required_skills)
+        VALUES (new.id, new.title, new.company, new.location, new.description, new.required_skills);
+    END
+    """,
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+_SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}',
+]
+
+_POSTGRES_INSTALL = [
+    f"""
+    ALTER TABLE jobs_job ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(required_skills::text, '')), 'A') ||
+        setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(location, '')), 'C') ||
+        setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(description, '')), 'D')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS jobs_job_search_vector_idx ON jobs_job USING GIN (search_vector)',
+]
+
+_POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS jobs_job_search_vector_idx',
+    'ALTER TABLE jobs_job DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def install_search_index(schema_editor):
+    """Create the search index for the current database (no-op on other backends)"""
+    statements = {'postgresql': _POSTGRES_INSTALL, 'sqlite': _SQLITE_INSTALL}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(schema_editor):
+    statements = {'postgresql': _POSTGRES_UNINSTALL, 'sqlite': _SQLITE_UNINSTALL}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word must match (implicit AND); the last word also matches as a
+    prefix so results appear while the user is still typing. FTS5 operators
+    in the input are treated as plain words.
+    """
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def skill_names(skill: str) -> set:
+    """Canonical skill names (as stored in JobSkillIndex) mentioned in a skill filter value"""
+    from .resume_analyzer import resume_analyzer
+
+    found = resume_analyzer.get_taxonomy_matcher().match(skill.lower())
+    names = {name for category_names in found.values() for name in category_names}
+    return names or {skill.strip().lower()}
+
+
+def filter_jobs(jobs, job_type: str = None, location: str = None, skills: Iterable[str] = ()):
+    """Narrow a Job queryset by type, location substring and required skills (all must match)"""
+    if job_type:
+        jobs = jobs.filter(job_type=job_type)
+    if location:
+        jobs = jobs.filter(location__icontains=location)
+    for skill in skills:
+        if skill.strip():
+            jobs = jobs.filter(id__in=JobSkillIndex.objects.filter(skill__in=skill_names(skill)).values('job_id'))
+    return jobs
+
+
+def search_jobs(query: str, jobs=None):
+    """
+    Open jobs matching a free-text query, annotated with search_rank (higher is better)
+
+    Args:
+        query: Words to search for
+        jobs: Optional Job queryset to search within (defaults to open jobs)
+
+    Returns:
+        QuerySet: Matching jobs; unordered, callers sort by ('-search_rank', '-id').
+            Empty when the query has no searchable words.
+    """
+    if jobs is None:
+        jobs = Job.objects.filter(is_active=True, is_archived=False)
+
+    if connection.vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)"
+        return jobs.filter(
+            RawSQL(f'jobs_job.search_vector @@ {tsquery}', (query,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank(jobs_job.search_vector, {tsquery})', (query,), output_field=FloatField())
+        )
+
+    if connection.vendor == 'sqlite':
+        match = fts_query(query)
+        if not match:
+            return jobs.none()
+        # bm25 is lower for better matches; negate it so every backend ranks descending
+        weights = ', '.join(str(weight) for weight in SQLITE_COLUMN_WEIGHTS)
+        return jobs.extra(
+            tables=[SQLITE_FTS_TABLE],
+            where=[f'{SQLITE_FTS_TABLE}.rowid = jobs_job.id', f'{SQLITE_FTS_TABLE} MATCH %s'],
+            params=[match],
+        ).annotate(
+            search_rank=RawSQL(f'-bm25({SQLITE_FTS_TABLE}, {weights})', (), output_field=FloatField())
+        )
+
+    # Other backends: unindexed substring match on every word, all ranked equally
+    words = query.split()
+    if not words:
+        return jobs.none()
+    for word in words:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': word})
+        jobs = jobs.filter(condition)
+    return jobs.annotate(search_rank=RawSQL('0', (), output_field=FloatField()))
@@ -0,0 +1,134 @@
+"""
+Compiled skill taxonomy matcher
+
+Turns the analyzer's keyword taxonomies ({category: {canonical: [synonyms]}})
+into a single trie-shaped regular expression so every category can be matched
+in one pass over the lowercased text, instead of one substring scan per synonym.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+
+# Characters that count as part of a word when checking match boundaries
+WORD_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+# Inflections accepted on longer alphabetic synonyms ("team" -> "teams", "collaborate" -> "collaborated")
+INFLECTION_SUFFIXES = ('s', 'es', 'd', 'ed', 'ing')
+MIN_INFLECTABLE_LENGTH = 4
+
+_TERMINAL = ''
+
+
+def _inflections(synonym: str) -> List[str]:
+    """Return the synonym plus the inflected forms it should also match"""
+    forms = [synonym]
+    if len(synonym) >= MIN_INFLECTABLE_LENGTH and synonym.isalpha():
+        forms.extend(synonym + suffix for suffix in INFLECTION_SUFFIXES)
+        if synonym.endswith('e'):
+            forms.append(synonym[:-1] + 'ing')
+    return forms
+
+
+def _trie_to_pattern(node: Dict) -> str:
+    """Render a character trie as a regex that prefers the longest alternative"""
+    is_terminal = _TERMINAL in node
+    branches = []
+    for char in sorted(key for key in node if key != _TERMINAL):
+        branches.append(re.escape(char) + _trie_to_pattern(node[char]))
+
+    if not branches:
+        return ''
+
+    if len(branches) == 1:
+        body = branches[0]
+        grouped = body if len(body) == 1 and not is_terminal else f'(?:{body})'
+    else:
+        grouped = '(?:' + '|'.join(branches) + ')'
+
+    return grouped + '?' if is_terminal else grouped
+
+
+class SkillMatcher:
+    """
+    Matches every synonym of a taxonomy in a single scan of the text
+
+    Synonyms only match on word boundaries, so short synonyms like 'it', 'ts'
+    or 'py' no longer fire inside unrelated words. Overlapping synonyms are
+    all reported (e.g. 'github actions' yields both ci/cd and git).
+    """
+
+    def __init__(self, taxonomies: Dict[str, Dict[str, Iterable[str]]]):
+        self.categories = list(taxonomies.keys())
+        self.synonym_count = 0
+
+        # Surface form -> [(category, canonical name)]
+        self._targets: Dict[str, List[Tuple[str, str]]] = {}
+        # Canonical name position inside its category, used to keep taxonomy order
+        self._order: Dict[Tuple[str, str], int] = {}
+        self._trie: Dict = {}
+
+        for category, taxonomy in taxonomies.items():
+            for position, (canonical, synonyms) in enumerate(taxonomy.items()):
+                self._order[(category, canonical)] = position
+                for synonym in synonyms:
+                    self.synonym_count += 1
+                    for form in _inflections(synonym.lower()):
+                        self._add_form(form, category, canonical)
+
+        pattern = _trie_to_pattern(self._trie) or r'(?!)'
+        # Zero-width lookahead so a match can start at every word boundary,
+        # including inside a longer match that was already reported
+        self._regex = re.compile(
+            rf'(?<![{WORD_CHARS}])(?=((?:{pattern}))(?![{WORD_CHARS}]))'
+        )
+
+    def _add_form(self, form: str, category: str, canonical: str):
+        targets = self._targets.setdefault(form, [])
+        if (category, canonical) in targets:
+            return
+        targets.append((category, canonical))
+
+        node = self._trie
+        for char in form:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = True
+
+    def _prefix_forms(self, matched: str) -> Iterable[str]:
+        """Yield the matched form plus every shorter form it starts with that ends on a boundary"""
+        node = self._trie
+        for index, char in enumerate(matched):
+            node = node.get(char)
+            if node is None:
+                return
+            if _TERMINAL in node:
+                next_index = index + 1
+                if next_index == len(matched) or matched[next_index] not in WORD_CHARS:
+                    yield matched[:next_index]
+
+    def match(self, text_lower: str) -> Dict[str, List[str]]:
+        """
+        Find every canonical name mentioned in already-lowercased text
+
+        Args:
+            text_lower (str): Lowercased text to scan
+
+        Returns:
+            Dict[str, List[str]]: Canonical names found per category, in taxonomy order
+        """
+        found = {category: set() for category in self.categories}
+        seen_forms = set()
+
+        for match in self._regex.finditer(text_lower):
+            matched = match.group(1)
+            if matched in seen_forms:
+                continue
+            seen_forms.add(matched)
+            for form in self._prefix_forms(matched):
+                for category, canonical in self._targets.get(form, ()):
+                    found[category].add(canonical)
+
+        return {
+            category: sorted(names, key=lambda name: self._order[(category, name)])
+            for category, names in found.items()
+        }
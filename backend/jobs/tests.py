@@ -0,0 +1,981 @@
+import asyncio
+import importlib
+import importlib.util
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from . import batch_scoring, recommendations
+from .archiving import archive_batch, archive_due_jobs
+from .analysis_queue import claim_tasks, enqueue_job_analysis, process_task
+from .extraction_pool import ExtractionPool
+from .scheduler import LEASE_NAME, ArchiveScheduler
+from .search import SQLITE_FTS_TABLE, search_jobs
+from .text_cache import ResumeTextCache, sha256_of_chunks
+from .models import (
+    AnalysisBatch, AnalysisTask, CacheGeneration, ExtractedTextCache, Job, JobApplication, JobSkillIndex,
+    JobSkillIndexChange, ResumeProfile, SchedulerLease,
+)
+from .resume_analyzer import REQUIREMENTS_PROFILE_VERSION, RESUME_PROFILE_VERSION, resume_analyzer
+from .skill_matcher import WORD_CHARS, SkillMatcher, _inflections
+
+
+RESUME_TEXTS = [
+    "Senior engineer, 7 years of experience. Python, Django, PostgreSQL, React and AWS. "
+    "Bachelor's in Computer Science. Led a team of five; strong communication.",
+    "Junior developer with 1 year of experience in JavaScript and React. Collaborative and adaptable.",
+    "PhD in computer science. Machine learning, TensorFlow, Python. 3 years experience. Analytical problem solving.",
+    "Retail associate. Friendly and punctual.",
+]
+
+JOB_REQUIREMENTS = [
+    {
+        'required_technical_skills': ['python', 'django', 'postgresql', 'docker'],
+        'required_education': ['bachelor', 'computer science'],
+        'required_soft_skills': ['communication', 'teamwork'],
+        'required_experience_years': 5,
+    },
+    {
+        'required_technical_skills': ['react', 'javascript'],
+        'required_education': [],
+        'required_soft_skills': ['adaptability'],
+        'required_experience_years': 2,
+    },
+    {
+        # Requirements outside the taxonomy that no candidate has
+        'required_technical_skills': ['cobol', 'fortran', 'python'],
+        'required_education': ['phd'],
+        'required_soft_skills': [],
+        'required_experience_years': 0,
+    },
+    {
+        # No requirements at all
+        'required_technical_skills': [],
+        'required_education': [],
+        'required_soft_skills': [],
+        'required_experience_years': 0,
+    },
+]
+
+EDGE_PROFILES = [
+    {'technical_skills': [], 'education': [], 'soft_skills': [], 'experience_years': 0},
+    {'technical_skills': ['python', 'python', 'rust-lang'], 'education': ['bachelor'], 'soft_skills': [],
+     'experience_years': 12},
+    {'technical_skills': ['react'], 'education': [], 'soft_skills': ['adaptability'], 'experience_years': 1.5},
+]
+
+
+SKILL_TEXTS = [
+    "Python3 and Django developer; some Java, mostly JavaScript (node.js, react.js).",
+    "Worked with java and javascript. Built CI/CD with GitHub Actions and Jenkins.",
+    "Machine learning engineer: deep learning, machine-learning pipelines, ML ops.",
+    "Spring Boot services on Amazon Web Services; Postgres, psql and MongoDB.",
+    "It was a team effort: teams collaborated, collaborating on the ts-node setup.",
+    "",
+]
+
+
+def search_match(taxonomies, text_lower):
+    """Reference matcher: one word-bounded re.search per synonym form"""
+    boundary = f'[{WORD_CHARS}]'
+    return {
+        category: [
+            canonical for canonical, synonyms in taxonomy.items()
+            if any(
+                re.search(rf'(?<!{boundary}){re.escape(form)}(?!{boundary})', text_lower)
+                for synonym in synonyms for form in _inflections(synonym.lower())
+            )
+        ]
+        for category, taxonomy in taxonomies.items()
+    }
+
+
+class SkillMatcherTests(SimpleTestCase):
+    """The compiled matcher finds exactly what a word-bounded re.search per synonym finds"""
+
+    taxonomies = {
+        'technical_skills': {
+            'java': ['java'],
+            'javascript': ['javascript', 'js'],
+            'machine learning': ['machine learning', 'ml', 'deep learning'],
+            'ci/cd': ['ci/cd', 'jenkins', 'github actions'],
+            'git': ['git', 'github'],
+        },
+        'soft_skills': {'teamwork': ['team', 'collaborate']},
+    }
+
+    def test_matches_re_search(self):
+        matchers = [
+            (SkillMatcher(self.taxonomies), self.taxonomies),
+            (resume_analyzer.get_taxonomy_matcher(), {
+                'technical_skills': resume_analyzer.tech_keywords,
+                'education': resume_analyzer.education_keywords,
+                'soft_skills': resume_analyzer.soft_skills,
+            }),
+        ]
+        for matcher, taxonomies in matchers:
+            for text in SKILL_TEXTS:
+                with self.subTest(text=text):
+                    self.assertEqual(matcher.match(text.lower()), search_match(taxonomies, text.lower()))
+
+    def test_word_boundaries(self):
+        matcher = resume_analyzer.get_taxonomy_matcher()
+        cases = [
+            ('python3', []),
+            ('python, django', ['python', 'django']),
+            ('copy of the ts-node repo', ['typescript', 'node.js']),
+            ('it is typescript', ['typescript']),
+            ('happy path', []),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(matcher.match(text)['technical_skills'], expected)
+
+    def test_overlapping_skills(self):
+        matcher = SkillMatcher(self.taxonomies)
+        self.assertEqual(matcher.match('javascript')['technical_skills'], ['javascript'])
+        self.assertEqual(matcher.match('java and javascript')['technical_skills'], ['java', 'javascript'])
+        self.assertEqual(matcher.match('github actions')['technical_skills'], ['ci/cd', 'git'])
+
+    def test_multi_word_skills(self):
+        matcher = SkillMatcher(self.taxonomies)
+        self.assertEqual(matcher.match('machine learning')['technical_skills'], ['machine learning'])
+        self.assertEqual(matcher.match('machine-learning')['technical_skills'], [])
+        self.assertEqual(matcher.match('a machine for learning')['technical_skills'], [])
+        self.assertEqual(matcher.match('teams collaborated')['soft_skills'], ['teamwork'])
+
+
+class RequirementsProfileTests(TestCase):
+    """Job.save keeps requirements_profile in step with the fields it is derived from"""
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        self.job = Job.objects.create(
+            title='Backend Engineer', company='Acme', location='Remote', posted_by=self.poster,
+            description='Backend work', required_skills=[' Python ', 'python', 'Django'], min_experience_years=3,
+        )
+
+    def count_builds(self):
+        return mock.patch.object(resume_analyzer, 'build_requirements_profile',
+                                 wraps=resume_analyzer.build_requirements_profile)
+
+    def stored_profile(self):
+        return Job.objects.get(pk=self.job.pk).requirements_profile
+
+    def test_profile_is_built_on_create(self):
+        profile = self.stored_profile()
+        self.assertEqual(profile['version'], REQUIREMENTS_PROFILE_VERSION)
+        self.assertEqual(profile['required_technical_skills'], ['python', 'django'])
+        self.assertEqual(profile['required_experience_years'], 3)
+
+    def test_requirement_change_rebuilds(self):
+        self.job.required_skills = ['Rust']
+        with self.count_builds() as build:
+            self.job.save()
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(self.stored_profile()['required_technical_skills'], ['rust'])
+
+    def test_unrelated_change_does_not_rebuild(self):
+        job = Job.objects.get(pk=self.job.pk)
+        job.title = 'Renamed'
+        with self.count_builds() as build:
+            job.save()
+            job.save(update_fields=['title'])
+        build.assert_not_called()
+
+    def test_update_fields_with_a_requirement_persist_the_profile(self):
+        self.job.min_experience_years = 7
+        self.job.save(update_fields=['min_experience_years'])
+        self.assertEqual(self.stored_profile()['required_experience_years'], 7)
+
+    def test_outdated_profile_is_rebuilt_once_on_read(self):
+        Job.objects.filter(pk=self.job.pk).update(requirements_profile={'version': REQUIREMENTS_PROFILE_VERSION - 1})
+        job = Job.objects.get(pk=self.job.pk)
+
+        with self.count_builds() as build:
+            job_json = resume_analyzer.get_job_requirements(job)
+            self.assertEqual(job_json['required_technical_skills'], ['python', 'django'])
+            resume_analyzer.get_job_requirements(Job.objects.get(pk=self.job.pk))
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(self.stored_profile()['version'], REQUIREMENTS_PROFILE_VERSION)
+
+
+class ResumeProfileTests(TestCase):
+    """Parsed resumes are stored once per file and applications are rescored from them"""
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        self.token = Token.objects.create(user=self.poster)
+        self.job = Job.objects.create(title='Backend Engineer', company='Acme', location='Remote',
+                                      description='Backend work', posted_by=self.poster, required_skills=['Python'])
+
+    def resume_path(self, text=RESUME_TEXTS[0]):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as resume_file:
+            resume_file.write(text)
+        self.addCleanup(os.unlink, resume_file.name)
+        return resume_file.name
+
+    def test_profile_is_reused_for_the_same_file(self):
+        path = self.resume_path()
+        first = resume_analyzer.get_resume_profile(path)
+        self.assertEqual(first.parser_version, RESUME_PROFILE_VERSION)
+        self.assertIn('python', first.technical_skills)
+
+        with mock.patch.object(resume_analyzer, '_extract_text_for_hash') as extract:
+            self.assertEqual(resume_analyzer.get_resume_profile(path), first)
+        extract.assert_not_called()
+        self.assertEqual(ResumeProfile.objects.count(), 1)
+
+    def test_outdated_profile_is_reparsed(self):
+        path = self.resume_path()
+        profile = resume_analyzer.get_resume_profile(path)
+        ResumeProfile.objects.filter(pk=profile.pk).update(
+            parser_version=RESUME_PROFILE_VERSION - 1, technical_skills=[]
+        )
+
+        reparsed = resume_analyzer.get_resume_profile(path)
+        self.assertEqual(reparsed.pk, profile.pk)
+        self.assertEqual(reparsed.parser_version, RESUME_PROFILE_VERSION)
+        self.assertEqual(reparsed.technical_skills, profile.technical_skills)
+
+    def test_rescore_uses_stored_profiles_only(self):
+        profile = resume_analyzer.get_resume_profile(self.resume_path())
+        applicants = User.objects.bulk_create([User(username=f'applicant-{index}') for index in range(2)])
+        analyzed = JobApplication.objects.create(job=self.job, applicant=applicants[0], resume='resumes/missing.pdf',
+                                                 resume_profile=profile)
+        JobApplication.objects.create(job=self.job, applicant=applicants[1], resume='resumes/unparsed.pdf')
+
+        self.job.required_skills = ['Rust']
+        self.job.save()
+        with mock.patch.object(resume_analyzer, '_extract_text_for_hash') as extract:
+            response = self.client.post(f'/api/jobs/{self.job.pk}/rescore/',
+                                        headers={'Authorization': f'Token {self.token.key}'})
+        extract.assert_not_called()
+        self.assertEqual(response.json(), {'job_id': self.job.pk, 'rescored': 1, 'skipped': 1})
+
+        expected = resume_analyzer.calculate_structured_match(
+            profile.as_resume_json(), resume_analyzer.get_job_requirements(self.job)
+        )
+        analyzed.refresh_from_db()
+        self.assertEqual(analyzed.resume_analysis_score, expected['overall_score'])
+        self.assertEqual(analyzed.resume_analysis_data['job_requirements']['required_technical_skills'], ['rust'])
+        self.assertTrue(analyzed.analysis_completed)
+
+
+class BatchScoringTests(TestCase):
+    """BatchScorer returns exactly what calculate_structured_match returns, profile by profile"""
+
+    def setUp(self):
+        self.profiles = [resume_analyzer.parse_resume_to_json(text) for text in RESUME_TEXTS] + EDGE_PROFILES
+        self.scorer = resume_analyzer.get_batch_scorer()
+
+    def scalar_scores(self, profiles, job_json):
+        return [
+            {key: match[key] for key in ('overall_score', 'category_scores')}
+            for match in (resume_analyzer.calculate_structured_match(profile, job_json) for profile in profiles)
+        ]
+
+    def assert_matches_scalar(self, profiles, job_json):
+        self.assertEqual(self.scorer.score_profiles(profiles, job_json), self.scalar_scores(profiles, job_json))
+
+    def test_matches_scalar_scores(self):
+        for job_json in JOB_REQUIREMENTS:
+            with self.subTest(job=job_json):
+                self.assert_matches_scalar(self.profiles, job_json)
+
+    def test_matches_scalar_scores_without_numpy(self):
+        with mock.patch.object(batch_scoring, 'np', None):
+            for job_json in JOB_REQUIREMENTS:
+                with self.subTest(job=job_json):
+                    self.assert_matches_scalar(self.profiles, job_json)
+
+    def test_empty_skills(self):
+        empty = [EDGE_PROFILES[0]]
+        for job_json in JOB_REQUIREMENTS:
+            with self.subTest(job=job_json):
+                self.assert_matches_scalar(empty, job_json)
+
+    def test_empty_pool(self):
+        encoded = self.scorer.encode([])
+        self.assertEqual(self.scorer.score(encoded, JOB_REQUIREMENTS[0]), [])
+        self.assertEqual(self.scorer.top_matches(encoded, JOB_REQUIREMENTS[0]), [])
+
+    def test_job_without_requirements_profile(self):
+        poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        job = Job.objects.create(
+            title='Backend Engineer', company='Acme', location='Remote', posted_by=poster,
+            description='We need a Python and Django developer with 3+ years of experience.',
+            requirements="Bachelor's degree. Strong communication.",
+        )
+        Job.objects.filter(pk=job.pk).update(requirements_profile={})
+        job.refresh_from_db()
+
+        job_json = resume_analyzer.get_job_requirements(job)
+        self.assertIn('python', job_json['required_technical_skills'])
+        self.assert_matches_scalar(self.profiles, job_json)
+
+    def test_top_matches_ranks_like_scalar(self):
+        job_json = JOB_REQUIREMENTS[0]
+        scalar = self.scalar_scores(self.profiles, job_json)
+        expected = sorted(range(len(scalar)), key=lambda index: (-scalar[index]['overall_score'], index))[:3]
+
+        top = self.scorer.top_matches(self.scorer.encode(self.profiles), job_json, limit=3)
+        self.assertEqual([index for index, _ in top], expected)
+        self.assertEqual([result for _, result in top], [scalar[index] for index in expected])
+
+
+class JobCursorPaginationTests(TestCase):
+    """Cursor pages of a job listing cover every job once, in a stable order"""
+
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', 'recruiter@example.com', 'password')
+        self.token = Token.objects.create(user=self.recruiter)
+        self.auth = {'Authorization': f'Token {self.token.key}'}
+
+    def get_page(self, cursor=None, page_size=2):
+        url = f'/api/jobs/my-jobs/?page_size={page_size}' + (f'&cursor={cursor}' if cursor else '')
+        return self.client.get(url, headers=self.auth)
+
+    def test_tied_created_at_pages_by_id(self):
+        Job.objects.bulk_create([
+            Job(title=f'Job {index}', company='Acme', location='Remote', description='Python', posted_by=self.recruiter)
+            for index in range(5)
+        ])
+        Job.objects.update(created_at=timezone.now())
+
+        seen, cursor = [], None
+        while True:
+            page = self.get_page(cursor).json()
+            seen.extend(job['id'] for job in page['results'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, sorted(Job.objects.values_list('id', flat=True), reverse=True))
+
+    def test_last_page_has_no_next(self):
+        Job.objects.create(title='Only', company='Acme', location='Remote', description='Python',
+                           posted_by=self.recruiter)
+        page = self.get_page().json()
+        self.assertEqual(len(page['results']), 1)
+        self.assertIsNone(page['next_cursor'])
+        self.assertIsNone(page['next'])
+
+    def test_next_link_continues_the_listing(self):
+        for index in range(3):
+            Job.objects.create(title=f'Job {index}', company='Acme', location='Remote', description='Python',
+                               posted_by=self.recruiter)
+        first = self.get_page().json()
+        self.assertEqual(len(self.client.get(first['next'], headers=self.auth).json()['results']), 1)
+
+    def test_invalid_cursor(self):
+        # Not base64, base64 of free text, and a position with empty fields
+        for cursor in ('not-base64!', 'bm90IGEgY3Vyc29y', 'fA=='):
+            with self.subTest(cursor=cursor):
+                response = self.get_page(cursor)
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
+
+
+# Look the token up on every request so each call costs the same
+@override_settings(AUTH_TOKEN_CACHE_TIMEOUT=0)
+class JobListingQueryTests(TestCase):
+    """Job listings cost the same number of queries however many jobs a page holds"""
+
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', 'recruiter@example.com', 'password')
+        self.token = Token.objects.create(user=self.recruiter)
+        self.other_posters = User.objects.bulk_create([User(username=f'poster-{index}') for index in range(2)])
+
+    def create_jobs(self, count, own=False, **fields):
+        # Spread public listings over several posters so every row needs its own posted_by
+        posters = [self.recruiter] if own else [self.recruiter, *self.other_posters]
+        Job.objects.bulk_create([
+            Job(title=f'Python developer {index}', company='Acme', location='Remote', description='Python',
+                posted_by=posters[index % len(posters)], **fields)
+            for index in range(count)
+        ])
+
+    def assert_constant_queries(self, url, **job_fields):
+        created = 0
+        for page_size in (5, 20):
+            with self.subTest(url=url, page_size=page_size):
+                self.create_jobs(page_size - created, **job_fields)
+                created = page_size
+                with self.assertNumQueries(2):  # Token lookup + one joined page query
+                    response = self.client.get(f'{url}{"&" if "?" in url else "?"}page_size={page_size}',
+                                               HTTP_AUTHORIZATION=f'Token {self.token.key}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()['results']), page_size)
+
+    def test_jobs_list(self):
+        self.assert_constant_queries('/api/jobs/')
+
+    def test_my_jobs(self):
+        self.assert_constant_queries('/api/jobs/my-jobs/', own=True)
+
+    def test_archived_jobs(self):
+        self.assert_constant_queries('/api/jobs/archived/', own=True, is_archived=True)
+
+    def test_job_search(self):
+        self.assert_constant_queries('/api/jobs/search/?q=python')
+
+
+class PublicJobsCacheTests(TestCase):
+    """Job writes bump the listing generation, which changes the ETag of the public listing"""
+
+    def setUp(self):
+        cache.clear()
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = Job.objects.create(title='Cached', company='Acme', location='Remote', description='Python',
+                                          posted_by=self.poster)
+
+    def get_public(self, **headers):
+        return self.client.get('/api/jobs/public/', headers=headers)
+
+    def assert_write_changes_etag(self, write):
+        response = self.get_public()
+        generation = CacheGeneration.current(CacheGeneration.JOBS).value
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+
+        self.assertEqual(CacheGeneration.current(CacheGeneration.JOBS).value, generation + 1)
+        changed = self.get_public(**{'If-None-Match': response['ETag']})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        return changed.json()['results']
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.get_public()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_public(**{'If-None-Match': response['ETag']}).status_code, 304)
+        self.assertEqual(self.get_public(**{'If-None-Match': 'W/"jobs-stale"'}).status_code, 200)
+
+    def test_create_changes_etag(self):
+        results = self.assert_write_changes_etag(lambda: Job.objects.create(
+            title='Fresh', company='Acme', location='Remote', description='Python', posted_by=self.poster
+        ))
+        self.assertEqual([job['title'] for job in results], ['Fresh', 'Cached'])
+
+    def test_update_changes_etag(self):
+        def rename():
+            self.job.title = 'Renamed'
+            self.job.save()
+        results = self.assert_write_changes_etag(rename)
+        self.assertEqual([job['title'] for job in results], ['Renamed'])
+
+    def test_archive_changes_etag(self):
+        def archive():
+            self.job.is_archived = True
+            self.job.save()
+        results = self.assert_write_changes_etag(archive)
+        self.assertEqual([job['is_archived'] for job in results], [True])
+
+
+class ArchivingTests(TestCase):
+    """Due jobs are archived in bounded batches, each exactly once"""
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        self.now = timezone.now()
+
+    def create_jobs(self, archive_ats, **fields):
+        return Job.objects.bulk_create([
+            Job(title=f'Job {index}', company='Acme', location='Remote', description='Python',
+                posted_by=self.poster, archive_at=archive_at, **fields)
+            for index, archive_at in enumerate(archive_ats)
+        ])
+
+    def test_batches_respect_batch_size(self):
+        jobs = self.create_jobs([self.now - timedelta(minutes=minutes) for minutes in range(5, 0, -1)])
+
+        batches = list(archive_due_jobs(self.now, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        # Oldest archive_at first
+        self.assertEqual([job_id for batch in batches for job_id, _, _ in batch], [job.pk for job in jobs])
+        self.assertEqual(Job.objects.filter(is_archived=True).count(), 5)
+
+    def test_single_batch_stops_at_batch_size(self):
+        self.create_jobs([self.now - timedelta(minutes=1)] * 3)
+        self.assertEqual(len(archive_batch(self.now, batch_size=2)), 2)
+        self.assertEqual(Job.objects.filter(is_archived=False).count(), 1)
+
+    def test_job_due_exactly_now_is_archived(self):
+        due, later = self.create_jobs([self.now, self.now + timedelta(microseconds=1)])
+        self.assertEqual(list(archive_due_jobs(self.now)), [[(due.pk, due.title, due.company)]])
+        later.refresh_from_db()
+        self.assertFalse(later.is_archived)
+
+    def test_rerun_archives_nothing(self):
+        self.create_jobs([self.now - timedelta(hours=1)] * 2)
+        self.create_jobs([self.now - timedelta(hours=1)], is_active=False)
+        self.assertEqual(len(list(archive_due_jobs(self.now))), 1)
+
+        generation = CacheGeneration.current(CacheGeneration.JOBS).value
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(list(archive_due_jobs(self.now)), [])
+        self.assertEqual(CacheGeneration.current(CacheGeneration.JOBS).value, generation)
+        self.assertFalse(Job.objects.filter(is_active=False, is_archived=True).exists())
+
+
+class SchedulerLeaseTests(TestCase):
+    """One scheduler leads at a time; another takes over once the lease expires or is released"""
+
+    def expire(self, name='lease'):
+        SchedulerLease.objects.filter(name=name).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_acquire_and_renew(self):
+        self.assertTrue(SchedulerLease.acquire('lease', 'first', 30))
+        self.assertFalse(SchedulerLease.acquire('lease', 'second', 30))
+
+        expires_at = SchedulerLease.objects.get(name='lease').expires_at
+        self.assertTrue(SchedulerLease.acquire('lease', 'first', 60))
+        self.assertGreater(SchedulerLease.objects.get(name='lease').expires_at, expires_at)
+
+    def test_takeover_after_expiry(self):
+        SchedulerLease.acquire('lease', 'first', 30)
+        self.expire()
+        self.assertTrue(SchedulerLease.acquire('lease', 'second', 30))
+        self.assertFalse(SchedulerLease.acquire('lease', 'first', 30))
+        self.assertEqual(SchedulerLease.objects.get(name='lease').holder, 'second')
+
+    def test_release(self):
+        SchedulerLease.acquire('lease', 'first', 30)
+        SchedulerLease.release('lease', 'second')
+        self.assertFalse(SchedulerLease.acquire('lease', 'second', 30))
+
+        SchedulerLease.release('lease', 'first')
+        self.assertTrue(SchedulerLease.acquire('lease', 'second', 30))
+
+    def test_schedulers_elect_one_leader(self):
+        leader, follower = ArchiveScheduler(), ArchiveScheduler()
+        self.assertTrue(leader._hold_lease())
+        self.assertFalse(follower._hold_lease())
+
+        # The follower takes over when the leader stops renewing
+        self.expire(LEASE_NAME)
+        self.assertTrue(follower._hold_lease())
+        self.assertFalse(leader._hold_lease())
+
+    @override_settings(ARCHIVE_SCHEDULER_ENABLED=True)
+    def test_importing_the_app_does_not_start_it(self):
+        with mock.patch.object(ArchiveScheduler, 'start') as start:
+            for module in ('backend.wsgi', 'backend.asgi'):
+                importlib.reload(importlib.import_module(module))
+        start.assert_not_called()
+
+    @override_settings(ARCHIVE_SCHEDULER_ENABLED=True)
+    def test_gunicorn_workers_start_it(self):
+        spec = importlib.util.spec_from_file_location('gunicorn_conf', settings.BASE_DIR / 'gunicorn.conf.py')
+        gunicorn_conf = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(gunicorn_conf)
+
+        with mock.patch.object(ArchiveScheduler, 'start') as start:
+            gunicorn_conf.post_worker_init(worker=None)
+        start.assert_called_once_with()
+
+
+class JobSearchTests(TestCase):
+    """The search index follows every job insert, update and delete, and pages by rank"""
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+
+    def create_job(self, title, description='General duties', **fields):
+        return Job.objects.create(title=title, company='Acme', location='Remote', description=description,
+                                  posted_by=self.poster, **fields)
+
+    def indexed_ids(self, word):
+        """Ids the index itself returns for a word, including rows the jobs table no longer has"""
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s', [word])
+                return sorted(row[0] for row in cursor.fetchall())
+        return sorted(search_jobs(word, Job.objects.all()).values_list('id', flat=True))
+
+    def test_insert_is_indexed(self):
+        job = self.create_job('Kotlin developer')
+        self.assertEqual(self.indexed_ids('kotlin'), [job.pk])
+        self.assertEqual(list(search_jobs('kotlin').values_list('id', flat=True)), [job.pk])
+
+    def test_update_reindexes(self):
+        job = self.create_job('Rust developer')
+        job.title = 'Elixir developer'
+        job.save()
+        self.assertEqual(self.indexed_ids('rust'), [])
+        self.assertEqual(self.indexed_ids('elixir'), [job.pk])
+
+        # Unindexed columns leave the entry as it is
+        Job.objects.filter(pk=job.pk).update(application_count=F('application_count') + 1)
+        self.assertEqual(self.indexed_ids('elixir'), [job.pk])
+
+    def test_delete_removes_entry(self):
+        job = self.create_job('Haskell developer')
+        job.delete()
+        self.assertEqual(self.indexed_ids('haskell'), [])
+
+    def test_title_match_ranks_above_description_match(self):
+        in_description = self.create_job('Backend developer', description='Some Scala experience')
+        in_title = self.create_job('Scala developer')
+        ranked = search_jobs('scala').order_by('-search_rank', '-id')
+        self.assertEqual([job.pk for job in ranked], [in_title.pk, in_description.pk])
+
+    def test_cursor_pages_follow_rank(self):
+        self.create_job('Backend developer', description='Some Scala experience')
+        for index in range(4):
+            self.create_job(f'Scala developer {index}')
+        expected = list(search_jobs('scala').order_by('-search_rank', '-id').values_list('id', flat=True))
+
+        first = self.client.get('/api/jobs/search/?q=scala&page_size=3').json()
+        self.assertIsNotNone(first['next_cursor'])
+        second = self.client.get(f'/api/jobs/search/?q=scala&page_size=3&cursor={first["next_cursor"]}').json()
+        self.assertIsNone(second['next_cursor'])
+
+        self.assertEqual([job['id'] for job in first['results'] + second['results']], expected)
+        self.assertEqual(len(expected), 5)
+
+
+class SkillIndexCacheTests(TestCase):
+    """The in-memory skill index sees every change, whatever order the changes commit in"""
+
+    resume = {'technical_skills': ['python'], 'education': [], 'soft_skills': [], 'experience_years': 3}
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        self.cache = recommendations.SkillIndexCache()
+
+    def create_job(self, title):
+        return Job.objects.create(title=title, company='Acme', location='Remote', posted_by=self.poster,
+                                  description='Python developer', requirements='Python')
+
+    def test_change_committed_after_a_newer_one_is_applied(self):
+        first = self.create_job('First')
+        self.assertEqual(self.cache.candidate_job_ids(self.resume, 10), [first.pk])
+
+        # A slow transaction took the next change id but commits after a faster one
+        late_id = JobSkillIndexChange.objects.order_by('-id').first().id + 1
+        JobSkillIndexChange.objects.create(id=late_id + 1, job_id=first.pk)
+        self.assertEqual(self.cache.candidate_job_ids(self.resume, 10), [first.pk])
+
+        with mock.patch.object(recommendations, '_log_index_change'):
+            late = self.create_job('Late')
+        JobSkillIndexChange.objects.create(id=late_id, job_id=late.pk)
+        self.assertEqual(sorted(self.cache.candidate_job_ids(self.resume, 10)), [first.pk, late.pk])
+
+    def test_closed_job_leaves_the_cache(self):
+        job = self.create_job('Closing')
+        self.assertEqual(self.cache.candidate_job_ids(self.resume, 10), [job.pk])
+
+        job.is_archived = True
+        job.save()
+        self.assertFalse(JobSkillIndex.objects.filter(job_id=job.pk).exists())
+        self.assertEqual(self.cache.candidate_job_ids(self.resume, 10), [])
+
+    def test_change_log_is_pruned_by_age(self):
+        job = self.create_job('Pruned')
+        old = JobSkillIndexChange.objects.create(job_id=job.pk)
+        JobSkillIndexChange.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - recommendations.CHANGE_LOG_RETENTION - timedelta(minutes=1)
+        )
+
+        with mock.patch.object(recommendations, '_last_pruned_at', None):
+            recommendations._log_index_change([job.pk])
+            self.assertFalse(JobSkillIndexChange.objects.filter(pk=old.pk).exists())
+            self.assertTrue(JobSkillIndexChange.objects.exists())
+
+            # Within PRUNE_INTERVAL nothing is deleted again
+            JobSkillIndexChange.objects.create(id=old.pk, job_id=job.pk)
+            JobSkillIndexChange.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=7))
+            recommendations._log_index_change([job.pk])
+            self.assertTrue(JobSkillIndexChange.objects.filter(pk=old.pk).exists())
+
+
+class AnalysisQueueTests(TestCase):
+    """Tasks abandoned on their last attempt fail instead of being retried forever"""
+
+    def setUp(self):
+        poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        applicant = User.objects.create_user('applicant', 'applicant@example.com', 'password')
+        self.job = Job.objects.create(title='Analyst', company='Acme', location='Remote', description='Python',
+                                      posted_by=poster)
+        JobApplication.objects.create(job=self.job, applicant=applicant, resume='resumes/applicant.pdf')
+        self.batch = enqueue_job_analysis(self.job, poster)
+
+    def abandon_task(self, attempts):
+        AnalysisTask.objects.filter(batch=self.batch).update(
+            status='running', attempts=attempts, claim_token='dead-worker',
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+
+    def test_abandoned_task_is_reclaimed(self):
+        self.abandon_task(attempts=1)
+        [task] = claim_tasks(max_attempts=3)
+        self.assertEqual(task.attempts, 2)
+
+    def test_abandoned_final_attempt_fails(self):
+        self.abandon_task(attempts=3)
+        self.assertEqual(claim_tasks(max_attempts=3), [])
+
+        task = AnalysisTask.objects.get(batch=self.batch)
+        self.assertEqual(task.status, 'failed')
+        self.batch.refresh_from_db()
+        self.assertEqual((self.batch.failed_tasks, self.batch.status), (1, 'completed'))
+
+    def test_result_of_a_reclaimed_task_is_discarded(self):
+        self.abandon_task(attempts=1)
+        stale = AnalysisTask.objects.get(batch=self.batch)
+        [current] = claim_tasks(max_attempts=3)
+
+        with mock.patch('jobs.analysis_queue.resume_analyzer.analyze_application',
+                        return_value={'error': 'Could not read resume'}):
+            process_task(stale)
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.failed_tasks, 0)
+
+        with mock.patch('jobs.analysis_queue.resume_analyzer.analyze_application',
+                        return_value={'error': 'Could not read resume'}):
+            process_task(current)
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.failed_tasks, 1)
+
+    def test_crash_of_a_reclaimed_task_does_not_requeue_it(self):
+        self.abandon_task(attempts=1)
+        stale = AnalysisTask.objects.get(batch=self.batch)
+        [current] = claim_tasks(max_attempts=3)
+
+        with mock.patch('jobs.analysis_queue.resume_analyzer.analyze_application', side_effect=OSError('disk error')):
+            process_task(stale)
+        self.assertEqual(AnalysisTask.objects.get(pk=current.pk).status, 'running')
+        self.assertEqual(claim_tasks(max_attempts=3), [])
+
+        with mock.patch('jobs.analysis_queue.resume_analyzer.analyze_application', side_effect=OSError('disk error')):
+            process_task(current)
+        current.refresh_from_db()
+        self.assertEqual((current.status, current.error), ('queued', 'disk error'))
+
+    def test_pending_batch_is_reused(self):
+        self.assertEqual(enqueue_job_analysis(self.job, self.job.posted_by), self.batch)
+        self.assertEqual(AnalysisBatch.objects.filter(job=self.job).count(), 1)
+
+
+class ResumeTextCacheTests(TestCase):
+    """Identical resume bytes are extracted once, and the cache stays within its bound"""
+
+    def setUp(self):
+        self.cache = ResumeTextCache()
+        patcher = mock.patch('jobs.resume_analyzer.resume_text_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def extract(self, content, text='Python developer'):
+        upload = SimpleUploadedFile('resume.pdf', content)
+        with mock.patch.object(resume_analyzer, '_extract_text_uncached', return_value=text) as extract:
+            result = resume_analyzer.extract_text_from_upload(upload)
+        return result, extract.call_count
+
+    def test_miss_then_hit(self):
+        self.assertEqual(self.extract(b'%PDF-1.4 same'), ('Python developer', 1))
+        self.assertEqual(self.extract(b'%PDF-1.4 same', text='never extracted'), ('Python developer', 0))
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries'], stats['total_hits']), (1, 1, 1, 1))
+
+    def test_different_bytes_miss(self):
+        self.extract(b'%PDF-1.4 first')
+        self.assertEqual(self.extract(b'%PDF-1.4 second', text='Other'), ('Other', 1))
+        self.assertEqual(ExtractedTextCache.objects.count(), 2)
+
+    def test_empty_text_is_not_cached(self):
+        self.assertEqual(self.extract(b'%PDF-1.4 scanned', text='  '), ('  ', 1))
+        self.assertFalse(ExtractedTextCache.objects.exists())
+
+    @override_settings(RESUME_TEXT_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        digests = [sha256_of_chunks([name]) for name in (b'a', b'b', b'c')]
+        self.cache.set(digests[0], 'A')
+        self.cache.set(digests[1], 'B')
+        ExtractedTextCache.objects.filter(sha256=digests[0]).update(
+            last_accessed_at=timezone.now() - timedelta(minutes=2)
+        )
+        ExtractedTextCache.objects.filter(sha256=digests[1]).update(
+            last_accessed_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertEqual(self.cache.get(digests[0]), 'A')  # Touching A leaves B the oldest
+        self.cache.set(digests[2], 'C')
+        self.assertEqual(
+            sorted(ExtractedTextCache.objects.values_list('text', flat=True)), ['A', 'C']
+        )
+        self.assertIsNone(self.cache.get(digests[1]))
+
+
+@override_settings(RESUME_ANALYSIS_POOL_WORKERS=2, RESUME_ANALYSIS_FILE_TIMEOUT=1)
+class ExtractionPoolTests(SimpleTestCase):
+    """Recycling the pool after a stuck file leaves other requests' extractions alone"""
+
+    def setUp(self):
+        self.pool = ExtractionPool()
+        self.addCleanup(self.pool.recycle)
+
+    def test_recycle_lets_queued_work_finish(self):
+        executor = self.pool._get_executor()
+        other_request = executor.submit(time.sleep, 0.5)
+
+        self.pool.recycle(executor)
+        self.assertIsNot(self.pool._get_executor(), executor)
+        self.assertIsNone(other_request.result(timeout=10))
+
+    def test_recycle_kills_stuck_workers_after_draining(self):
+        executor = self.pool._get_executor()
+        stuck = executor.submit(time.sleep, 60)
+        while not stuck.running():
+            time.sleep(0.05)
+        processes = list(executor._processes.values())
+
+        self.pool.recycle(executor)
+        with self.assertRaises(BrokenProcessPool):
+            stuck.result(timeout=10)
+        for process in processes:
+            process.join(5)
+            self.assertFalse(process.is_alive())
+
+    def test_recycle_of_a_replaced_pool_is_ignored(self):
+        executor = self.pool._get_executor()
+        self.pool.recycle(executor)
+        current = self.pool._get_executor()
+        self.pool.recycle(executor)
+        self.assertIs(self.pool._get_executor(), current)
+
+    def test_timeouts_run_from_submission(self):
+        # Extractions that never finish: each file may wait one timeout per round of workers, not one timeout each
+        executor = mock.Mock(submit=lambda *args: Future())
+        uploads = [SimpleUploadedFile(f'resume{index}.pdf', b'%PDF-1.4 stuck') for index in range(4)]
+
+        with mock.patch.object(self.pool, '_get_executor', return_value=executor), \
+                mock.patch.object(self.pool, 'recycle') as recycle:
+            started = time.monotonic()
+            outcomes = list(self.pool.extract_uploads(uploads, use_cache=False))
+            elapsed = time.monotonic() - started
+
+        self.assertTrue(all(error and 'timed out' in error for _, _, error in outcomes))
+        self.assertLess(elapsed, 3)  # Two rounds of two workers, not four sequential timeouts
+        recycle.assert_called_once_with(executor)
+
+
+    def test_uploads_are_read_within_the_window(self):
+        read = []
+
+        class TrackedUpload(SimpleUploadedFile):
+            def chunks(self, chunk_size=None):
+                read.append(self.name)
+                return super().chunks(chunk_size)
+
+        def submit(function, suffix, data):
+            future = Future()
+            future.set_result(data.decode())
+            return future
+
+        uploads = [TrackedUpload(f'resume{index}.pdf', f'text {index}'.encode()) for index in range(10)]
+        with mock.patch.object(self.pool, '_get_executor', return_value=mock.Mock(submit=submit)):
+            outcomes = self.pool.extract_uploads(uploads, use_cache=False)
+            first = next(outcomes)
+            self.assertEqual(len(read), 4)  # Two files per worker, not the whole batch
+            rest = list(outcomes)
+
+        self.assertEqual([text for _, text, _ in [first, *rest]], [f'text {index}' for index in range(10)])
+        self.assertEqual(len(read), 10)
+
+
+class BulkAnalysisStreamTests(TestCase):
+    """Streamed bulk analysis sends each result as soon as it is scored"""
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        self.token = Token.objects.create(user=self.poster)
+        self.job = Job.objects.create(title='Analyst', company='Acme', location='Remote', description='Python',
+                                      posted_by=self.poster)
+
+    async def test_first_result_arrives_before_the_batch_completes(self):
+        release = threading.Event()
+
+        def analyze(resume_file, job):
+            if resume_file.name != 'first.pdf':
+                release.wait(10)
+            return {'error': None, 'score': 50, 'analysis': {'filename': resume_file.name}}
+
+        uploads = [SimpleUploadedFile(f'{name}.pdf', b'%PDF-1.4 resume') for name in ('first', 'second')]
+        with mock.patch.object(resume_analyzer, 'analyze_resume_file', side_effect=analyze):
+            response = await self.async_client.post(
+                '/api/jobs/bulk-analyze/stream/', {'job_id': self.job.pk, 'resumes': uploads},
+                headers={'Authorization': f'Token {self.token.key}'}
+            )
+            self.assertEqual(response.status_code, 200)
+            records = response.streaming_content.__aiter__()
+            try:
+                first = await asyncio.wait_for(records.__anext__(), timeout=5)
+            finally:
+                release.set()
+            rest = [record async for record in records]
+
+        self.assertIn(b'"filename": "first.pdf"', first)
+        self.assertEqual(len(rest), 2)
+        self.assertIn(b'"type": "summary"', rest[-1])
+
+
+class JobSaveTests(TestCase):
+    """A full save leaves the application counter alone without changing how saves insert"""
+
+    def setUp(self):
+        self.poster = User.objects.create_user('poster', 'poster@example.com', 'password')
+        self.job = Job.objects.create(title='Counter', company='Acme', location='Remote', description='Python',
+                                      posted_by=self.poster)
+
+    def test_stale_instance_keeps_concurrent_increments(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        Job.objects.filter(pk=self.job.pk).update(application_count=F('application_count') + 2)
+
+        stale.title = 'Renamed'
+        stale.save()
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.title, self.job.application_count), ('Renamed', 2))
+
+    def test_explicit_update_fields_can_write_the_counter(self):
+        self.job.application_count = 5
+        self.job.save(update_fields=['application_count'])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 5)
+
+    def test_copy_with_pk_none_inserts(self):
+        copy = Job.objects.get(pk=self.job.pk)
+        copy.pk = None
+        copy.title = 'Copy'
+        copy.save()
+        self.assertNotEqual(copy.pk, self.job.pk)
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_deferred_fields_are_not_loaded_or_written(self):
+        partial = Job.objects.only('title', 'requirements_profile').get(pk=self.job.pk)
+        Job.objects.filter(pk=self.job.pk).update(description='Changed elsewhere')
+
+        partial.title = 'Partial'
+        partial.save()
+        self.assertIn('description', partial.get_deferred_fields())
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.title, self.job.description), ('Partial', 'Changed elsewhere'))
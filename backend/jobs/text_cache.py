@@ -0,0 +1,133 @@
+"""
+Content-addressed cache for text extracted from resume files
+
+Extraction through pdfplumber is the most expensive step of resume analysis.
+Extracted text is stored in the database keyed by the SHA-256 of the file
+bytes, so re-analyzing or re-uploading an identical file never parses it again.
+The table is bounded and evicts the least recently used entries.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def sha256_of_chunks(chunks: Iterable[bytes]) -> str:
+    """Return the hex SHA-256 digest of a stream of byte chunks"""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_of_file(file_path: str) -> str:
+    """Return the hex SHA-256 digest of a file on disk"""
+    with open(file_path, 'rb') as file:
+        return sha256_of_chunks(iter(lambda: file.read(HASH_CHUNK_SIZE), b''))
+
+
+def sha256_of_upload(uploaded_file) -> str:
+    """Return the hex SHA-256 digest of a Django UploadedFile, leaving it rewound"""
+    uploaded_file.seek(0)
+    digest = sha256_of_chunks(uploaded_file.chunks())
+    uploaded_file.seek(0)
+    return digest
+
+
+class ResumeTextCache:
+    """
+    Bounded LRU cache of extracted resume text stored in ExtractedTextCache
+
+    Hit and miss counters are kept per process; the persisted hit_count on
+    each entry accumulates across processes.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return getattr(settings, 'RESUME_TEXT_CACHE_MAX_ENTRIES', 1000)
+
+    def get(self, sha256: str) -> Optional[str]:
+        """Return cached text for a file digest, or None on a miss"""
+        from .models import ExtractedTextCache
+
+        try:
+            text = ExtractedTextCache.objects.filter(sha256=sha256).values_list('text', flat=True).first()
+            if text is not None:
+                ExtractedTextCache.objects.filter(sha256=sha256).update(
+                    hit_count=F('hit_count') + 1,
+                    last_accessed_at=timezone.now()
+                )
+        except Exception as e:
+            # The cache must never break analysis; treat lookup failures as misses
+            self.logger.warning(f"Text cache lookup failed for {sha256[:12]}: {e}")
+            text = None
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def set(self, sha256: str, text: str, byte_size: int = 0):
+        """Store extracted text for a file digest and evict the oldest entries past the bound"""
+        from .models import ExtractedTextCache
+
+        try:
+            ExtractedTextCache.objects.create(sha256=sha256, text=text, byte_size=byte_size)
+        except IntegrityError:
+            # Another worker stored the same file first
+            return
+        except Exception as e:
+            self.logger.warning(f"Text cache store failed for {sha256[:12]}: {e}")
+            return
+
+        self._evict()
+
+    def _evict(self):
+        from .models import ExtractedTextCache
+
+        overflow = ExtractedTextCache.objects.count() - self.max_entries
+        if overflow <= 0:
+            return
+
+        stale_ids = list(
+            ExtractedTextCache.objects.order_by('last_accessed_at', 'id').values_list('id', flat=True)[:overflow]
+        )
+        ExtractedTextCache.objects.filter(id__in=stale_ids).delete()
+
+    def stats(self) -> Dict:
+        """Return process-local hit/miss counters plus persisted totals"""
+        from .models import ExtractedTextCache
+
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups * 100, 2) if lookups else 0.0,
+            'entries': ExtractedTextCache.objects.count(),
+            'max_entries': self.max_entries,
+            'total_hits': ExtractedTextCache.objects.aggregate(total=Sum('hit_count'))['total'] or 0,
+        }
+
+
+# Global instance
+resume_text_cache = ResumeTextCache()
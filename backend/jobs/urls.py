@@ -6,18 +6,24 @@ urlpatterns = [
     path('<int:job_id>/', views.job_detail, name='job_detail'),
     path('my-jobs/', views.my_jobs, name='my_jobs'),
     path('public/', views.public_jobs, name='public_jobs'),
+    path('search/', views.job_search, name='job_search'),
     path('<int:job_id>/apply/', views.apply_to_job, name='apply_to_job'),
     path('applications/', views.my_job_applications, name='my_job_applications'),
     path('applications/<int:application_id>/status/', views.update_application_status, name='update_application_status'),
     path('applications/<int:application_id>/resume/', views.download_resume, name='download_resume'),
     path('my-applications/', views.my_applications, name='my_applications'),
+    path('recommendations/', views.job_recommendations, name='job_recommendations'),
     
     # Resume analysis endpoints
     path('applications/<int:application_id>/analyze-resume/', views.analyze_resume, name='analyze_resume'),
     path('<int:job_id>/analyze-resumes/', views.analyze_job_resumes, name='analyze_job_resumes'),
+    path('<int:job_id>/rescore/', views.rescore_job_applications, name='rescore_job_applications'),
+    path('analysis-batches/<int:batch_id>/', views.analysis_batch_status, name='analysis_batch_status'),
     path('applications/<int:application_id>/analysis/', views.get_resume_analysis, name='get_resume_analysis'),
     path('applications/<int:application_id>/upload-resume/', views.upload_resume_for_application, name='upload_resume_for_application'),
     path('bulk-analyze/', views.bulk_analyze_resumes, name='bulk_analyze_resumes'),
+    path('bulk-analyze/stream/', views.bulk_analyze_resumes_stream, name='bulk_analyze_resumes_stream'),
+    path('text-cache/stats/', views.text_cache_stats, name='text_cache_stats'),
     
     # Archive endpoints
     path('<int:job_id>/archive/', views.archive_job, name='archive_job'),
@@ -1,25 +1,56 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from django.http import HttpResponse, Http404
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, Http404, StreamingHttpResponse
 from django.conf import settings
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from django.db import IntegrityError, transaction
 import os
-from .models import Job, JobApplication
+from .models import Job, JobApplication, AnalysisBatch, ApplicationLimitReached
 from .serializers import JobSerializer, JobCreateSerializer, JobApplicationSerializer, JobApplicationCreateSerializer
 from .resume_analyzer import resume_analyzer
+from .analysis_queue import enqueue_job_analysis, batch_progress
+from .text_cache import resume_text_cache
+from .extraction_pool import extraction_pool
+from .recommendations import recommend_jobs
+from .pagination import JobCursorPagination, SearchCursorPagination
+from .search import filter_jobs, search_jobs
+from .listing_cache import cached_public_jobs_page, public_jobs_etag, public_jobs_last_modified
+from .renderers import NDJSONRenderer, EventStreamRenderer, ndjson_line, sse_event
 from user_notifications.models import create_new_application_notification, create_application_status_notification
 
 
+def _with_listing_data(jobs):
+    """Load the poster JobSerializer reads per row in the listing query itself"""
+    return jobs.select_related('posted_by')
+
+
+def _paginated_jobs(request, jobs):
+    """Return one keyset-paginated page of jobs, optionally narrowed by ?job_type="""
+    job_type = request.query_params.get('job_type')
+    if job_type:
+        jobs = jobs.filter(job_type=job_type)
+    jobs = _with_listing_data(jobs)
+    
+    paginator = JobCursorPagination()
+    page = paginator.paginate_queryset(jobs, request)
+    serializer = JobSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def jobs_list_create(request):
     if request.method == 'GET':
         # Get all active and non-archived jobs
         jobs = Job.objects.filter(is_active=True, is_archived=False)
-        serializer = JobSerializer(jobs, many=True)
-        return Response(serializer.data)
+        return _paginated_jobs(request, jobs)
     
     elif request.method == 'POST':
         # Create a new job
@@ -51,7 +82,13 @@ def job_detail(request, job_id):
         
         serializer = JobCreateSerializer(job, data=request.data, context={'request': request})
         if serializer.is_valid():
+            previous_profile = job.requirements_profile
             job = serializer.save()
+            
+            # Rescore analyzed applicants from their stored resume profiles when requirements changed
+            if job.requirements_profile != previous_profile:
+                resume_analyzer.rescore_job_applications(job)
+            
             response_serializer = JobSerializer(job)
             return Response(response_serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -71,17 +108,60 @@ def job_detail(request, job_id):
 def my_jobs(request):
     """Get jobs posted by the current user"""
     jobs = Job.objects.filter(posted_by=request.user, is_active=True, is_archived=False)
-    serializer = JobSerializer(jobs, many=True)
-    return Response(serializer.data)
+    return _paginated_jobs(request, jobs)
 
 
+@condition(etag_func=public_jobs_etag, last_modified_func=public_jobs_last_modified)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def public_jobs(request):
-    """Get all jobs - public endpoint for non-authenticated users"""
-    jobs = Job.objects.filter(is_active=True)
-    serializer = JobSerializer(jobs, many=True)
-    return Response(serializer.data)
+    """Get all jobs - public endpoint for non-authenticated users (cached, supports conditional GET)"""
+    data = cached_public_jobs_page(
+        request,
+        lambda: _paginated_jobs(request, Job.objects.filter(is_active=True)).data
+    )
+    response = Response(data)
+    # Let browsers and CDNs store the page but revalidate it with the ETag on every use
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def job_search(request):
+    """
+    Search open jobs by ?q= (title, company, location, description, skills), best match first.
+    Filters: ?job_type=, ?location= (substring), ?skill= (repeatable, every skill must be required).
+    Without ?q= the filtered jobs are listed newest first.
+    """
+    query = request.query_params.get('q', '').strip()
+    if len(query) > 200:
+        return Response({'error': 'Search query is too long'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    jobs = filter_jobs(
+        Job.objects.filter(is_active=True, is_archived=False),
+        job_type=request.query_params.get('job_type'),
+        location=request.query_params.get('location', '').strip(),
+        skills=request.query_params.getlist('skill'),
+    )
+    
+    if query:
+        jobs = search_jobs(query, jobs)
+        paginator = SearchCursorPagination()
+    else:
+        paginator = JobCursorPagination()
+    
+    page = paginator.paginate_queryset(_with_listing_data(jobs), request)
+    serializer = JobSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+def _job_full_response(job):
+    return Response({
+        'error': 'This job has reached its maximum number of applicants',
+        'max_applicants': job.max_applicants,
+        'current_applications': job.application_count
+    }, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
@@ -101,20 +181,24 @@ def apply_to_job(request, job_id):
     if JobApplication.objects.filter(job=job, applicant=request.user).exists():
         return Response({'error': 'You have already applied to this job'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Check if job is still accepting applications (enforce max_applicants limit)
+    # Fast rejection from the stored counter; the authoritative check happens on save
     if not job.is_accepting_applications:
-        return Response({
-            'error': 'This job has reached its maximum number of applicants',
-            'max_applicants': job.max_applicants,
-            'current_applications': job.application_count
-        }, status=status.HTTP_400_BAD_REQUEST)
+        return _job_full_response(job)
     
     # Create application
     data = request.data.copy()
     data['job'] = job_id
     serializer = JobApplicationCreateSerializer(data=data, context={'request': request})
     if serializer.is_valid():
-        application = serializer.save()
+        try:
+            with transaction.atomic():
+                application = serializer.save()
+        except ApplicationLimitReached:
+            job.refresh_from_db(fields=['application_count'])
+            return _job_full_response(job)
+        except IntegrityError:
+            # A concurrent request from the same user won the unique (job, applicant) insert
+            return Response({'error': 'You have already applied to this job'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Create notification for job poster
         try:
@@ -225,6 +309,66 @@ def my_applications(request):
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_recommendations(request):
+    """
+    Recommend open jobs for the current user's resume.
+    Uses the resume from ?application_id= if given, otherwise from the user's latest application.
+    """
+    applications = JobApplication.objects.filter(applicant=request.user).exclude(resume='')
+    application_id = request.query_params.get('application_id')
+    
+    if application_id:
+        try:
+            application = applications.get(id=application_id)
+        except (JobApplication.DoesNotExist, ValueError):
+            return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+    else:
+        application = applications.order_by('-applied_at').first()
+        if application is None:
+            return Response({'error': 'Apply to a job with a resume to get recommendations'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Parse the resume once; later requests reuse the stored profile
+    if application.resume_profile is None:
+        try:
+            application.resume_profile = resume_analyzer.get_resume_profile(application.resume.path)
+        except OSError:
+            return Response({'error': 'Resume file not found'}, status=status.HTTP_404_NOT_FOUND)
+        if application.resume_profile is None:
+            return Response({'error': 'Could not extract text from resume'}, status=status.HTTP_400_BAD_REQUEST)
+        application.save(update_fields=['resume_profile'])
+    
+    # Leave out jobs already applied to and the user's own postings
+    exclude_job_ids = set(JobApplication.objects.filter(applicant=request.user).values_list('job_id', flat=True))
+    exclude_job_ids.update(Job.objects.filter(posted_by=request.user).values_list('id', flat=True))
+    
+    recommendations = recommend_jobs(
+        application.resume_profile.as_resume_json(),
+        limit=limit,
+        exclude_job_ids=exclude_job_ids
+    )
+    
+    return Response({
+        'application_id': application.id,
+        'results': [
+            {
+                'job': JobSerializer(job).data,
+                'score': match['overall_score'],
+                'category_scores': match['category_scores'],
+                'matched': match['matched'],
+                'missing': match['missing'],
+            }
+            for job, match in recommendations
+        ]
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def analyze_resume(request, application_id):
@@ -292,40 +436,55 @@ def analyze_resume(request, application_id):
 @permission_classes([IsAuthenticated])
 def analyze_job_resumes(request, job_id):
     """
-    Analyze all resumes for a specific job posting
+    Queue analysis of all resumes for a specific job posting.
+    Returns a batch id immediately; progress is reported by analysis_batch_status.
     """
     try:
         job = Job.objects.get(id=job_id, posted_by=request.user)
     except Job.DoesNotExist:
         return Response({'error': 'Job not found or not owned by you'}, status=status.HTTP_404_NOT_FOUND)
     
-    applications = JobApplication.objects.filter(job=job, resume__isnull=False)
+    batch = enqueue_job_analysis(job, request.user)
     
-    if not applications.exists():
+    if batch is None:
         return Response({'error': 'No applications with resumes found'}, status=status.HTTP_400_BAD_REQUEST)
     
+    return Response(batch_progress(batch), status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def analysis_batch_status(request, batch_id):
+    """
+    Get progress of a queued resume analysis batch
+    """
     try:
-        updated_applications = []
-        
-        for application in applications:
-            analysis_result = resume_analyzer.analyze_application(application)
-            
-            if not analysis_result['error']:
-                # Save analysis results
-                application.resume_analysis_score = analysis_result['score']
-                application.resume_analysis_data = analysis_result['analysis']
-                application.analysis_completed = True
-                application.analysis_date = timezone.now()
-                application.save()
-                
-                updated_applications.append(application)
-        
-        # Return serialized application data
-        serializer = JobApplicationSerializer(updated_applications, many=True)
-        return Response(serializer.data)
-        
-    except Exception as e:
-        return Response({'error': f'Batch analysis failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        batch = AnalysisBatch.objects.get(id=batch_id, job__posted_by=request.user)
+    except AnalysisBatch.DoesNotExist:
+        return Response({'error': 'Analysis batch not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(batch_progress(batch))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def rescore_job_applications(request, job_id):
+    """
+    Rescore all analyzed applications for a job from their stored resume profiles.
+    Resume files are not re-read; applications never analyzed are reported as skipped.
+    """
+    try:
+        job = Job.objects.get(id=job_id, posted_by=request.user)
+    except Job.DoesNotExist:
+        return Response({'error': 'Job not found or not owned by you'}, status=status.HTTP_404_NOT_FOUND)
+    
+    result = resume_analyzer.rescore_job_applications(job)
+    
+    return Response({
+        'job_id': job.id,
+        'rescored': result['rescored'],
+        'skipped': result['skipped']
+    })
 
 
 @api_view(['POST'])
@@ -377,6 +536,7 @@ def upload_resume_for_application(request, application_id):
         application.resume_analysis_data = {}
         application.analysis_completed = False
         application.analysis_date = None
+        application.resume_profile = None
         
         application.save()
         
@@ -416,12 +576,50 @@ def get_resume_analysis(request, application_id):
     })
 
 
+def _wants_parallel(request):
+    """Whether a bulk analysis request asked for process-pool extraction"""
+    return str(request.data.get('parallel', '')).lower() in ('1', 'true', 'yes')
+
+
+def _iter_bulk_analysis(files, job, parallel=False):
+    """
+    Analyze uploaded resume files against a job, yielding (filename, analysis_result)
+    in upload order. Failures are reported per file and never stop the batch.
+    """
+    if not parallel or len(files) < 2:
+        for resume_file in files:
+            # Analyze resume directly without creating an application
+            yield resume_file.name, resume_analyzer.analyze_resume_file(resume_file, job)
+        return
+    
+    for resume_file, resume_text, error in extraction_pool.extract_uploads(files):
+        if error:
+            yield resume_file.name, {'error': error, 'score': 0, 'analysis': None}
+        else:
+            yield resume_file.name, resume_analyzer.analyze_extracted_text(resume_text, job)
+
+
+async def _async_records(records):
+    """
+    Serve a sync record generator from an async one. Under ASGI Django reads a sync
+    streaming body to the end before sending it, so each record (extraction and
+    analysis included) is produced on the request's sync thread and sent as it is ready.
+    """
+    next_record = sync_to_async(next)
+    finished = object()
+    try:
+        while (record := await next_record(records, finished)) is not finished:
+            yield record
+    finally:
+        await sync_to_async(records.close)()
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def bulk_analyze_resumes(request):
     """
     Analyze multiple uploaded resumes against a specific job posting without creating applications.
-    Accepts: job_id and multiple resume files
+    Accepts: job_id, multiple resume files and an optional parallel flag
     Returns: Analysis results for each resume
     """
     job_id = request.data.get('job_id')
@@ -444,28 +642,19 @@ def bulk_analyze_resumes(request):
     results = []
     errors = []
     
-    for resume_file in files:
-        try:
-            # Analyze resume directly without creating an application
-            analysis_result = resume_analyzer.analyze_resume_file(resume_file, job)
-            
-            if analysis_result['error']:
-                errors.append({
-                    'filename': resume_file.name,
-                    'error': analysis_result['error']
-                })
-            else:
-                results.append({
-                    'filename': resume_file.name,
-                    'score': analysis_result['score'],
-                    'analysis': analysis_result['analysis'],
-                    'job_title': job.title,
-                    'job_company': job.company
-                })
-        except Exception as e:
+    for filename, analysis_result in _iter_bulk_analysis(files, job, _wants_parallel(request)):
+        if analysis_result['error']:
             errors.append({
-                'filename': resume_file.name,
-                'error': str(e)
+                'filename': filename,
+                'error': analysis_result['error']
+            })
+        else:
+            results.append({
+                'filename': filename,
+                'score': analysis_result['score'],
+                'analysis': analysis_result['analysis'],
+                'job_title': job.title,
+                'job_company': job.company
             })
     
     return Response({
@@ -481,6 +670,86 @@ def bulk_analyze_resumes(request):
     })
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([NDJSONRenderer, EventStreamRenderer, JSONRenderer])
+def bulk_analyze_resumes_stream(request):
+    """
+    Streaming variant of bulk_analyze_resumes.
+    Emits one record per resume as soon as it is scored, then a summary record.
+    Format is NDJSON by default, or Server-Sent Events with ?format=sse or
+    Accept: text/event-stream. Only one analysis result is held at a time.
+    """
+    job_id = request.data.get('job_id')
+    
+    if not job_id:
+        return Response({'error': 'job_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Verify job exists and user owns it
+    try:
+        job = Job.objects.get(id=job_id, posted_by=request.user)
+    except Job.DoesNotExist:
+        return Response({'error': 'Job not found or not owned by you'}, status=status.HTTP_404_NOT_FOUND)
+    
+    files = request.FILES.getlist('resumes')
+    
+    if not files:
+        return Response({'error': 'No resume files provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    use_sse = request.accepted_renderer.format == 'sse'
+    parallel = _wants_parallel(request)
+    job_info = {'id': job.id, 'title': job.title, 'company': job.company}
+    
+    def encode(record_type, record):
+        if use_sse:
+            return sse_event(record_type, record)
+        return ndjson_line({'type': record_type, **record})
+    
+    def stream():
+        success_count = 0
+        error_count = 0
+        
+        for index, (filename, analysis_result) in enumerate(_iter_bulk_analysis(files, job, parallel)):
+            if analysis_result['error']:
+                error_count += 1
+                yield encode('error', {
+                    'index': index,
+                    'filename': filename,
+                    'error': analysis_result['error']
+                })
+            else:
+                success_count += 1
+                yield encode('result', {
+                    'index': index,
+                    'filename': filename,
+                    'score': analysis_result['score'],
+                    'analysis': analysis_result['analysis'],
+                    'job_title': job.title,
+                    'job_company': job.company
+                })
+        
+        yield encode('summary', {
+            'success_count': success_count,
+            'error_count': error_count,
+            'total': len(files),
+            'job': job_info
+        })
+    
+    content_type = 'text/event-stream' if use_sse else 'application/x-ndjson'
+    records = _async_records(stream()) if isinstance(request._request, ASGIRequest) else stream()
+    response = StreamingHttpResponse(records, content_type=f'{content_type}; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering so records arrive as they are produced
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def text_cache_stats(request):
+    """Get hit/miss counters for the extracted resume text cache"""
+    return Response(resume_text_cache.stats())
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def archive_job(request, job_id):
@@ -506,5 +775,4 @@ def archive_job(request, job_id):
 def archived_jobs(request):
     """Get archived jobs posted by the current user"""
     jobs = Job.objects.filter(posted_by=request.user, is_active=True, is_archived=True)
-    serializer = JobSerializer(jobs, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    return _paginated_jobs(request, jobs)
\ No newline at end of file
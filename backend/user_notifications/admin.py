@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationDailySummary
 
 
 @admin.register(Notification)
@@ -8,6 +8,7 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ['notification_type', 'is_read', 'created_at']
     search_fields = ['title', 'message', 'recipient__username', 'sender__username']
     readonly_fields = ['created_at', 'time_ago']
+    list_select_related = ['recipient', 'sender']
     
     fieldsets = (
         ('Notification Info', {
@@ -24,3 +25,11 @@ class NotificationAdmin(admin.ModelAdmin):
     def time_ago(self, obj):
         return obj.time_ago
     time_ago.short_description = 'Time Ago'
+
+
+@admin.register(NotificationDailySummary)
+class NotificationDailySummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'day', 'notification_type', 'count']
+    list_filter = ['notification_type', 'day']
+    search_fields = ['user__username']
+    list_select_related = ['user']
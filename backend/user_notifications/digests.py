@@ -0,0 +1,93 @@
+"""
+Per-user notification email digests
+
+Instead of one email per notification, `manage.py send_notification_digests`
+sends each user one summary of their unread notifications per window
+(NOTIFICATION_DIGEST_WINDOW_MINUTES).
+
+A user is due once their oldest notification not yet emailed is a window old,
+so notifications collect for a window and a user never gets more than one
+digest per window. Every notification a digest covers gets emailed_at set in
+the same transaction that queues the email, which makes each run incremental:
+only notifications with emailed_at NULL (the notif_pending_email_idx partial
+index) are ever scanned. Notifications the user already read in the app are
+marked without being emailed.
+
+Digests are queued in the accounts EmailOutbox, so `send_outbox` delivers them
+in batches over one pooled mail connection, with retries.
+"""
+
+from datetime import timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from accounts.outbox import enqueue_email, render_email
+
+from .models import Notification
+
+
+# Notifications listed in one email; the rest are summarized as "...and N more"
+MAX_LISTED_NOTIFICATIONS = 20
+
+
+def due_recipients(window_minutes: int, now=None) -> List[int]:
+    """Ids of users whose oldest notification not yet emailed is at least a window old"""
+    cutoff = (now or timezone.now()) - timedelta(minutes=window_minutes)
+    return list(
+        Notification.objects.filter(emailed_at__isnull=True).order_by()
+        .values('recipient').annotate(oldest=Min('created_at')).filter(oldest__lte=cutoff)
+        .values_list('recipient', flat=True)
+    )
+
+
+def build_digest(user: User, now=None) -> Tuple[int, Optional[int]]:
+    """
+    Queue one digest email for the user's pending notifications and mark them emailed
+
+    Returns (number of unread notifications in the email, id of the queued
+    EmailOutbox row); (0, None) when nothing was queued because all pending
+    notifications were read already or the user has no email address.
+    """
+    now = now or timezone.now()
+    email_id = None
+    with transaction.atomic():
+        pending = Notification.objects.filter(recipient=user, emailed_at__isnull=True)
+        # Notifications created after this point wait for the next digest
+        last_id = pending.aggregate(last_id=Max('id'))['last_id']
+        if last_id is None:
+            return 0, None
+        pending = pending.filter(id__lte=last_id)
+
+        unread = pending.filter(is_read=False)
+        unread_count = unread.count() if user.email else 0
+        if unread_count:
+            notifications = list(unread.order_by('-id').only('title', 'message', 'created_at')[:MAX_LISTED_NOTIFICATIONS])
+            subject, body = render_email('user_notifications/notification_digest.txt', {
+                'user': user,
+                'notifications': notifications,
+                'unread_count': unread_count,
+                'more_count': unread_count - len(notifications),
+            }, 'Your notifications on Genie Job Board')
+            email_id = enqueue_email(user.email, subject, body).id
+
+        pending.update(emailed_at=now)
+    return unread_count, email_id
+
+
+def send_digests(window_minutes: int, batch_size: int = 100, now=None) -> Iterator[List[tuple]]:
+    """
+    Build digests for every due user, batch_size users at a time
+
+    Yields:
+        List[tuple]: (user id, username, unread notifications emailed, EmailOutbox id or None)
+            per user in each batch
+    """
+    now = now or timezone.now()
+    recipient_ids = due_recipients(window_minutes, now)
+    for start in range(0, len(recipient_ids), batch_size):
+        users = User.objects.filter(id__in=recipient_ids[start:start + batch_size]).only('username', 'email')
+        yield [(user.id, user.username, *build_digest(user, now)) for user in users]
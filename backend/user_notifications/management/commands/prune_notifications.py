@@ -0,0 +1,103 @@
+"""
+Django management command that keeps the notification table small.
+
+Two retention policies, each deleting in bounded primary-key batches with one
+short transaction per batch (see user_notifications/retention.py):
+
+- age: read notifications older than --days (NOTIFICATION_RETENTION_DAYS)
+- cap: everything beyond each user's newest --max-per-user (NOTIFICATION_MAX_PER_USER)
+
+With --rollup the deleted notifications are first added to per-day
+NotificationDailySummary rows. Notification counters are adjusted per batch.
+
+Usage:
+    python manage.py prune_notifications
+    python manage.py prune_notifications --days 30 --max-per-user 500 --rollup
+    python manage.py prune_notifications --days 0   # cap policy only
+    python manage.py prune_notifications --dry-run
+
+Example cron job (runs nightly at 03:00):
+    0 3 * * * cd /path/to/project && python manage.py prune_notifications --rollup
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from user_notifications.retention import delete_in_batches, expired_notifications, over_cap_notifications
+
+
+class Command(BaseCommand):
+    help = 'Deletes old read notifications and notifications beyond the per-user cap, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help='Delete read notifications older than this many days; 0 disables (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--max-per-user',
+            type=int,
+            default=settings.NOTIFICATION_MAX_PER_USER,
+            help='Keep at most this many notifications per user; 0 disables (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--rollup',
+            action='store_true',
+            help='Add deleted notifications to per-day summary rows first',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Maximum number of notifications deleted per statement (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many notifications would be deleted without deleting them',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = max(options['batch_size'], 1)
+        rollup = options['rollup']
+        self.verbose = options['verbosity'] > 1
+        total = 0
+
+        if options['days'] > 0:
+            expired = expired_notifications(options['days'])
+            if dry_run:
+                count = expired.count()
+            else:
+                count = self.prune(expired, batch_size, rollup)
+            total += count
+            self.stdout.write(f'Age policy: {count} read notification(s) older than {options["days"]} days')
+
+        if options['max_per_user'] > 0:
+            count = users = 0
+            for user_id, over_cap in over_cap_notifications(options['max_per_user']):
+                users += 1
+                count += over_cap.count() if dry_run else self.prune(over_cap, batch_size, rollup)
+            total += count
+            self.stdout.write(
+                f'Cap policy: {count} notification(s) beyond the newest {options["max_per_user"]} '
+                f'of {users} user(s)'
+            )
+
+        if dry_run:
+            # Policies are counted independently, so rows matching both are counted twice
+            self.stdout.write(self.style.WARNING(f'DRY RUN: Would delete up to {total} notification(s)'))
+        elif total == 0:
+            self.stdout.write(self.style.SUCCESS('No notifications to prune.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Successfully pruned {total} notification(s)'))
+
+    def prune(self, notifications, batch_size, rollup):
+        deleted = 0
+        for count in delete_in_batches(notifications, batch_size=batch_size, rollup=rollup):
+            deleted += count
+            if self.verbose:
+                self.stdout.write(f'  Deleted {count} notification(s) in this batch ({deleted} so far)')
+        return deleted
@@ -0,0 +1,61 @@
+"""
+Django management command that repairs NotificationCounters.
+
+The counters are kept in step by create_notification and the notification
+views, but cascading deletes (e.g. deleting a job or a sender) bypass those.
+This recounts notifications per user and fixes any counters that drifted.
+Users without a counters row are skipped; their row is built from a recount
+the first time it is read.
+
+Usage:
+    python manage.py reconcile_notification_counters
+    python manage.py reconcile_notification_counters --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from user_notifications.models import NotificationCounters
+
+
+class Command(BaseCommand):
+    help = 'Recounts notifications per user and fixes drifted notification counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show which counters are wrong without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        fields = NotificationCounters.COUNTER_FIELDS
+        actual_counts = NotificationCounters.actual_counts()
+        zero = dict.fromkeys(fields, 0)
+
+        drifted = []
+        for stored in NotificationCounters.objects.values('user', *fields).iterator():
+            user_id = stored.pop('user')
+            actual = actual_counts.get(user_id, zero)
+            if stored != actual:
+                drifted.append((user_id, stored, actual))
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All notification counters are correct.'))
+            return
+
+        for user_id, stored, actual in drifted:
+            changes = ', '.join(
+                f'{field} {stored[field]} -> {actual[field]}' for field in fields if stored[field] != actual[field]
+            )
+            self.stdout.write(f'  - User #{user_id}: {changes}')
+
+        if not dry_run:
+            # Recount each user at update time so notifications created meanwhile are not lost
+            for user_id, _, _ in drifted:
+                NotificationCounters.refresh(user_id)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'DRY RUN: {len(drifted)} user(s) have wrong notification counters'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Fixed notification counters for {len(drifted)} user(s)'))
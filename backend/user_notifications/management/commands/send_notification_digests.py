@@ -0,0 +1,96 @@
+"""
+Django management command that emails each user a digest of their unread notifications.
+
+Users are due once their oldest notification not yet emailed is --window-minutes
+old; each gets one summary email and every notification it covers is marked
+with emailed_at, so the next run only looks at newer ones (see
+user_notifications/digests.py). Digests are queued in the email outbox and
+delivered by `send_outbox`; with --send this command delivers each batch itself
+over one mail connection.
+
+Usage:
+    python manage.py send_notification_digests
+    python manage.py send_notification_digests --window-minutes 15 --send
+    python manage.py send_notification_digests --dry-run
+
+Example cron job (runs every 15 minutes):
+    */15 * * * * cd /path/to/project && python manage.py send_notification_digests
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import DEFAULT_MAX_ATTEMPTS, claim_emails, open_connection, record_failure, send_emails
+from user_notifications.digests import due_recipients, send_digests
+
+
+class Command(BaseCommand):
+    help = 'Emails each due user one digest of their unread notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-minutes',
+            type=int,
+            default=settings.NOTIFICATION_DIGEST_WINDOW_MINUTES,
+            help='Collect notifications this long before emailing a digest (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of users handled per batch (default: 100)',
+        )
+        parser.add_argument(
+            '--send',
+            action='store_true',
+            help='Deliver each batch now over one mail connection instead of leaving it to send_outbox',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many users are due without sending anything',
+        )
+
+    def handle(self, *args, **options):
+        window_minutes = max(options['window_minutes'], 0)
+        verbose = options['verbosity'] > 1
+
+        if options['dry_run']:
+            count = len(due_recipients(window_minutes))
+            self.stdout.write(self.style.WARNING(f'DRY RUN: {count} user(s) are due a notification digest'))
+            return
+
+        users = emailed = 0
+        for batch in send_digests(window_minutes, batch_size=max(options['batch_size'], 1)):
+            email_ids = [email_id for _, _, _, email_id in batch if email_id is not None]
+            users += len(batch)
+            emailed += len(email_ids)
+            self.stdout.write(f'Queued {len(email_ids)} digest(s) for {len(batch)} due user(s) in this batch')
+            if verbose:
+                for user_id, username, count, _ in batch:
+                    self.stdout.write(f'  - User #{user_id} ({username}): {count} unread notification(s)')
+            if options['send'] and email_ids:
+                self.deliver(email_ids)
+
+        if users == 0:
+            self.stdout.write(self.style.SUCCESS('No notification digests due.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Queued {emailed} digest(s) for {users} user(s)'))
+
+    def deliver(self, email_ids):
+        """Send this batch's digests over a single connection, leaving any other queued email to send_outbox"""
+        emails = claim_emails(limit=len(email_ids), ids=email_ids)
+        if not emails:
+            return
+        try:
+            connection = open_connection()
+        except Exception as e:
+            for email in emails:
+                record_failure(email, str(e), DEFAULT_MAX_ATTEMPTS)
+            self.stdout.write(self.style.WARNING(f'Could not connect to the mail server, left for send_outbox: {e}'))
+            return
+        try:
+            sent = send_emails(emails, connection)
+        finally:
+            connection.close()
+        self.stdout.write(f'Sent {sent} of {len(emails)} email(s)')
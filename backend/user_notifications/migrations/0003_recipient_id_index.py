@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_hot_filter_indexes'),
+        ('user_notifications', '0002_recipient_read_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-id'], name='notif_recipient_id_idx'),
+        ),
+    ]
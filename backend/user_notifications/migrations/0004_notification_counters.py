@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_notifications', '0003_recipient_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounters',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('unread', models.PositiveIntegerField(default=0)),
+                ('new_application', models.PositiveIntegerField(default=0)),
+                ('application_status', models.PositiveIntegerField(default=0)),
+                ('job_posted', models.PositiveIntegerField(default=0)),
+                ('application_withdrawn', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_notifications', '0004_notification_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('notification_type', models.CharField(choices=[('new_application', 'New Job Application'), ('application_status', 'Application Status Update'), ('job_posted', 'New Job Posted'), ('application_withdrawn', 'Application Withdrawn')], max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'notification_type'), name='notif_summary_user_day_type')],
+            },
+        ),
+    ]
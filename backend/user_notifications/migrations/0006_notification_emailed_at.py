@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_emailed(apps, schema_editor):
+    # Notifications from before digests existed must not be emailed all at once
+    Notification = apps.get_model('user_notifications', 'Notification')
+    Notification.objects.filter(emailed_at__isnull=True).update(emailed_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_notifications', '0005_notification_daily_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='emailed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_emailed, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('emailed_at__isnull', True)), fields=['recipient', 'created_at'], name='notif_pending_email_idx'),
+        ),
+    ]
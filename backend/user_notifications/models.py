@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
 from jobs.models import Job, JobApplication
 
@@ -24,53 +26,187 @@ class Notification(models.Model):
     # Status
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set once the notification was covered by an email digest (send_notification_digests)
+    emailed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # A user's notification list, unread filter and unread count
+            models.Index(fields=['recipient', 'is_read', '-created_at'], name='notif_recipient_read_idx'),
+            # Feed pages and since_id polling walk a user's notifications by id
+            models.Index(fields=['recipient', '-id'], name='notif_recipient_id_idx'),
+            # Digests only scan notifications not emailed yet, so this index stays small
+            models.Index(
+                fields=['recipient', 'created_at'],
+                name='notif_pending_email_idx',
+                condition=Q(emailed_at__isnull=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.recipient.username}"
     
     @property
     def time_ago(self):
-        from django.utils import timezone
-        from datetime import datetime, timedelta
-        
-        now = timezone.now()
-        diff = now - self.created_at
-        
-        if diff.days == 0:
-            if diff.seconds < 3600:  # Less than 1 hour
-                minutes = diff.seconds // 60
-                return f"{minutes} minutes ago" if minutes > 1 else "Just now"
-            else:  # Less than 24 hours
-                hours = diff.seconds // 3600
-                return f"{hours} hours ago" if hours > 1 else "1 hour ago"
-        elif diff.days == 1:
-            return "1 day ago"
-        elif diff.days < 7:
-            return f"{diff.days} days ago"
-        elif diff.days < 30:
-            weeks = diff.days // 7
-            return f"{weeks} weeks ago" if weeks > 1 else "1 week ago"
-        else:
-            months = diff.days // 30
-            return f"{months} months ago" if months > 1 else "1 month ago"
+        return time_ago(self.created_at)
+
+
+def time_ago(created_at, now=None):
+    """Human readable age of a timestamp, e.g. "3 hours ago" (pass `now` when formatting many rows)"""
+    from django.utils import timezone
+    
+    now = now or timezone.now()
+    diff = now - created_at
+    
+    if diff.days == 0:
+        if diff.seconds < 3600:  # Less than 1 hour
+            minutes = diff.seconds // 60
+            return f"{minutes} minutes ago" if minutes > 1 else "Just now"
+        else:  # Less than 24 hours
+            hours = diff.seconds // 3600
+            return f"{hours} hours ago" if hours > 1 else "1 hour ago"
+    elif diff.days == 1:
+        return "1 day ago"
+    elif diff.days < 7:
+        return f"{diff.days} days ago"
+    elif diff.days < 30:
+        weeks = diff.days // 7
+        return f"{weeks} weeks ago" if weeks > 1 else "1 week ago"
+    else:
+        months = diff.days // 30
+        return f"{months} months ago" if months > 1 else "1 month ago"
+
+
+class NotificationCounters(models.Model):
+    """
+    Per-user notification counts, so the badge and stats endpoints read one row
+    instead of counting the user's whole notification history.
+    
+    Kept in step by the helpers below and the notification views with atomic
+    F() updates. Cascading deletes (e.g. deleting a job) bypass those;
+    reconcile_notification_counters repairs any drift.
+    """
+    # Per-type columns are named after Notification.NOTIFICATION_TYPES keys
+    TYPE_FIELDS = [notification_type for notification_type, _ in Notification.NOTIFICATION_TYPES]
+    COUNTER_FIELDS = ['total', 'unread'] + TYPE_FIELDS
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counters')
+    total = models.PositiveIntegerField(default=0)
+    unread = models.PositiveIntegerField(default=0)
+    new_application = models.PositiveIntegerField(default=0)
+    application_status = models.PositiveIntegerField(default=0)
+    job_posted = models.PositiveIntegerField(default=0)
+    application_withdrawn = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.unread}/{self.total} unread"
+    
+    @classmethod
+    def actual_counts(cls, recipients=None):
+        """Recount notifications per recipient: {user_id: {field: count}} (all users with notifications if None)"""
+        notifications = Notification.objects.order_by()
+        if recipients is not None:
+            notifications = notifications.filter(recipient__in=recipients)
+        rows = notifications.values('recipient').annotate(
+            total=Count('id'),
+            unread=Count('id', filter=Q(is_read=False)),
+            **{field: Count('id', filter=Q(notification_type=field)) for field in cls.TYPE_FIELDS},
+        )
+        return {row.pop('recipient'): row for row in rows}
+    
+    @classmethod
+    def for_user(cls, user_id):
+        """The user's counters, created from a recount the first time they are needed"""
+        try:
+            return cls.objects.get(pk=user_id)
+        except cls.DoesNotExist:
+            counts = cls.actual_counts([user_id]).get(user_id, {})
+            counters, _ = cls.objects.get_or_create(pk=user_id, defaults=counts)
+            return counters
+    
+    @classmethod
+    def adjust(cls, user_id, **deltas):
+        """
+        Apply counter deltas (e.g. total=1, unread=1) after the matching change
+        was written. A missing row is created from a recount, which already
+        includes the change. Decrements stop at zero, so a counter that has
+        drifted low does not make the unsigned column reject the update.
+        """
+        changes = {
+            field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items() if delta
+        }
+        if not changes or cls.objects.filter(pk=user_id).update(**changes):
+            return
+        counts = cls.actual_counts([user_id]).get(user_id, {})
+        _, created = cls.objects.get_or_create(pk=user_id, defaults=counts)
+        if not created:
+            # Another transaction created the row from a recount that could not see this change
+            cls.objects.filter(pk=user_id).update(**changes)
+    
+    @classmethod
+    def refresh(cls, user_id):
+        """Overwrite the user's counters with a recount"""
+        counts = cls.actual_counts([user_id]).get(user_id, dict.fromkeys(cls.COUNTER_FIELDS, 0))
+        cls.objects.update_or_create(pk=user_id, defaults=counts)
+    
+    def as_stats(self):
+        return {
+            'total_notifications': self.total,
+            'unread_notifications': self.unread,
+            'new_applications': self.new_application,
+            'status_updates': self.application_status,
+        }
+
+
+class NotificationDailySummary(models.Model):
+    """
+    Per-day notification counts kept when prune_notifications --rollup deletes
+    old notifications, so history survives without the individual rows.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_summaries')
+    day = models.DateField()
+    notification_type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day', 'notification_type'], name='notif_summary_user_day_type'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.notification_type}: {self.count}"
+    
+    @classmethod
+    def add(cls, user_id, day, notification_type, count):
+        """Add count to the user's summary row for the day and type"""
+        summary = cls.objects.filter(user_id=user_id, day=day, notification_type=notification_type)
+        if not summary.update(count=F('count') + count):
+            cls.objects.create(user_id=user_id, day=day, notification_type=notification_type, count=count)
 
 
 def create_notification(recipient, notification_type, title, message, sender=None, job=None, job_application=None):
     """
     Helper function to create notifications
     """
-    notification = Notification.objects.create(
-        recipient=recipient,
-        sender=sender,
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        job=job,
-        job_application=job_application
-    )
+    # The notification and its counters commit together or not at all
+    with transaction.atomic():
+        notification = Notification.objects.create(
+            recipient=recipient,
+            sender=sender,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            job=job,
+            job_application=job_application
+        )
+        NotificationCounters.adjust(recipient.pk, total=1, unread=1, **{notification_type: 1})
+    
+    # Wake the recipient's open notification streams once the notification is visible to them
+    from .push import publish_notification
+    transaction.on_commit(lambda: publish_notification(notification), robust=True)
     return notification
 
 
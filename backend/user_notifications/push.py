@@ -0,0 +1,150 @@
+"""
+Push channel for new notifications
+
+Clients hold one Server-Sent Events connection (views.notifications_stream)
+instead of polling the count endpoint. Each connection is an asyncio task
+waiting on its own queue, so one ASGI worker holds thousands of idle
+subscribers without a thread or database connection each.
+
+publish_notification() is called by create_notification once the
+notification has been committed:
+
+- PostgreSQL: it issues pg_notify, which is delivered to every process.
+  Each ASGI process runs one
+  listener thread with a dedicated LISTEN connection that hands events to the
+  local broker. LISTEN needs a session that stays on one server backend, so
+  it uses the 'direct' database alias (DIRECT_DATABASE_URL: a direct or
+  session-mode pooler connection); the transaction pooler behind
+  DATABASE_URL would silently drop it. Without that alias push is
+  unavailable on PostgreSQL and the stream view tells clients to poll.
+- Other databases (single-node development): the event goes straight to the
+  in-process broker.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+
+from django.db import connection, connections
+from django.db.utils import ConnectionDoesNotExist
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'user_notifications'
+
+# Database alias with a session-level connection for LISTEN (see settings.DIRECT_DATABASE_URL)
+LISTEN_ALIAS = 'direct'
+
+
+def push_available() -> bool:
+    """Whether notifications created in any process reach this process's streams"""
+    if connection.vendor != 'postgresql':
+        return True
+    try:
+        connections[LISTEN_ALIAS]
+    except ConnectionDoesNotExist:
+        return False
+    return True
+
+
+class NotificationBroker:
+    """In-process pub/sub of notification events, keyed by recipient id"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._listener = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Register a queue (bound to the running event loop) for a user's events"""
+        queue = asyncio.Queue(maxsize=100)
+        queue.loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers[user_id].add(queue)
+        self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, user_id: int, event: dict):
+        """Hand an event to every local subscriber of the user; safe to call from any thread"""
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, ()))
+        for queue in queues:
+            try:
+                queue.loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:  # The subscriber's event loop already closed
+                self.unsubscribe(user_id, queue)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: dict):
+        # A subscriber that stopped reading only needs the latest state
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def _ensure_listener(self):
+        if connection.vendor != 'postgresql' or not push_available():
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='notification-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        """LISTEN on the notification channel and forward events, reconnecting on errors"""
+        wrapper = connections[LISTEN_ALIAS]
+        while True:
+            pg_connection = None
+            try:
+                pg_connection = wrapper.get_new_connection(wrapper.get_connection_params())
+                pg_connection.autocommit = True
+                with pg_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                logger.info('Listening for notification events')
+
+                while True:
+                    if select.select([pg_connection], [], [], 60) == ([], [], []):
+                        continue
+                    pg_connection.poll()
+                    while pg_connection.notifies:
+                        event = json.loads(pg_connection.notifies.pop(0).payload)
+                        self.publish(event['recipient_id'], event)
+            except Exception:
+                logger.exception('Notification listener failed; reconnecting')
+                if pg_connection is not None:
+                    pg_connection.close()
+                time.sleep(5)
+
+
+def publish_notification(notification):
+    """Announce a committed notification to the recipient's open streams"""
+    event = {'recipient_id': notification.recipient_id, 'id': notification.id}
+
+    if connection.vendor == 'postgresql':
+        if not push_available():
+            return
+        # Unlike LISTEN, NOTIFY works through the transaction pooler
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, json.dumps(event)])
+    else:
+        broker.publish(notification.recipient_id, event)
+
+
+# Global instance
+broker = NotificationBroker()
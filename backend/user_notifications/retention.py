@@ -0,0 +1,92 @@
+"""
+Retention for the notification table
+
+Notifications are deleted in bounded primary-key batches, each in its own
+short transaction, so pruning or clearing a large history never holds one
+long-running DELETE. Every batch adjusts NotificationCounters for the rows it
+removed and can roll them up into NotificationDailySummary rows first.
+
+Policies (see the prune_notifications command):
+- age: read notifications older than NOTIFICATION_RETENTION_DAYS
+- cap: everything beyond a user's newest NOTIFICATION_MAX_PER_USER
+"""
+
+from collections import Counter
+from datetime import timedelta
+from typing import Iterator, Tuple
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Notification, NotificationCounters, NotificationDailySummary
+
+
+def expired_notifications(days: int, now=None):
+    """Read notifications created more than `days` days ago"""
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+
+def over_cap_notifications(max_per_user: int) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (user id, queryset) for every user with more than max_per_user
+    notifications; the queryset holds all but their newest max_per_user.
+    """
+    over_cap = (
+        Notification.objects.order_by().values('recipient')
+        .annotate(total=Count('id')).filter(total__gt=max_per_user)
+        .values_list('recipient', flat=True)
+    )
+    for user_id in over_cap:
+        notifications = Notification.objects.filter(recipient_id=user_id)
+        # Id of the oldest notification kept (walks notif_recipient_id_idx)
+        oldest_kept = notifications.order_by('-id').values_list('id', flat=True)[max_per_user - 1]
+        yield user_id, notifications.filter(id__lt=oldest_kept)
+
+
+def delete_in_batches(notifications, batch_size: int = 1000, rollup: bool = False) -> Iterator[int]:
+    """
+    Delete the notifications in ascending primary-key batches, one committed
+    transaction per batch, keeping the counters in step
+
+    Yields:
+        int: Number of notifications deleted by each batch
+    """
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                notifications.filter(id__gt=last_id).order_by('id').select_for_update()
+                .values_list('id', 'recipient_id', 'notification_type', 'is_read', 'created_at')[:batch_size]
+            )
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            Notification.objects.filter(id__in=[row[0] for row in batch]).delete()
+            _apply_deleted(batch, rollup)
+
+        yield len(batch)
+        if len(batch) < batch_size:
+            return
+
+
+def _apply_deleted(rows, rollup: bool):
+    """Take deleted rows out of the counters and, with rollup, add them to the daily summaries"""
+    deltas = {}
+    for _, user_id, notification_type, is_read, _ in rows:
+        user_deltas = deltas.setdefault(user_id, Counter())
+        user_deltas['total'] -= 1
+        user_deltas[notification_type] -= 1
+        if not is_read:
+            user_deltas['unread'] -= 1
+    for user_id, user_deltas in deltas.items():
+        NotificationCounters.adjust(user_id, **user_deltas)
+
+    if rollup:
+        days = Counter(
+            (user_id, timezone.localdate(created_at), notification_type)
+            for _, user_id, notification_type, _, created_at in rows
+        )
+        for (user_id, day, notification_type), count in days.items():
+            NotificationDailySummary.add(user_id, day, notification_type, count)
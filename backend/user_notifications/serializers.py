@@ -1,5 +1,6 @@
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Notification
+from .models import Notification, time_ago
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -18,6 +19,49 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'time_ago', 'sender_username', 'job_title', 'job_company']
 
 
+class NotificationListSerializer(serializers.BaseSerializer):
+    """
+    Read-only feed rows with the same output as NotificationSerializer, built
+    without per-field serializer overhead. Use with a queryset from
+    list_queryset() so sender and job come from one joined query.
+    """
+    created_at_field = serializers.DateTimeField()
+    
+    @staticmethod
+    def list_queryset(notifications):
+        """Join sender and job and load only the columns the feed shows"""
+        return notifications.select_related('sender', 'job').only(
+            'id', 'notification_type', 'title', 'message', 'is_read', 'created_at',
+            'job_application', 'sender__username', 'job__title', 'job__company',
+        )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # One clock reading for the whole page
+        self.now = timezone.now()
+    
+    def to_representation(self, notification):
+        sender, job = notification.sender, notification.job
+        data = {
+            'id': notification.id,
+            'notification_type': notification.notification_type,
+            'title': notification.title,
+            'message': notification.message,
+            'is_read': notification.is_read,
+            'created_at': self.created_at_field.to_representation(notification.created_at),
+            'time_ago': time_ago(notification.created_at, self.now),
+        }
+        # Like the dotted-source fields of NotificationSerializer, omitted when the relation is empty
+        if sender is not None:
+            data['sender_username'] = sender.username
+        if job is not None:
+            data['job_title'] = job.title
+            data['job_company'] = job.company
+        data['job'] = notification.job_id
+        data['job_application'] = notification.job_application_id
+        return data
+
+
 class NotificationMarkReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
@@ -1,3 +1,350 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.outbox import enqueue_email
+from jobs.models import Job
+from . import views
+from .models import Notification, NotificationCounters, NotificationDailySummary, create_notification
+from .push import broker
+from .retention import delete_in_batches
+from .serializers import NotificationListSerializer, NotificationSerializer
+
+
+# Look the token up on every request so each call costs the same
+@override_settings(AUTH_TOKEN_CACHE_TIMEOUT=0)
+class NotificationListQueryTests(TestCase):
+    """The notification feed costs the same number of queries however many rows it returns"""
+
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', 'recruiter@example.com', 'password')
+        self.token = Token.objects.create(user=self.recruiter)
+
+    def create_notifications(self, count):
+        applicants = User.objects.bulk_create(
+            [User(username=f'applicant-{index}-{count}') for index in range(count)]
+        )
+        jobs = [
+            Job.objects.create(title=f'Job {index}', company='Acme', location='Remote', description='Job',
+                               posted_by=self.recruiter)
+            for index in range(3)
+        ]
+        Notification.objects.bulk_create([
+            Notification(recipient=self.recruiter, sender=applicant, job=jobs[index % 3],
+                         notification_type='new_application', title='New application', message='Applied')
+            for index, applicant in enumerate(applicants)
+        ])
+
+    def list_notifications(self, limit):
+        return self.client.get(f'/api/notifications/?limit={limit}', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_query_count_is_constant(self):
+        self.create_notifications(5)
+        with self.assertNumQueries(2):  # Token lookup + one joined page query
+            response = self.list_notifications(5)
+        self.assertEqual(len(response.json()['results']), 5)
+
+        self.create_notifications(95)
+        with self.assertNumQueries(2):
+            response = self.list_notifications(100)
+        self.assertEqual(len(response.json()['results']), 100)
+
+    def test_matches_full_serializer(self):
+        self.create_notifications(3)
+        Notification.objects.create(recipient=self.recruiter, notification_type='job_posted',
+                                    title='No sender or job', message='System')
+
+        lean = self.list_notifications(10).json()['results']
+        full = NotificationSerializer(Notification.objects.order_by('-id'), many=True).data
+        self.assertEqual(lean, [dict(row) for row in full])
+
+    def test_list_queryset_defers_unused_columns(self):
+        self.create_notifications(1)
+        notification = NotificationListSerializer.list_queryset(Notification.objects.all()).get()
+        self.assertEqual(notification.get_deferred_fields(), {'recipient_id', 'emailed_at'})
+
+
+class NotificationFeedPagingTests(TestCase):
+    """The feed pages back with ?before= and polls forward with ?since_id="""
+
+    def setUp(self):
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        self.token = Token.objects.create(user=self.user)
+
+    def create_notifications(self, count):
+        Notification.objects.bulk_create([
+            Notification(recipient=self.user, notification_type='job_posted', title=f'Job {index}', message='Posted')
+            for index in range(count)
+        ])
+        return list(Notification.objects.filter(recipient=self.user).order_by('-id').values_list('id', flat=True))
+
+    def get_feed(self, query=''):
+        return self.client.get(f'/api/notifications/?{query}', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_pages_back_with_before(self):
+        ids = self.create_notifications(25)
+
+        first = self.get_feed().json()
+        self.assertEqual([item['id'] for item in first['results']], ids[:20])
+        self.assertEqual(first['next_before'], ids[19])
+
+        second = self.get_feed(f'before={first["next_before"]}').json()
+        self.assertEqual([item['id'] for item in second['results']], ids[20:])
+        self.assertIsNone(second['next_before'])
+
+    def test_limit_is_capped(self):
+        self.create_notifications(105)
+        self.assertEqual(len(self.get_feed('limit=500').json()['results']), 100)
+        self.assertEqual(len(self.get_feed('limit=3').json()['results']), 3)
+
+    def test_since_id_returns_only_newer(self):
+        seen = self.create_notifications(3)[0]
+        newer = self.create_notifications(2)[:2]
+
+        delta = self.get_feed(f'since_id={seen}').json()
+        self.assertEqual([item['id'] for item in delta['results']], newer)
+        self.assertIsNone(delta['next_before'])
+
+    def test_since_id_gap_is_filled_with_before(self):
+        seen = self.create_notifications(1)[0]
+        newer = self.create_notifications(5)[:5]
+
+        first = self.get_feed(f'since_id={seen}&limit=3').json()
+        second = self.get_feed(f'since_id={seen}&limit=3&before={first["next_before"]}').json()
+        self.assertEqual([item['id'] for item in first['results'] + second['results']], newer)
+        self.assertIsNone(second['next_before'])
+
+    def test_count_reports_newest_id(self):
+        def get_count():
+            return self.client.get('/api/notifications/count/', HTTP_AUTHORIZATION=f'Token {self.token.key}').json()
+
+        self.assertEqual(get_count(), {'unread_count': 0, 'newest_id': None})
+        notification = create_notification(self.user, 'job_posted', 'Posted', 'Posted')
+        self.assertEqual(get_count(), {'unread_count': 1, 'newest_id': notification.pk})
+
+    def test_malformed_ids(self):
+        for query in ('before=abc', 'since_id=-1', 'limit=x'):
+            with self.subTest(query=query):
+                self.assertEqual(self.get_feed(query).status_code, 400)
+
+
+class NotificationCountersTests(TestCase):
+    """Counters move with the notifications they count and never go below zero"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('counted', 'counted@example.com', 'password')
+
+    def counters(self):
+        return NotificationCounters.objects.get(pk=self.user.pk)
+
+    def test_create_publishes_after_commit(self):
+        with mock.patch('user_notifications.push.publish_notification') as publish:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                notification = create_notification(self.user, 'job_posted', 'New job', 'Posted')
+                publish.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        publish.assert_called_once_with(notification)
+        self.assertEqual((self.counters().total, self.counters().unread, self.counters().job_posted), (1, 1, 1))
+
+    def test_rolled_back_create_changes_nothing(self):
+        NotificationCounters.refresh(self.user.pk)
+        with mock.patch('user_notifications.push.publish_notification') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError):
+                    with transaction.atomic():
+                        create_notification(self.user, 'job_posted', 'New job', 'Posted')
+                        raise RuntimeError('caller failed')
+        publish.assert_not_called()
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(self.counters().total, 0)
+
+    def test_decrements_stop_at_zero(self):
+        create_notification(self.user, 'job_posted', 'New job', 'Posted')
+        NotificationCounters.adjust(self.user.pk, total=-3, unread=-3, job_posted=-3)
+        counters = self.counters()
+        self.assertEqual((counters.total, counters.unread, counters.job_posted), (0, 0, 0))
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class NotificationRetentionTests(TestCase):
+    """prune_notifications deletes by age and per-user cap in batches, keeping counters and rollups right"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('pruned', 'pruned@example.com', 'password')
+
+    def create(self, count, age=timedelta(days=0), is_read=False, notification_type='job_posted'):
+        created = Notification.objects.bulk_create([
+            Notification(recipient=self.user, notification_type=notification_type, title='Old', message='Old',
+                         is_read=is_read)
+            for _ in range(count)
+        ])
+        Notification.objects.filter(id__in=[notification.id for notification in created]).update(
+            created_at=timezone.now() - age
+        )
+        NotificationCounters.refresh(self.user.pk)
+
+    def prune(self, *args):
+        call_command('prune_notifications', *args, stdout=StringIO())
+
+    def assert_counters_match(self):
+        counters = NotificationCounters.for_user(self.user.pk)
+        actual = NotificationCounters.actual_counts([self.user.pk]).get(self.user.pk, {})
+        for field in NotificationCounters.COUNTER_FIELDS:
+            self.assertEqual(getattr(counters, field), actual.get(field, 0), field)
+
+    def test_age_policy_deletes_old_read_notifications(self):
+        self.create(3, age=timedelta(days=40), is_read=True)
+        self.create(2, age=timedelta(days=40))  # Unread notifications are kept however old
+        self.create(1, is_read=True)
+
+        self.prune('--days', '30', '--max-per-user', '0')
+        self.assertEqual(Notification.objects.filter(recipient=self.user).count(), 3)
+        self.assertEqual(Notification.objects.filter(is_read=True).count(), 1)
+        self.assert_counters_match()
+
+    def test_cap_policy_keeps_the_newest(self):
+        self.create(5)
+        newest = list(Notification.objects.order_by('-id').values_list('id', flat=True)[:3])
+
+        self.prune('--days', '0', '--max-per-user', '3')
+        self.assertEqual(sorted(Notification.objects.values_list('id', flat=True), reverse=True), newest)
+        self.assert_counters_match()
+
+    def test_rollup_adds_to_daily_summaries(self):
+        self.create(2, age=timedelta(days=40), is_read=True)
+        self.prune('--days', '30', '--max-per-user', '0', '--rollup')
+        self.create(1, age=timedelta(days=40), is_read=True)
+        self.prune('--days', '30', '--max-per-user', '0', '--rollup')
+
+        [summary] = NotificationDailySummary.objects.filter(user=self.user)
+        self.assertEqual((summary.notification_type, summary.count), ('job_posted', 3))
+        self.assertEqual(summary.day, timezone.localdate(timezone.now() - timedelta(days=40)))
+
+    def test_deletes_in_batches(self):
+        self.create(5)
+        self.assertEqual(list(delete_in_batches(Notification.objects.all(), batch_size=2)), [2, 2, 1])
+        self.assertFalse(Notification.objects.exists())
+        self.assert_counters_match()
+
+    def test_dry_run_deletes_nothing(self):
+        self.create(3, age=timedelta(days=40), is_read=True)
+        self.prune('--days', '30', '--max-per-user', '1', '--dry-run')
+        self.assertEqual(Notification.objects.count(), 3)
+
+
+class NotificationDigestTests(TestCase):
+    """Each due user gets one digest, and --send delivers exactly the digests it queued"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('digest', 'digest@example.com', 'password')
+
+    def create_pending(self, count, age=timedelta(hours=2), **fields):
+        for index in range(count):
+            notification = create_notification(self.user, 'job_posted', f'Job {index}', 'Posted')
+            Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - age, **fields)
+
+    def send_digests(self, *args):
+        call_command('send_notification_digests', *args, stdout=StringIO())
+
+    def test_one_digest_per_user(self):
+        self.create_pending(3)
+        self.send_digests('--send')
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Job 2', mail.outbox[0].body)
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=True).exists())
+
+        # Nothing new: the next run sends nothing
+        self.send_digests('--send')
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_body_is_not_html_escaped(self):
+        notification = create_notification(
+            self.user, 'new_application', 'New application', "bob has applied to your job posting 'Dev' at O'Reilly & Co."
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        self.send_digests('--send')
+
+        [message] = mail.outbox
+        self.assertIn("'Dev' at O'Reilly & Co.", message.body)
+        self.assertNotIn('&#x27;', message.body)
+        self.assertNotIn('&amp;', message.body)
+
+    def test_not_due_within_window(self):
+        self.create_pending(2, age=timedelta(minutes=5))
+        self.send_digests('--send', '--window-minutes', '60')
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Notification.objects.filter(emailed_at__isnull=True).count(), 2)
+
+    def test_read_notifications_are_not_emailed(self):
+        self.create_pending(2, is_read=True)
+        self.send_digests('--send')
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=True).exists())
+
+    def test_send_leaves_other_queued_email_to_the_outbox_worker(self):
+        other = enqueue_email('someone@example.com', 'Welcome', 'Hello')
+        self.create_pending(1)
+        self.send_digests('--send')
+
+        self.assertEqual([message.to for message in mail.outbox], [['digest@example.com']])
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'queued')
+
+
+class NotificationStreamTests(TestCase):
+    """The push stream is opened with a short-lived ticket and only served over ASGI"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('streamer', 'streamer@example.com', 'password')
+        self.token = Token.objects.create(user=self.user)
+        self.auth = {'Authorization': f'Token {self.token.key}'}
+
+    def test_wsgi_answers_501(self):
+        response = self.client.post('/api/notifications/stream-ticket/', headers=self.auth)
+        self.assertEqual(response.status_code, 501)
+        response = self.client.get('/api/notifications/stream/?ticket=anything')
+        self.assertEqual(response.status_code, 501)
+
+    async def test_auth_token_is_not_a_ticket(self):
+        response = await self.async_client.get(f'/api/notifications/stream/?ticket={self.token.key}')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_expired_ticket(self):
+        response = await self.async_client.post('/api/notifications/stream-ticket/', headers=self.auth)
+        ticket = response.json()['ticket']
+        with mock.patch.object(views, 'STREAM_TICKET_MAX_AGE', -1):
+            response = await self.async_client.get(f'/api/notifications/stream/?ticket={ticket}')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_pushes_counts(self):
+        response = await self.async_client.post('/api/notifications/stream-ticket/', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(f'/api/notifications/stream/?ticket={response.json()["ticket"]}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        events = response.streaming_content.__aiter__()
+        first = await events.__anext__()
+        self.assertEqual(first, b'event: count\ndata: {"unread_count": 0, "newest_id": null}\n\n')
+
+        notification = await Notification.objects.acreate(
+            recipient=self.user, notification_type='job_posted', title='Pushed', message='Pushed'
+        )
+        await sync_to_async(NotificationCounters.refresh)(self.user.pk)
+        broker.publish(self.user.pk, {'recipient_id': self.user.pk, 'id': notification.pk})
+        pushed = await asyncio.wait_for(events.__anext__(), timeout=5)
+        self.assertEqual(
+            pushed, f'event: count\ndata: {{"unread_count": 1, "newest_id": {notification.pk}}}\n\n'.encode()
+        )
+        await events.aclose()
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('', views.notifications_list, name='notifications_list'),
     path('count/', views.notifications_count, name='notifications_count'),
+    path('stream-ticket/', views.notifications_stream_ticket, name='notifications_stream_ticket'),
+    path('stream/', views.notifications_stream, name='notifications_stream'),
     path('stats/', views.notifications_stats, name='notifications_stats'),
     path('<int:notification_id>/read/', views.mark_notification_read, name='mark_notification_read'),
     path('mark-all-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
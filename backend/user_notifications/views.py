@@ -1,37 +1,187 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
 from django.db.models import Q
-from .models import Notification
-from .serializers import NotificationSerializer, NotificationMarkReadSerializer
+from django.http import JsonResponse, StreamingHttpResponse
+from jobs.renderers import sse_event
+from .models import Notification, NotificationCounters
+from .serializers import NotificationSerializer, NotificationListSerializer, NotificationMarkReadSerializer
+from .push import broker, push_available
+from .retention import delete_in_batches
+
+
+# Page size bounds for notifications_list
+DEFAULT_NOTIFICATION_LIMIT = 20
+MAX_NOTIFICATION_LIMIT = 100
+
+
+def _id_param(request, name):
+    """Optional positive integer query parameter; raises ValueError when malformed"""
+    value = request.GET.get(name)
+    if value in (None, ''):
+        return None
+    value = int(value)
+    if value < 0:
+        raise ValueError(name)
+    return value
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notifications_list(request):
-    """Get all notifications for the current user"""
+    """
+    Get the current user's notifications, newest first, one page at a time.
+    
+    Query parameters:
+        limit: Page size (default 20, max 100)
+        since_id: Only notifications newer than this id (poll for the delta)
+        before: Only notifications older than this id (load the next older page)
+        unread_only: 'true' to only return unread notifications
+    
+    Returns {'results', 'next_before'}; pass next_before as ?before= (keeping
+    since_id) to continue, it is null once nothing older is left.
+    """
+    try:
+        since_id = _id_param(request, 'since_id')
+        before = _id_param(request, 'before')
+        limit = _id_param(request, 'limit') or DEFAULT_NOTIFICATION_LIMIT
+    except ValueError:
+        return Response({'error': 'since_id, before and limit must be positive numbers'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, MAX_NOTIFICATION_LIMIT)
+    
     notifications = Notification.objects.filter(recipient=request.user)
     
     # Optional filtering
     unread_only = request.GET.get('unread_only', False)
     if unread_only and unread_only.lower() == 'true':
         notifications = notifications.filter(is_read=False)
+    if since_id is not None:
+        notifications = notifications.filter(id__gt=since_id)
+    if before is not None:
+        notifications = notifications.filter(id__lt=before)
     
-    serializer = NotificationSerializer(notifications, many=True)
-    return Response(serializer.data)
+    # Fetch one extra row to learn whether an older page exists; sender and job are joined in the same query
+    page = list(NotificationListSerializer.list_queryset(notifications).order_by('-id')[:limit + 1])
+    next_before = page[limit - 1].id if len(page) > limit else None
+    
+    serializer = NotificationListSerializer(page[:limit], many=True)
+    return Response({'results': serializer.data, 'next_before': next_before})
+
+
+def _count_state(user):
+    """Unread count and newest notification id, as sent by the count endpoint and the stream"""
+    return {
+        'unread_count': NotificationCounters.for_user(user.pk).unread,
+        'newest_id': Notification.objects.filter(recipient=user).order_by('-id').values_list('id', flat=True).first(),
+    }
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notifications_count(request):
-    """Get count of unread notifications"""
-    unread_count = Notification.objects.filter(
-        recipient=request.user, 
-        is_read=False
-    ).count()
+    """Get count of unread notifications and the id of the newest notification"""
+    # Clients compare newest_id with the newest one they hold and only refetch when it changed
+    return Response(_count_state(request.user))
+
+
+# Idle streams send a ping event this often so proxies keep the connection open and clients can tell it is alive
+STREAM_KEEPALIVE_SECONDS = 25
+# Streams end after this long and the client reconnects with a new ticket, which reaps half-open connections
+STREAM_MAX_SECONDS = 600
+# Stream tickets are only good for opening a stream within this many seconds of being issued
+STREAM_TICKET_MAX_AGE = 60
+STREAM_TICKET_SALT = 'user_notifications.stream'
+
+
+PUSH_UNAVAILABLE = {'error': 'Notification push is not available on this server; poll /api/notifications/count/'}
+
+
+def _can_stream(request):
+    """
+    Under WSGI (runserver, plain gunicorn) Django buffers an async stream until it
+    ends, and on PostgreSQL without a LISTEN connection events from other
+    processes never arrive; both answer 501 so clients poll instead.
+    """
+    return isinstance(request, ASGIRequest) and push_available()
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def notifications_stream_ticket(request):
+    """
+    Issue a short-lived ticket for opening the notification stream.
+    EventSource cannot send headers, so the stream is authenticated from the query
+    string; a ticket keeps the long-lived auth token out of URLs and access logs.
+    """
+    if not _can_stream(request._request):
+        return Response(PUSH_UNAVAILABLE, status=status.HTTP_501_NOT_IMPLEMENTED)
     
-    return Response({'unread_count': unread_count})
+    ticket = signing.TimestampSigner(salt=STREAM_TICKET_SALT).sign(str(request.user.pk))
+    return Response({'ticket': ticket, 'expires_in': STREAM_TICKET_MAX_AGE})
+
+
+async def _stream_user(request):
+    """Resolve the user from a ?ticket= issued by notifications_stream_ticket"""
+    try:
+        user_id = signing.TimestampSigner(salt=STREAM_TICKET_SALT).unsign(
+            request.GET.get('ticket', ''), max_age=STREAM_TICKET_MAX_AGE
+        )
+        return await User.objects.aget(pk=user_id, is_active=True)
+    except (signing.BadSignature, User.DoesNotExist):
+        return None
+
+
+async def _notification_events(user):
+    queue = broker.subscribe(user.id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_MAX_SECONDS
+    try:
+        yield sse_event('count', await sync_to_async(_count_state)(user))
+        
+        while loop.time() < deadline:
+            try:
+                await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield sse_event('ping', {})
+                continue
+            
+            # A burst of notifications costs one count query
+            while not queue.empty():
+                queue.get_nowait()
+            yield sse_event('count', await sync_to_async(_count_state)(user))
+    finally:
+        broker.unsubscribe(user.id, queue)
+
+
+async def notifications_stream(request):
+    """
+    Server-Sent Events stream of the current user's unread count and newest notification id.
+    Sends a 'count' event on connect and whenever a notification is created for the user,
+    and a 'ping' event when idle. Open with ?ticket=<ticket from POST stream-ticket/>.
+    Returns 501 when the server cannot push (see _can_stream); clients then poll.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    if not _can_stream(request):
+        return JsonResponse(PUSH_UNAVAILABLE, status=status.HTTP_501_NOT_IMPLEMENTED)
+    
+    user = await _stream_user(request)
+    if user is None:
+        return JsonResponse({'error': 'Invalid or expired stream ticket'}, status=401)
+    
+    response = StreamingHttpResponse(_notification_events(user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering
+    return response
 
 
 @api_view(['PUT'])
@@ -46,8 +196,11 @@ def mark_notification_read(request, notification_id):
     except Notification.DoesNotExist:
         return Response({'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    # Conditional update so the unread counter only drops once per notification
+    with transaction.atomic():
+        if Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True):
+            NotificationCounters.adjust(request.user.pk, unread=-1)
     notification.is_read = True
-    notification.save()
     
     serializer = NotificationSerializer(notification)
     return Response(serializer.data)
@@ -57,10 +210,12 @@ def mark_notification_read(request, notification_id):
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read(request):
     """Mark all notifications as read for the current user"""
-    updated_count = Notification.objects.filter(
-        recipient=request.user, 
-        is_read=False
-    ).update(is_read=True)
+    with transaction.atomic():
+        updated_count = Notification.objects.filter(
+            recipient=request.user, 
+            is_read=False
+        ).update(is_read=True)
+        NotificationCounters.adjust(request.user.pk, unread=-updated_count)
     
     return Response({'message': f'Marked {updated_count} notifications as read'})
 
@@ -69,15 +224,23 @@ def mark_all_notifications_read(request):
 @permission_classes([IsAuthenticated])
 def delete_notification(request, notification_id):
     """Delete a specific notification"""
-    try:
-        notification = Notification.objects.get(
-            id=notification_id, 
-            recipient=request.user
+    with transaction.atomic():
+        try:
+            # Locked so a concurrent mark-read cannot change is_read under the counter update
+            notification = Notification.objects.select_for_update().get(
+                id=notification_id, 
+                recipient=request.user
+            )
+        except Notification.DoesNotExist:
+            return Response({'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        notification.delete()
+        NotificationCounters.adjust(
+            request.user.pk,
+            total=-1,
+            unread=0 if notification.is_read else -1,
+            **{notification.notification_type: -1}
         )
-    except Notification.DoesNotExist:
-        return Response({'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
-    
-    notification.delete()
     return Response({'message': 'Notification deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -85,7 +248,8 @@ def delete_notification(request, notification_id):
 @permission_classes([IsAuthenticated])
 def clear_all_notifications(request):
     """Delete all notifications for the current user"""
-    deleted_count, _ = Notification.objects.filter(recipient=request.user).delete()
+    # Bounded batches keep each DELETE short however long the history is
+    deleted_count = sum(delete_in_batches(Notification.objects.filter(recipient=request.user)))
     return Response({'message': f'Cleared {deleted_count} notifications'})
 
 
@@ -93,23 +257,4 @@ def clear_all_notifications(request):
 @permission_classes([IsAuthenticated])
 def notifications_stats(request):
     """Get notification statistics for the current user"""
-    total_notifications = Notification.objects.filter(recipient=request.user).count()
-    unread_notifications = Notification.objects.filter(recipient=request.user, is_read=False).count()
-    
-    # Count by type
-    new_applications = Notification.objects.filter(
-        recipient=request.user, 
-        notification_type='new_application'
-    ).count()
-    
-    status_updates = Notification.objects.filter(
-        recipient=request.user, 
-        notification_type='application_status'
-    ).count()
-    
-    return Response({
-        'total_notifications': total_notifications,
-        'unread_notifications': unread_notifications,
-        'new_applications': new_applications,
-        'status_updates': status_updates
-    })
+    return Response(NotificationCounters.for_user(request.user.pk).as_stats())
@@ -18,4 +18,7 @@ python manage.py collectstatic --noinput
 echo "🗄️  Running database migrations..."
 python manage.py migrate --noinput
 
+echo "🔎 Rebuilding job recommendation index..."
+python manage.py rebuild_job_skill_index
+
 echo "✅ Build complete!"
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, useLocation } from 'react-router-dom';
+import { subscribeToNotificationCounts, refreshNotificationCounts } from './notificationStream';
 import './BottomNavigation.css';
 
 const TopNavigation = ({ user, onLogout }) => {
@@ -8,30 +9,10 @@ const TopNavigation = ({ user, onLogout }) => {
   const [unreadCount, setUnreadCount] = useState(0);
 
   useEffect(() => {
-    fetchUnreadCount();
-    // Set up interval to check for new notifications every 30 seconds
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+    // The server pushes the unread count whenever a notification arrives
+    return subscribeToNotificationCounts(({ unread_count }) => setUnreadCount(unread_count));
   }, []);
 
-  const fetchUnreadCount = async () => {
-    try {
-      const token = JSON.parse(localStorage.getItem('auth'))?.token;
-      if (!token) return;
-      
-      const response = await fetch('/api/notifications/count/', {
-        headers: { 'Authorization': `Token ${token}` }
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        setUnreadCount(data.unread_count);
-      }
-    } catch (error) {
-      console.error('Error fetching notification count:', error);
-    }
-  };
-
   const navItems = [
     {
       id: 'home',
@@ -75,7 +56,7 @@ const TopNavigation = ({ user, onLogout }) => {
     navigate(path);
     // Refresh notification count when navigating away from notifications
     if (path !== '/notifications') {
-      setTimeout(fetchUnreadCount, 1000);
+      setTimeout(refreshNotificationCounts, 1000);
     }
   };
 
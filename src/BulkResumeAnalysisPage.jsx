@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import TopNavigation from './BottomNavigation';
 import './BulkResumeAnalysisPage.css';
+import { fetchAllPages } from './config';
 
 const BulkResumeAnalysisPage = ({ user, onLogout }) => {
   const [myJobs, setMyJobs] = useState([]);
@@ -29,16 +30,15 @@ const BulkResumeAnalysisPage = ({ user, onLogout }) => {
         return;
       }
 
-      const response = await fetch('/api/jobs/my-jobs/', {
+      const response = await fetchAllPages('/api/jobs/my-jobs/?page_size=100', {
         headers: {
           'Authorization': `Token ${auth.token}`,
         },
       });
       
       if (response.ok) {
-        const data = await response.json();
-        setMyJobs(data);
-        console.log('Loaded jobs:', data);
+        setMyJobs(response.results);
+        console.log('Loaded jobs:', response.results);
       } else {
         console.error('Failed to fetch jobs:', response.status);
       }
@@ -78,26 +78,62 @@ const BulkResumeAnalysisPage = ({ user, onLogout }) => {
     selectedFiles.forEach((file) => {
       formData.append('resumes', file);
     });
+    // Extract text for multi-file batches in parallel on the server
+    formData.append('parallel', selectedFiles.length > 1 ? 'true' : 'false');
 
     try {
       const auth = JSON.parse(localStorage.getItem('auth'));
       
-      const response = await fetch('/api/jobs/bulk-analyze/', {
+      const response = await fetch('/api/jobs/bulk-analyze/stream/', {
         method: 'POST',
         headers: {
           'Authorization': `Token ${auth.token}`,
+          'Accept': 'application/x-ndjson',
         },
         body: formData,
       });
 
-      const data = await response.json();
-
-      if (response.ok) {
-        // Sort results by score (highest first)
-        const sortedResults = [...data.results].sort((a, b) => b.score - a.score);
-        setResults({ ...data, results: sortedResults });
-      } else {
+      if (!response.ok) {
+        const data = await response.json();
         setError(data.error || 'Analysis failed');
+        return;
+      }
+
+      // Show each resume as soon as the server has scored it
+      setResults({ success_count: 0, error_count: 0, results: [], errors: [], job: null });
+
+      const handleRecord = (record) => {
+        setResults(prev => {
+          if (record.type === 'result') {
+            // Keep results sorted by score (highest first)
+            const sortedResults = [...prev.results, record].sort((a, b) => b.score - a.score);
+            return { ...prev, success_count: prev.success_count + 1, results: sortedResults };
+          }
+          if (record.type === 'error') {
+            return { ...prev, error_count: prev.error_count + 1, errors: [...prev.errors, record] };
+          }
+          if (record.type === 'summary') {
+            return { ...prev, success_count: record.success_count, error_count: record.error_count, job: record.job };
+          }
+          return prev;
+        });
+      };
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => handleRecord(JSON.parse(line)));
+      }
+      if (buffer.trim()) {
+        handleRecord(JSON.parse(buffer));
       }
     } catch (err) {
       setError('Network error: ' + err.message);
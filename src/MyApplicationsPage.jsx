@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import TopNavigation from './BottomNavigation';
 import './MyApplicationsPage.css';
+import { waitForAnalysisBatch } from './config';
 
 // ApplicationCard component with resume analysis
 const ApplicationCard = ({ application, onStatusUpdate, onDownloadResume, onAnalyzeResume, onUploadResume, isAnalyzing, isUploading }) => {
@@ -424,21 +425,22 @@ const MyApplicationsPage = ({ user, onLogout }) => {
       });
       
       if (response.ok) {
-        const results = await response.json();
+        // Analysis runs in the background; poll the batch until every resume is processed or we stop waiting
+        const batch = await waitForAnalysisBatch(await response.json(), auth.token);
         
-        // Update applications with analysis results
-        setApplications(prevApplications => {
-          const updatedApps = [...prevApplications];
-          results.forEach(result => {
-            const index = updatedApps.findIndex(app => app.id === result.id);
-            if (index !== -1) {
-              updatedApps[index] = result;
-            }
-          });
-          return updatedApps;
-        });
+        // Reload applications to pick up the stored analysis results
+        await fetchApplications();
         
-        alert(`Analyzed ${results.length} resume(s) successfully!`);
+        if (batch.status !== 'completed') {
+          alert(
+            `Still processing: ${batch.completed_tasks + batch.failed_tasks} of ${batch.total_tasks} resume(s) analyzed so far. ` +
+            'The rest will keep running in the background; refresh the page later to see their results.'
+          );
+        } else if (batch.failed_tasks > 0) {
+          alert(`Analyzed ${batch.completed_tasks} resume(s); ${batch.failed_tasks} could not be analyzed.`);
+        } else {
+          alert(`Analyzed ${batch.completed_tasks} resume(s) successfully!`);
+        }
       } else {
         const errorData = await response.json();
         alert(`Bulk analysis failed: ${errorData.error || 'Unknown error'}`);
@@ -1,11 +1,16 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import TopNavigation from './BottomNavigation';
+import { subscribeToNotificationCounts } from './notificationStream';
 import './NotificationsPage.css';
 
 const NotificationsPage = ({ user, onLogout }) => {
   const [notifications, setNotifications] = useState([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState('all');
+  const [nextBefore, setNextBefore] = useState(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  // Id of the newest notification held (null until the first page loads), so pushes only fetch what arrived after it
+  const newestIdRef = useRef(null);
   const [stats, setStats] = useState({
     total_notifications: 0,
     unread_notifications: 0,
@@ -16,18 +21,25 @@ const NotificationsPage = ({ user, onLogout }) => {
   useEffect(() => {
     fetchNotifications();
     fetchStats();
+    // The server pushes the newest notification id whenever one arrives
+    return subscribeToNotificationCounts(({ newest_id }) => fetchNewNotifications(newest_id));
   }, []);
 
+  const fetchNotificationsPage = async (query) => {
+    const token = JSON.parse(localStorage.getItem('auth'))?.token;
+    const response = await fetch(`/api/notifications/?${query}`, {
+      headers: { 'Authorization': `Token ${token}` }
+    });
+    return response.ok ? response.json() : null;
+  };
+
   const fetchNotifications = async () => {
     try {
-      const token = JSON.parse(localStorage.getItem('auth'))?.token;
-      const response = await fetch('/api/notifications/', {
-        headers: { 'Authorization': `Token ${token}` }
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        setNotifications(data);
+      const data = await fetchNotificationsPage('limit=20');
+      if (data) {
+        setNotifications(data.results);
+        setNextBefore(data.next_before);
+        newestIdRef.current = data.results.length > 0 ? data.results[0].id : 0;
       } else {
         console.error('Failed to fetch notifications');
       }
@@ -38,6 +50,43 @@ const NotificationsPage = ({ user, onLogout }) => {
     }
   };
 
+  const loadOlderNotifications = async () => {
+    if (!nextBefore || loadingOlder) return;
+
+    setLoadingOlder(true);
+    try {
+      const data = await fetchNotificationsPage(`limit=20&before=${nextBefore}`);
+      if (data) {
+        setNotifications(prev => [...prev, ...data.results]);
+        setNextBefore(data.next_before);
+      }
+    } catch (error) {
+      console.error('Error loading older notifications:', error);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
+  // Fetch only notifications newer than the ones shown, and only when the newest id changed
+  const fetchNewNotifications = async (newest_id) => {
+    try {
+      if (newestIdRef.current === null || !newest_id || newest_id <= newestIdRef.current) return;
+
+      const data = await fetchNotificationsPage(`limit=100&since_id=${newestIdRef.current}`);
+      if (!data) return;
+      if (data.next_before) {
+        // More arrived than one page holds; start over from the newest
+        fetchNotifications();
+      } else {
+        setNotifications(prev => [...data.results, ...prev]);
+        newestIdRef.current = data.results.length > 0 ? data.results[0].id : newest_id;
+      }
+      fetchStats();
+    } catch (error) {
+      console.error('Error fetching new notifications:', error);
+    }
+  };
+
   const fetchStats = async () => {
     try {
       const token = JSON.parse(localStorage.getItem('auth'))?.token;
@@ -127,6 +176,7 @@ const NotificationsPage = ({ user, onLogout }) => {
 
       if (response.ok) {
         setNotifications([]);
+        setNextBefore(null);
         fetchStats(); // Refresh stats
       }
     } catch (error) {
@@ -191,7 +241,7 @@ const NotificationsPage = ({ user, onLogout }) => {
               className={filter === 'all' ? 'filter-btn active' : 'filter-btn'}
               onClick={() => setFilter('all')}
             >
-              All ({notifications.length})
+              All ({stats.total_notifications})
             </button>
             <button 
               className={filter === 'unread' ? 'filter-btn active' : 'filter-btn'}
@@ -288,6 +338,14 @@ const NotificationsPage = ({ user, onLogout }) => {
             ))}
           </div>
         )}
+
+        {nextBefore && (
+          <div className="load-more">
+            <button className="btn-load-more" onClick={loadOlderNotifications} disabled={loadingOlder}>
+              {loadingOlder ? 'Loading...' : 'Load older notifications'}
+            </button>
+          </div>
+        )}
       </main>
     </div>
   );
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { useNavigate } from 'react-router-dom';
 import ProfileCard from "./ProfileCard.jsx";
 import TopNavigation from './BottomNavigation';
+import { fetchAllPages } from './config';
 
 // A pool of sample skills to randomly assign
 const skillPool = [
@@ -96,7 +97,7 @@ const ProfileGrid = ({ user, onLogout }) => {
   const fetchMyJobs = async () => {
     try {
       const auth = JSON.parse(localStorage.getItem('auth'));
-      const response = await fetch('/api/jobs/my-jobs/', {
+      const response = await fetchAllPages('/api/jobs/my-jobs/?page_size=100', {
         headers: {
           'Authorization': `Token ${auth.token}`,
           'Content-Type': 'application/json',
@@ -104,8 +105,7 @@ const ProfileGrid = ({ user, onLogout }) => {
       });
       
       if (response.ok) {
-        const data = await response.json();
-        setMyJobs(data);
+        setMyJobs(response.results);
       }
     } catch (error) {
       console.error('Error fetching my jobs:', error);
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import TopNavigation from './BottomNavigation';
 import './ProfilePage.css';
+import { fetchAllPages } from './config';
 
 const ProfilePage = ({ user, onLogout }) => {
   const navigate = useNavigate();
@@ -45,8 +46,8 @@ const ProfilePage = ({ user, onLogout }) => {
         headers: { 'Authorization': `Token ${token}` }
       });
       
-      // Fetch user's posted jobs
-      const jobsResponse = await fetch('/api/jobs/my-jobs/', {
+      // Fetch user's posted jobs (every page)
+      const jobsResponse = await fetchAllPages('/api/jobs/my-jobs/?page_size=100', {
         headers: { 'Authorization': `Token ${token}` }
       });
 
@@ -56,8 +57,7 @@ const ProfilePage = ({ user, onLogout }) => {
       }
 
       if (jobsResponse.ok) {
-        const jobsData = await jobsResponse.json();
-        setMyJobs(jobsData);
+        setMyJobs(jobsResponse.results);
       }
     } catch (error) {
       console.error('Error fetching user data:', error);
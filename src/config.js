@@ -9,3 +9,47 @@ export const getApiUrl = (endpoint) => {
   const cleanEndpoint = endpoint.startsWith('/') ? endpoint.slice(1) : endpoint;
   return `${API_BASE_URL}/${cleanEndpoint}`;
 };
+
+// Append a pagination cursor to a list endpoint URL
+export const withCursor = (url, cursor) => {
+  if (!cursor) return url;
+  return `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}`;
+};
+
+// Fetch every page of a cursor-paginated list endpoint ({ results, next_cursor })
+export const fetchAllPages = async (url, options = {}) => {
+  const results = [];
+  let cursor = null;
+
+  do {
+    const response = await fetch(withCursor(url, cursor), options);
+    if (!response.ok) {
+      return { ok: false, status: response.status, results };
+    }
+    const data = await response.json();
+    results.push(...data.results);
+    cursor = data.next_cursor;
+  } while (cursor);
+
+  return { ok: true, status: 200, results };
+};
+
+// Bulk resume analysis runs in a background worker; poll its progress this often, for at most this long
+export const ANALYSIS_POLL_INTERVAL = 2000;
+export const ANALYSIS_MAX_WAIT = 5 * 60 * 1000;
+
+// Poll an analysis batch (as returned by analyze-resumes/) until it completes or we stop waiting
+export const waitForAnalysisBatch = async (batch, token) => {
+  const deadline = Date.now() + ANALYSIS_MAX_WAIT;
+  while (batch.status !== 'completed' && Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, ANALYSIS_POLL_INTERVAL));
+    const response = await fetch(`/api/jobs/analysis-batches/${batch.batch_id}/`, {
+      headers: { 'Authorization': `Token ${token}` }
+    });
+    if (!response.ok) {
+      throw new Error('Failed to fetch analysis progress');
+    }
+    batch = await response.json();
+  }
+  return batch;
+};
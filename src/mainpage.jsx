@@ -1,12 +1,18 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import TopNavigation from './BottomNavigation'
+import { fetchAllPages, withCursor, waitForAnalysisBatch } from './config'
 
 export default function MainPage({ user, onLogout }) {
   const navigate = useNavigate()
   const [jobs, setJobs] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const loadMoreRef = useRef(null)
   const [archivedJobs, setArchivedJobs] = useState([])
   const [activeTab, setActiveTab] = useState('all')
+  const [searchInput, setSearchInput] = useState('')
+  const [searchQuery, setSearchQuery] = useState('')
   const [showPostForm, setShowPostForm] = useState(false)
   const [editingJob, setEditingJob] = useState(null)
   const [showApplicationForm, setShowApplicationForm] = useState(false)
@@ -37,35 +43,94 @@ export default function MainPage({ user, onLogout }) {
 
   // Fetch jobs from backend
   useEffect(() => {
-    fetchJobs()
     fetchArchivedJobs()
   }, [])
 
+  // Search once the user stops typing instead of on every keystroke
+  useEffect(() => {
+    const timer = setTimeout(() => setSearchQuery(searchInput.trim()), 300)
+    return () => clearTimeout(timer)
+  }, [searchInput])
+
+  // Reload the first page whenever the job type tab or search changes
+  useEffect(() => {
+    if (activeTab !== 'archived') {
+      fetchJobs()
+    }
+  }, [activeTab, searchQuery])
+
+  // Load the next page when the end of the list scrolls into view
+  useEffect(() => {
+    const sentinel = loadMoreRef.current
+    if (!sentinel || !nextCursor) return
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) {
+        loadMoreJobs()
+      }
+    }, { rootMargin: '200px' })
+
+    observer.observe(sentinel)
+    return () => observer.disconnect()
+  }, [nextCursor, loadingMore])
+
+  const jobsUrl = () => {
+    const params = new URLSearchParams()
+    if (activeTab !== 'all' && activeTab !== 'archived') params.set('job_type', activeTab)
+    // Searches run on the server's full-text index, ranked by relevance
+    if (searchQuery) params.set('q', searchQuery)
+    const base = searchQuery ? '/api/jobs/search/' : '/api/jobs/'
+    return params.toString() ? `${base}?${params}` : base
+  }
+
+  // Fetch one page of jobs; without a cursor the list restarts from the newest job
+  const fetchJobsPage = async (cursor) => {
+    const auth = JSON.parse(localStorage.getItem('auth'))
+    const response = await fetch(withCursor(jobsUrl(), cursor), {
+      headers: {
+        'Authorization': `Token ${auth.token}`,
+        'Content-Type': 'application/json',
+      },
+    })
+    
+    if (!response.ok) {
+      throw new Error('Failed to fetch jobs')
+    }
+    return response.json()
+  }
+
   const fetchJobs = async () => {
     try {
-      const auth = JSON.parse(localStorage.getItem('auth'))
-      const response = await fetch('/api/jobs/', {
-        headers: {
-          'Authorization': `Token ${auth.token}`,
-          'Content-Type': 'application/json',
-        },
-      })
-      
-      if (response.ok) {
-        const data = await response.json()
-        setJobs(data)
-      } else {
-        console.error('Failed to fetch jobs')
-      }
+      const data = await fetchJobsPage(null)
+      setJobs(data.results)
+      setNextCursor(data.next_cursor)
     } catch (error) {
       console.error('Error fetching jobs:', error)
     }
   }
 
+  const loadMoreJobs = async () => {
+    if (!nextCursor || loadingMore) return
+    
+    setLoadingMore(true)
+    try {
+      const data = await fetchJobsPage(nextCursor)
+      setJobs(prev => {
+        const seen = new Set(prev.map(job => job.id))
+        return [...prev, ...data.results.filter(job => !seen.has(job.id))]
+      })
+      setNextCursor(data.next_cursor)
+    } catch (error) {
+      console.error('Error loading more jobs:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const fetchArchivedJobs = async () => {
     try {
       const auth = JSON.parse(localStorage.getItem('auth'))
-      const response = await fetch('/api/jobs/archived/', {
+      const response = await fetchAllPages('/api/jobs/archived/?page_size=100', {
         headers: {
           'Authorization': `Token ${auth.token}`,
           'Content-Type': 'application/json',
@@ -73,9 +138,8 @@ export default function MainPage({ user, onLogout }) {
       })
       
       if (response.ok) {
-        const data = await response.json()
         // Only show archived jobs posted by current user
-        setArchivedJobs(data.filter(job => job.posted_by_username === user.username))
+        setArchivedJobs(response.results.filter(job => job.posted_by_username === user.username))
       } else {
         console.error('Failed to fetch archived jobs')
       }
@@ -443,9 +507,20 @@ export default function MainPage({ user, onLogout }) {
       })
 
       if (response.ok) {
-        const data = await response.json()
-        alert(`Successfully analyzed ${data.length} resume(s)! Check your applications to see the results.`)
+        // Analysis runs in a background worker; poll the batch until every resume is processed or we stop waiting
+        const batch = await waitForAnalysisBatch(await response.json(), auth.token)
         fetchJobs() // Refresh to update any counts
+
+        if (batch.status !== 'completed') {
+          alert(
+            `Still processing: ${batch.completed_tasks + batch.failed_tasks} of ${batch.total_tasks} resume(s) analyzed so far. ` +
+            'The rest will keep running in the background; check your applications later to see their results.'
+          )
+        } else if (batch.failed_tasks > 0) {
+          alert(`Analyzed ${batch.completed_tasks} resume(s); ${batch.failed_tasks} could not be analyzed.`)
+        } else {
+          alert(`Successfully analyzed ${batch.completed_tasks} resume(s)! Check your applications to see the results.`)
+        }
       } else {
         const errorData = await response.json()
         alert(`Error: ${errorData.error || 'Failed to analyze applications'}`)
@@ -484,7 +559,7 @@ export default function MainPage({ user, onLogout }) {
         <div className="job-board-header">
           <div className="board-stats">
             <h2>Job Board</h2>
-            <p>{jobs.length} active job postings</p>
+            <p>{jobs.length}{nextCursor ? '+' : ''} active job postings</p>
           </div>
           <div className="header-actions">
             <button 
@@ -837,6 +912,16 @@ export default function MainPage({ user, onLogout }) {
         </div>
       )}
 
+        {/* Job Search */}
+        <div className="job-search">
+          <input
+            type="search"
+            placeholder="Search jobs by title, company, location or skill..."
+            value={searchInput}
+            onChange={(e) => setSearchInput(e.target.value)}
+          />
+        </div>
+
         {/* Job Type Tabs */}
         <div className="job-tabs">
           <button 
@@ -937,7 +1022,7 @@ export default function MainPage({ user, onLogout }) {
             // Show active jobs
             jobs.filter(job => activeTab === 'all' || job.job_type === activeTab).length === 0 ? (
               <div className="no-jobs">
-                <p>{activeTab === 'all' ? 'No job postings yet. Be the first to post a job!' : `No ${activeTab} jobs available.`}</p>
+                <p>{searchQuery ? `No jobs match "${searchQuery}".` : activeTab === 'all' ? 'No job postings yet. Be the first to post a job!' : `No ${activeTab} jobs available.`}</p>
               </div>
             ) : (
               jobs.filter(job => activeTab === 'all' || job.job_type === activeTab).map(job => (
@@ -1019,6 +1104,13 @@ export default function MainPage({ user, onLogout }) {
             ))
             )
           )}
+          {activeTab !== 'archived' && nextCursor && (
+            <div ref={loadMoreRef} className="load-more">
+              {loadingMore ? 'Loading more jobs...' : (
+                <button className="btn-load-more" onClick={loadMoreJobs}>Load more jobs</button>
+              )}
+            </div>
+          )}
         </div>
       </main>
       
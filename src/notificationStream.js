@@ -0,0 +1,153 @@
+// Shared push channel for notification counts
+// One EventSource per tab streams { unread_count, newest_id } from /api/notifications/stream/
+// whenever a notification arrives. Whenever the stream is down, silent, or not offered by the
+// server (501), the count endpoint is polled instead until a pushed count arrives again.
+
+const POLL_INTERVAL = 30000;
+// The server pings idle streams every 25 seconds; this long without any event means the stream is dead
+const SILENCE_TIMEOUT = 60000;
+const MIN_RETRY_DELAY = 5000;
+const MAX_RETRY_DELAY = 300000;
+
+const listeners = new Set();
+let source = null;
+let pollTimer = null;
+let watchdogTimer = null;
+let retryTimer = null;
+let retryDelay = MIN_RETRY_DELAY;
+let lastState = null;
+// Bumped on close so a connect still waiting for its ticket does not open a stream
+let session = 0;
+
+const getToken = () => JSON.parse(localStorage.getItem('auth'))?.token;
+
+const emit = (state) => {
+  lastState = state;
+  listeners.forEach(listener => listener(state));
+};
+
+const pollCount = async () => {
+  try {
+    const token = getToken();
+    if (!token) return;
+    const response = await fetch('/api/notifications/count/', {
+      headers: { 'Authorization': `Token ${token}` }
+    });
+    if (response.ok) {
+      emit(await response.json());
+    }
+  } catch (error) {
+    console.error('Error fetching notification count:', error);
+  }
+};
+
+const startPolling = () => {
+  if (pollTimer) return;
+  pollCount();
+  pollTimer = setInterval(pollCount, POLL_INTERVAL);
+};
+
+const stopPolling = () => {
+  if (pollTimer) clearInterval(pollTimer);
+  pollTimer = null;
+};
+
+const dropSource = () => {
+  if (source) source.close();
+  if (watchdogTimer) clearTimeout(watchdogTimer);
+  source = null;
+  watchdogTimer = null;
+};
+
+// Poll while the stream is down and try to reopen it with growing delays
+const streamFailed = () => {
+  dropSource();
+  startPolling();
+  if (retryTimer) return;
+  retryTimer = setTimeout(() => {
+    retryTimer = null;
+    connect();
+  }, retryDelay);
+  retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY);
+};
+
+const streamAlive = () => {
+  if (watchdogTimer) clearTimeout(watchdogTimer);
+  watchdogTimer = setTimeout(streamFailed, SILENCE_TIMEOUT);
+};
+
+const connect = async () => {
+  const token = getToken();
+  if (!token) return;
+
+  if (typeof EventSource === 'undefined') {
+    startPolling();
+    return;
+  }
+
+  const currentSession = session;
+  let ticket;
+  try {
+    // EventSource cannot send headers, so the stream is opened with a short-lived ticket
+    // instead of putting the auth token in the URL
+    const response = await fetch('/api/notifications/stream-ticket/', {
+      method: 'POST',
+      headers: { 'Authorization': `Token ${token}` }
+    });
+    if (currentSession !== session) return;
+    if (response.status === 501) {
+      // The server cannot push; polling is all there is
+      startPolling();
+      return;
+    }
+    if (!response.ok) {
+      streamFailed();
+      return;
+    }
+    ticket = (await response.json()).ticket;
+  } catch (error) {
+    if (currentSession === session) streamFailed();
+    return;
+  }
+  if (currentSession !== session) return;
+
+  source = new EventSource(`/api/notifications/stream/?ticket=${encodeURIComponent(ticket)}`);
+  source.addEventListener('count', (event) => {
+    streamAlive();
+    stopPolling();
+    retryDelay = MIN_RETRY_DELAY;
+    emit(JSON.parse(event.data));
+  });
+  source.addEventListener('ping', streamAlive);
+  // Tickets expire, so reconnect with a new one rather than letting the browser reuse the URL
+  source.onerror = streamFailed;
+  streamAlive();
+};
+
+const close = () => {
+  session += 1;
+  dropSource();
+  stopPolling();
+  if (retryTimer) clearTimeout(retryTimer);
+  retryTimer = null;
+  retryDelay = MIN_RETRY_DELAY;
+  lastState = null;
+};
+
+// Call listener with the latest count state now (if known) and on every change; returns an unsubscribe function
+export const subscribeToNotificationCounts = (listener) => {
+  listeners.add(listener);
+  if (listeners.size === 1) {
+    connect();
+  } else if (lastState) {
+    listener(lastState);
+  }
+
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0) close();
+  };
+};
+
+// Re-read the count now, e.g. after marking notifications as read
+export const refreshNotificationCounts = pollCount;